@@ -1,13 +1,20 @@
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import boto3
-from typing import List
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
 from scripts.constants import AWS_REGION, DEFAULT_ROLE, ROLES, FINANCE_ROLE, LEAD_ROLE, MANAGER_ROLE, RECRUITER_ROLE, HR_ROLE
 
 security = HTTPBearer()
 cognito_client = boto3.client('cognito-idp', region_name=AWS_REGION)
 
+# (token, user_info) already verified for this request, set by /batch for its sub-requests
+authenticated_principal: ContextVar[Optional[Tuple[str, dict]]] = ContextVar('authenticated_principal', default=None)
+
 def get_user_info(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    principal = authenticated_principal.get()
+    if principal and principal[0] == credentials.credentials:
+        return dict(principal[1])
     try:
         response = cognito_client.get_user(AccessToken=credentials.credentials)
         # Extract role from custom attributes
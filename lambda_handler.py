@@ -1,4 +1,17 @@
 from mangum import Mangum
 from main import app
+from scripts.utils.deadline import deadline_scope
 
-handler = Mangum(app)
\ No newline at end of file
+# Lifespan events would run on every invocation and close the shared HTTP client
+# that warm containers reuse across invocations
+asgi_handler = Mangum(app, lifespan="off")
+
+def handler(event, context):
+    # Calls made while handling the event are bounded by the time Lambda has left for it
+    with deadline_scope(context.get_remaining_time_in_millis() / 1000):
+        # Document upload jobs arrive as SQS batches, everything else is API Gateway
+        records = event.get('Records') or []
+        if records and records[0].get('eventSource') == 'aws:sqs':
+            from scripts.profiles.documents import handle_sqs_records
+            return handle_sqs_records(records)
+        return asgi_handler(event, context)
\ No newline at end of file
@@ -11,7 +11,13 @@ from scripts.profiles.api import router as profiles_router
 from scripts.leaves.api import router as leaves_router
 from scripts.financial_year.api import router as financial_year_router
 from scripts.holidays.api import router as holidays_router
+from scripts.batch.api import router as batch_router
 from scripts.utils.cloudfront_middleware import CloudFrontMiddleware
+from scripts.db.hedging import policy as hedge_policy
+from scripts.db.loader import request_scope
+from scripts.utils.deadline import DeadlineExceeded
+from scripts.utils.response import DEADLINE_EXCEEDED_DETAIL, RETRY_AFTER_HEADERS
+from scripts.utils.signing import check_signing_secret
 from version import __version__, __changelog__
 from load_env import load_environment
 import logging
@@ -19,12 +25,19 @@ import os
 
 # Load environment configuration
 load_environment()
+check_signing_secret()
 
 logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="F1toF12 API", debug=os.getenv('ENVIRONMENT') == 'dev')
 
+@app.middleware("http")
+async def scope_entity_reads(request: Request, call_next):
+    # Entities read while handling the request are memoized until it completes
+    with request_scope():
+        return await call_next(request)
+
 @app.middleware("http")
 async def add_cache_control(request: Request, call_next):
     response = await call_next(request)
@@ -33,13 +46,20 @@ async def add_cache_control(request: Request, call_next):
     if request.method == "GET" and request.url.path.startswith(f"/{os.getenv('CUSTOMER', 'f1tof12')}/"):
         # Skip static endpoints that can be cached
         static_paths = ["/version", "/health", "/statuses"]
-        if not any(static_path in request.url.path for static_path in static_paths):
+        # Endpoints that validate with ETags set their own Cache-Control
+        if not any(static_path in request.url.path for static_path in static_paths) and "cache-control" not in response.headers:
             response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
             response.headers["Pragma"] = "no-cache"
             response.headers["Expires"] = "0"
     
     return response
 
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    # Raised outside handle_error, e.g. by a dependency or a background read
+    logger.warning(f"Deadline exceeded for {request.method} {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": DEADLINE_EXCEEDED_DETAIL}, headers=RETRY_AFTER_HEADERS)
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     errors = [
@@ -53,7 +73,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 # Include routers with customer prefix
 customer_prefix = f"/{os.getenv('CUSTOMER', 'f1tof12')}"
-routers = [customer_router, users_router, spoc_router, invoice_router, requirements_router, profiles_router, leaves_router, financial_year_router, holidays_router]
+routers = [customer_router, users_router, spoc_router, invoice_router, requirements_router, profiles_router, leaves_router, financial_year_router, holidays_router, batch_router]
 for router in routers:
     app.include_router(router, prefix=customer_prefix)
 
@@ -81,6 +101,11 @@ app.add_middleware(
 async def startup_event():
     logger.info("F1toF12 API starting up")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    from scripts.utils.http_client import close_http_client
+    await close_http_client()
+
 @app.get(f"/{os.getenv('CUSTOMER', 'f1tof12')}/")
 def root():
     return {"message": "F1toF12 API", "version": __version__, "endpoints": ["/vst/login", "/vst/health"]}
@@ -116,5 +141,5 @@ def get_version():
 
 @app.get(f"/{os.getenv('CUSTOMER', 'f1tof12')}/health")
 def health_check():
-    return {"status": "ok", "message": "F1toF12 API is running", "version": __version__}
+    return {"status": "ok", "message": "F1toF12 API is running", "version": __version__, "hedged_reads": hedge_policy.metrics()}
 
@@ -1,15 +1,28 @@
 """OneDrive integration configuration"""
 from math import log
 import os
+import asyncio
 import httpx
 import boto3
 import json
 import logging
 from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Optional
 from fastapi import HTTPException
+from scripts.utils.deadline import check_deadline
+from scripts.utils.http_client import get_http_client, request_timeout
 
 logger = logging.getLogger(__name__)
 
+# Graph rejects simple uploads above 4MB, larger files go through an upload session
+SIMPLE_UPLOAD_LIMIT = 4 * 1024 * 1024
+# Upload session chunks must be a multiple of 320 KiB
+UPLOAD_CHUNK_SIZE = 16 * 320 * 1024
+CHUNK_RETRIES = 3
+CHUNK_TIMEOUT = 60
+# Tokens are renewed this long before they expire so requests never wait on Azure AD
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
 class MicrosoftTokenManager:
     def __init__(self):
         from scripts.constants import ENVIRONMENT
@@ -19,6 +32,8 @@ class MicrosoftTokenManager:
         self.path_prefix = f'/f1tof12/{self.environment}/{customer}'
         self._cached_token = None
         self._token_expires_at = None
+        self._refresh_lock = None
+        self._refresh_lock_loop = None
         self.tenant_id = None
         logger.info(f"Initialized MicrosoftTokenManager with path prefix: {self.path_prefix}")
     
@@ -30,21 +45,43 @@ class MicrosoftTokenManager:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get SSM parameter {param_name}: {str(e)}")
     
-    def _is_token_expired(self) -> bool:
-        """Check if current token is expired"""
+    def _is_token_expired(self, margin: timedelta = timedelta(0)) -> bool:
+        """Check if current token is expired, or will be within margin"""
         if not self._token_expires_at:
             logger.info("Token expiration time not set, treating as expired.")
             return True
         
-        logger.info(f"Token expires at {self._token_expires_at}, current time is {datetime.now()}")
-        return datetime.now() >= self._token_expires_at
+        return datetime.now() + margin >= self._token_expires_at
+
+    def _get_refresh_lock(self) -> asyncio.Lock:
+        # asyncio locks belong to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._refresh_lock is None or self._refresh_lock_loop is not loop:
+            self._refresh_lock = asyncio.Lock()
+            self._refresh_lock_loop = loop
+        return self._refresh_lock
     
     async def get_microsoft_token(self) -> str:
-        """Get Microsoft access token, refresh if expired"""
-        if self._cached_token and not self._is_token_expired():
-            logger.info("Using cached Microsoft token.")
+        """Get Microsoft access token, refreshing it shortly before it expires
+
+        Only one refresh runs at a time, concurrent callers wait for it (or keep
+        using the still valid token) instead of each calling Azure AD.
+        """
+        if self._cached_token and not self._is_token_expired(TOKEN_REFRESH_MARGIN):
             return self._cached_token
-        
+
+        lock = self._get_refresh_lock()
+        if lock.locked() and self._cached_token and not self._is_token_expired():
+            logger.info("Token refresh in progress, using current Microsoft token.")
+            return self._cached_token
+
+        async with lock:
+            # Another caller may have refreshed while this one waited
+            if self._cached_token and not self._is_token_expired(TOKEN_REFRESH_MARGIN):
+                return self._cached_token
+            return await self._refresh_token()
+
+    async def _refresh_token(self) -> str:
         logger.info("Fetching new Microsoft token from Azure AD.")
         # Get tenant ID and credentials from SSM
         # If environment is dev, then get from .env file
@@ -73,8 +110,7 @@ class MicrosoftTokenManager:
             'scope': 'https://graph.microsoft.com/.default'
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=data)
+        response = await get_http_client().post(url, data=data, timeout=request_timeout())
             
         if response.status_code != 200:
             logger.error(f"Failed to get Microsoft token: status={response.status_code}")
@@ -97,33 +133,138 @@ class OneDriveClient:
 
         logger.info(f"Initialized OneDriveClient for environment: {self.environment}")
     
-    async def upload_file(self, file_path: str, filename: str) -> str:
-        """Upload file to OneDrive using site drive"""
-        # Get fresh token
+    async def _get_token(self) -> str:
         if self.access_token:
-            token = self.access_token  # Dev environment
-        else:
-            token = await self.token_manager.get_microsoft_token()  # Prod environment
-        
+            return self.access_token  # Dev environment
+        return await self.token_manager.get_microsoft_token()  # Prod environment
+
+    def _item_url(self, filename: str) -> str:
         # Use SharePoint drive ID
         drive_id = self.token_manager.drive_id
         folder_path = self.token_manager.folder_path
-        url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/root:/{folder_path}/{filename}:/content"
+        return f"https://graph.microsoft.com/v1.0/drives/{drive_id}/root:/{folder_path}/{filename}:"
+
+    async def upload_file(self, file: BinaryIO, filename: str, size: int) -> str:
+        """Upload file to OneDrive using site drive and return its web URL
+
+        Small files go up in a single PUT, larger ones through a resumable upload
+        session one chunk at a time so only a chunk is held in memory.
+        """
+        token = await self._get_token()
+        if size <= SIMPLE_UPLOAD_LIMIT:
+            return await self._simple_upload(file, filename, token)
+        return await self._session_upload(file, filename, size, token)
+
+    async def _simple_upload(self, file: BinaryIO, filename: str, token: str) -> str:
+        url = f"{self._item_url(filename)}/content"
         logger.info(f"Uploading file to OneDrive: {url}")
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/octet-stream"
         }
         
-        with open(file_path, "rb") as f:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(url, headers=headers, content=f.read())
+        content = await asyncio.to_thread(file.read)
+        response = await get_http_client().put(url, headers=headers, content=content, timeout=request_timeout())
                 
         if response.status_code in [200, 201]:
-            return response.json().get("webUrl", file_path)
+            return response.json().get("webUrl", filename)
         
         error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
         raise HTTPException(status_code=500, detail=error_detail)
 
+    async def create_upload_session(self, filename: str, token: Optional[str] = None) -> Dict[str, Any]:
+        """Create a resumable upload session, the returned uploadUrl needs no Authorization header"""
+        token = token or await self._get_token()
+        url = f"{self._item_url(filename)}/createUploadSession"
+        logger.info(f"Creating OneDrive upload session: {url}")
+        headers = {"Authorization": f"Bearer {token}"}
+        body = {"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+
+        response = await get_http_client().post(url, headers=headers, json=body, timeout=request_timeout())
+        if response.status_code != 200:
+            error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
+            raise HTTPException(status_code=500, detail=error_detail)
+        return response.json()
+
+    async def get_item(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the drive item metadata including its download URL, None if it does not exist"""
+        token = await self._get_token()
+        response = await get_http_client().get(self._item_url(filename), headers={"Authorization": f"Bearer {token}"}, timeout=request_timeout())
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
+            raise HTTPException(status_code=500, detail=error_detail)
+        return response.json()
+
+    async def read_range(self, download_url: str, length: int) -> bytes:
+        """Read the first bytes of an item through its pre-authenticated download URL"""
+        response = await get_http_client().get(download_url, headers={"Range": f"bytes=0-{length - 1}"}, follow_redirects=True, timeout=request_timeout())
+        if response.status_code not in [200, 206]:
+            error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
+            raise HTTPException(status_code=500, detail=error_detail)
+        return response.content[:length]
+
+    async def download_to(self, download_url: str, file: BinaryIO):
+        """Stream an item into file through its pre-authenticated download URL"""
+        async with get_http_client().stream("GET", download_url, follow_redirects=True, timeout=request_timeout()) as response:
+            if response.status_code != 200:
+                error_detail = f"Status: {response.status_code}"
+                raise HTTPException(status_code=500, detail=error_detail)
+            async for chunk in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(file.write, chunk)
+
+    async def delete_item(self, filename: str):
+        token = await self._get_token()
+        response = await get_http_client().delete(self._item_url(filename), headers={"Authorization": f"Bearer {token}"}, timeout=request_timeout())
+        if response.status_code not in [204, 404]:
+            logger.warning(f"Failed to delete OneDrive item {filename}: status={response.status_code}")
+
+    async def _session_upload(self, file: BinaryIO, filename: str, size: int, token: str) -> str:
+        upload_url = (await self.create_upload_session(filename, token))["uploadUrl"]
+        client = get_http_client()
+
+        try:
+            offset = 0
+            while offset < size:
+                chunk = await asyncio.to_thread(file.read, UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    raise HTTPException(status_code=500, detail=f"File ended at {offset} of {size} bytes")
+                response = await self._upload_chunk(client, upload_url, chunk, offset, size)
+                offset += len(chunk)
+
+            if response.status_code in [200, 201]:
+                return response.json().get("webUrl", filename)
+            error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
+            raise HTTPException(status_code=500, detail=error_detail)
+        except Exception:
+            # Discard the partial upload, the session URL is pre-authenticated
+            await client.delete(upload_url)
+            raise
+
+    async def _upload_chunk(self, client: httpx.AsyncClient, upload_url: str, chunk: bytes, offset: int, size: int) -> httpx.Response:
+        """PUT one byte range of an upload session, retrying transient failures"""
+        # The upload URL carries its own credentials, Graph rejects an Authorization header on it
+        headers = {
+            "Content-Length": str(len(chunk)),
+            "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+        }
+        for attempt in range(1, CHUNK_RETRIES + 1):
+            try:
+                response = await client.put(upload_url, headers=headers, content=chunk, timeout=request_timeout(httpx.Timeout(CHUNK_TIMEOUT)))
+                if response.status_code in [200, 201, 202]:
+                    return response
+                if response.status_code != 429 and response.status_code < 500:
+                    error_detail = f"Status: {response.status_code}, Response: {response.text[:200]}"
+                    raise HTTPException(status_code=500, detail=error_detail)
+                logger.warning(f"Chunk at {offset} failed with status {response.status_code} (attempt {attempt})")
+            except httpx.TransportError as e:
+                logger.warning(f"Chunk at {offset} failed: {e} (attempt {attempt})")
+            if attempt < CHUNK_RETRIES:
+                # Give up now rather than back off past the deadline
+                check_deadline(2 ** (attempt - 1))
+                await asyncio.sleep(2 ** (attempt - 1))
+        raise HTTPException(status_code=500, detail=f"Upload of bytes {offset}-{offset + len(chunk) - 1} failed after {CHUNK_RETRIES} attempts")
+
 token_manager = MicrosoftTokenManager()
 onedrive_client = OneDriveClient()
\ No newline at end of file
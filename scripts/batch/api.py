@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Any, List, Literal, Optional
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
+from auth import get_user_info, authenticated_principal
+from scripts.utils.response import success_response, handle_error
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+MAX_BATCH_OPERATIONS = 20
+
+# Request headers not carried over to sub-requests, they describe the batch body itself
+BATCH_ONLY_HEADERS = {'content-length', 'content-type', 'transfer-encoding', 'host'}
+
+class BatchOperation(BaseModel):
+    id: str = Field(min_length=1, max_length=64)
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+def validate_operations(operations: List[BatchOperation], batch_path: str):
+    ids = [operation.id for operation in operations]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail={
+            "error": "DUPLICATE_BATCH_ID",
+            "message": "Each sub-request needs a unique id",
+            "code": "BATCH_400"
+        })
+    for operation in operations:
+        if not operation.path.startswith("/") or operation.path.startswith("//"):
+            raise HTTPException(status_code=400, detail={
+                "error": "INVALID_BATCH_PATH",
+                "message": f"Sub-request {operation.id} must use a path such as /requirements/statuses",
+                "code": "BATCH_400"
+            })
+        if operation.path.split("?")[0].rstrip("/") == batch_path:
+            raise HTTPException(status_code=400, detail={
+                "error": "NESTED_BATCH",
+                "message": "Batch requests cannot be nested",
+                "code": "BATCH_400"
+            })
+
+async def dispatch(client: httpx.AsyncClient, prefix: str, headers: dict, operation: BatchOperation) -> dict:
+    """Run one sub-request through the app and capture its status and body"""
+    try:
+        response = await client.request(
+            operation.method,
+            f"{prefix}{operation.path}",
+            headers=headers,
+            json=operation.body
+        )
+        try:
+            body = response.json() if response.content else None
+        except ValueError:
+            body = response.text
+        return {"id": operation.id, "status": response.status_code, "body": body}
+    except Exception as e:
+        logger.error(f"[ERROR] Batch sub-request {operation.id} failed: {str(e)}")
+        return {"id": operation.id, "status": 500, "body": {"detail": {
+            "error": "INTERNAL_ERROR",
+            "message": "Sub-request failed",
+            "code": "BATCH_500"
+        }}}
+
+@router.post("/batch")
+async def batch(batch_request: BatchRequest, request: Request, user_info: dict = Depends(get_user_info)):
+    """Run up to MAX_BATCH_OPERATIONS API calls in one round trip
+
+    Sub-requests are dispatched in-process to the regular routes with the caller's
+    headers and run concurrently, so they should not depend on each other's writes.
+    The token is verified once here, every sub-request still runs its own role checks.
+    Results keep the order of the request, each with the sub-request's status and body.
+    """
+    try:
+        logger.info(f"[ENTRY] Batch API called by: {user_info.get('username', 'unknown')} with {len(batch_request.requests)} requests")
+        # Sub-request paths are relative to the prefix the batch route is mounted under
+        prefix = request.scope["path"].rsplit("/batch", 1)[0]
+        validate_operations(batch_request.requests, "/batch")
+        
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in BATCH_ONLY_HEADERS}
+        token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        principal = authenticated_principal.set((token, user_info))
+        try:
+            transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url=str(request.base_url).rstrip("/")) as client:
+                results = await asyncio.gather(*[
+                    dispatch(client, prefix, headers, operation) for operation in batch_request.requests
+                ])
+        finally:
+            authenticated_principal.reset(principal)
+        
+        logger.info(f"[EXIT] Batch API successful - {len(results)} results")
+        return success_response(results, "Batch processed")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[ERROR] Batch failed: {str(e)}")
+        handle_error(e, "batch")
\ No newline at end of file
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, field_validator
+from typing import Optional
 from scripts.db.database_factory import get_database
 from auth import require_manager, require_finance_or_manager, require_recruiter
-from scripts.utils.response import success_response, handle_error
+from scripts.utils.response import success_response, paginated_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from scripts.constants import USER_STATUS_ACTIVE, USER_STATUS_INACTIVE
+from scripts.requirements.expand import company_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -51,13 +54,25 @@ def register(company: CompanyCreate, user_info: dict = Depends(require_manager))
         handle_error(e, "register company")
 
 @router.get("/customer/list")
-def list_companies(user_info: dict = Depends(require_recruiter)):
+def list_companies(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_recruiter)
+):
     logger.info("Entering list_companies method")
     try:
         db = get_database()
+        if limit or cursor:
+            start_key = decode_cursor(cursor, "companies")
+            companies_data, last_key = db.company.list_companies_page(limit or DEFAULT_PAGE_SIZE, start_key)
+            logger.info("Exiting list_companies method - success")
+            return paginated_response(companies_data, encode_cursor(last_key, "companies"), "Companies retrieved successfully")
         companies_data = db.company.list_companies()
         logger.info("Exiting list_companies method - success")
         return success_response(companies_data, "Companies retrieved successfully")
+    except HTTPException:
+        logger.warning("Exiting list_companies method - HTTP exception")
+        raise
     except Exception as e:
         logger.error("Exiting list_companies method - error")
         handle_error(e, "list companies")
@@ -102,6 +117,7 @@ def update_company(company_id: int, company_update: CompanyUpdate, user_info: di
                 "code": "COMP_404"
             })
         
+        company_cache.invalidate(company_id)
         logger.info(f"Company updated successfully")
         return success_response(message="Company updated successfully")
     except HTTPException:
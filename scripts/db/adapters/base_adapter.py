@@ -13,7 +13,11 @@ class BaseAdapter:
             db.close()
     
     def _to_dict(self, obj, date_fields: Optional[List[str]] = None, datetime_fields: Optional[List[str]] = None) -> Dict[str, Any]:
-        result = {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+        if hasattr(obj, '__table__'):
+            result = {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+        else:
+            # Row returned by a column projection query
+            result = dict(obj._mapping)
         if date_fields:
             for field in date_fields:
                 if result.get(field):
@@ -24,6 +28,22 @@ class BaseAdapter:
                     result[field] = result[field].isoformat()
         return result
     
+    def _query_fields(self, db, model_class: Type, fields: Optional[List[str]] = None):
+        """Query whole records, or only the requested columns"""
+        if not fields:
+            return db.query(model_class)
+        return db.query(*[getattr(model_class, field) for field in fields])
+    
+    def _keyset_page(self, query, key_column, limit: int, start_key: Optional[Dict[str, Any]] = None):
+        """Return up to limit rows ordered by key_column after start_key, plus the next start key"""
+        if start_key and start_key.get(key_column.key) is not None:
+            query = query.filter(key_column > start_key[key_column.key])
+        rows = query.order_by(key_column).limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, {key_column.key: getattr(rows[-1], key_column.key)}
+    
     def _create_record(self, model_class: Type, **kwargs) -> Dict[str, Any]:
         with self._db_session() as db:
             record = model_class(**kwargs)
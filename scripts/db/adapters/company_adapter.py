@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy import func
 from scripts.db.models import Company
 from .base_adapter import BaseAdapter
@@ -17,6 +17,16 @@ class CompanyAdapter(BaseAdapter):
             companies = db.query(Company).all()
             return [self._to_dict(company) for company in companies]
     
+    def get_companies_by_ids(self, company_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        with self._db_session() as db:
+            companies = db.query(Company).filter(Company.id.in_(company_ids)).all()
+            return {company.id: self._to_dict(company) for company in companies}
+    
+    def list_companies_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        with self._db_session() as db:
+            companies, next_key = self._keyset_page(db.query(Company), Company.id, limit, start_key)
+            return [self._to_dict(company) for company in companies], next_key
+    
     def list_active_companies(self) -> List[Dict[str, Any]]:
         with self._db_session() as db:
             companies = db.query(Company).filter(Company.status == "active").all()
@@ -0,0 +1,18 @@
+from typing import Optional, Dict, Any
+from scripts.db.models import DocumentHash
+from .base_adapter import BaseAdapter
+
+class DocumentHashAdapter(BaseAdapter):
+    def get_document(self, sha256: str) -> Optional[Dict[str, Any]]:
+        with self._db_session() as db:
+            record = db.query(DocumentHash).filter(DocumentHash.sha256 == sha256).first()
+            return self._to_dict(record, datetime_fields=['created_date']) if record else None
+    
+    def record_document(self, sha256: str, document_url: str, profile_id: int) -> bool:
+        """Remember the first upload of some content, False if it was already recorded"""
+        with self._db_session() as db:
+            if db.query(DocumentHash).filter(DocumentHash.sha256 == sha256).first():
+                return False
+            db.add(DocumentHash(sha256=sha256, document_url=document_url, profile_id=profile_id))
+            db.commit()
+            return True
\ No newline at end of file
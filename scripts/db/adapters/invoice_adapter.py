@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from scripts.db.models import Invoice
 from .base_adapter import BaseAdapter
 
@@ -11,6 +11,11 @@ class InvoiceAdapter(BaseAdapter):
             invoices = db.query(Invoice).all()
             return [self._to_dict(invoice, ['raised_date', 'due_date']) for invoice in invoices]
     
+    def list_invoices_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        with self._db_session() as db:
+            invoices, next_key = self._keyset_page(db.query(Invoice), Invoice.id, limit, start_key)
+            return [self._to_dict(invoice, ['raised_date', 'due_date']) for invoice in invoices], next_key
+    
     def get_invoice(self, invoice_id: int) -> Optional[Dict[str, Any]]:
         with self._db_session() as db:
             invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
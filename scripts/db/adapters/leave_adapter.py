@@ -1,7 +1,8 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from scripts.db.adapters.base_adapter import BaseAdapter
 from scripts.db.models import Leave, LeaveBalance
-from datetime import datetime
+from datetime import date, datetime
+from scripts.db.loader import cached_get, invalidates
 
 class LeaveAdapter(BaseAdapter):
     
@@ -12,9 +13,14 @@ class LeaveAdapter(BaseAdapter):
             db.commit()
             return leave.id
     
-    def get_user_leaves(self, username: str) -> List[Leave]:
+    def get_user_leaves(self, username: str, starting_by: Optional[date] = None, status: Optional[str] = None) -> List[Leave]:
         with self._db_session() as db:
-            return db.query(Leave).filter(Leave.username == username).order_by(Leave.created_date.desc()).all()
+            query = db.query(Leave).filter(Leave.username == username)
+            if starting_by is not None:
+                query = query.filter(Leave.start_date <= starting_by)
+            if status:
+                query = query.filter(Leave.status == status)
+            return query.order_by(Leave.created_date.desc()).all()
     
     def get_pending_leaves(self) -> List[Leave]:
         with self._db_session() as db:
@@ -24,13 +30,41 @@ class LeaveAdapter(BaseAdapter):
         with self._db_session() as db:
             return db.query(Leave).order_by(Leave.created_date.desc()).all()
     
+    def get_pending_leaves_page(self, limit: int, start_key: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        with self._db_session() as db:
+            leaves, next_key = self._keyset_page(db.query(Leave).filter(Leave.status == 'pending'), Leave.id, limit, start_key)
+            return [self._to_dict(leave, ['start_date', 'end_date'], ['created_date', 'updated_date']) for leave in leaves], next_key
+    
+    def get_all_leaves_page(self, limit: int, start_key: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        with self._db_session() as db:
+            leaves, next_key = self._keyset_page(db.query(Leave), Leave.id, limit, start_key)
+            return [self._to_dict(leave, ['start_date', 'end_date'], ['created_date', 'updated_date']) for leave in leaves], next_key
+    
+    @cached_get('leave')
     def get_leave_by_id(self, leave_id: int) -> Optional[Leave]:
         with self._db_session() as db:
             return db.query(Leave).filter(Leave.id == leave_id).first()
     
+    @invalidates('leave')
     def update_leave(self, leave_id: int, update_data: Dict[str, Any]) -> bool:
         return self._update_record(Leave, leave_id, update_data)
     
+    def add_to_calendar(self, financial_year_id: int, leave: Dict[str, Any]):
+        # The leaves table is indexed by date here, the calendar reads it directly
+        pass
+    
+    def get_calendar_leaves(self, financial_year: Dict[str, Any]) -> List[Dict]:
+        start_date = date.fromisoformat(str(financial_year['start_date'])[:10])
+        end_date = date.fromisoformat(str(financial_year['end_date'])[:10])
+        with self._db_session() as db:
+            leaves = db.query(Leave.id.label('leave_id'), Leave.username, Leave.leave_type, Leave.start_date, Leave.end_date).filter(
+                Leave.status == 'approved',
+                Leave.start_date <= end_date,
+                Leave.end_date >= start_date
+            ).order_by(Leave.start_date).all()
+            return [self._to_dict(leave, date_fields=['start_date', 'end_date']) for leave in leaves]
+    
+    @invalidates('leave_balance')
     def create_leave_balance(self, username: str) -> int:
         with self._db_session() as db:
             balance = LeaveBalance(username=username)
@@ -38,10 +72,12 @@ class LeaveAdapter(BaseAdapter):
             db.commit()
             return balance.id
     
+    @cached_get('leave_balance')
     def get_leave_balance(self, username: str) -> Optional[LeaveBalance]:
         with self._db_session() as db:
             return db.query(LeaveBalance).filter(LeaveBalance.username == username).first()
     
+    @invalidates('leave_balance')
     def update_leave_balance(self, username: str, update_data: Dict[str, Any]) -> bool:
         with self._db_session() as db:
             result = db.query(LeaveBalance).filter(LeaveBalance.username == username).update(update_data)
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from .base_adapter import BaseAdapter
 from ..models import ProcessProfile, Profile, ProfileStatus
 
@@ -17,6 +17,14 @@ class ProcessProfileAdapter(BaseAdapter):
         
         return self._create_record(ProcessProfile, **profile_data)
     
+    def create_process_profiles_bulk(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert new process profiles, for profiles that have none yet"""
+        with self._db_session() as db:
+            created = [ProcessProfile(**record) for record in records]
+            db.add_all(created)
+            db.commit()
+            return [self._to_dict(record) for record in created]
+    
     def upsert_process_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         with self._db_session() as db:
             existing = db.query(ProcessProfile).filter(
@@ -103,6 +111,11 @@ class ProcessProfileAdapter(BaseAdapter):
             ).all()
             return [self._to_dict(profile) for profile in profiles]
     
+    def get_process_profiles_by_requirements(self, requirement_ids: List[int]) -> list:
+        with self._db_session() as db:
+            profiles = db.query(ProcessProfile).filter(ProcessProfile.requirement_id.in_(requirement_ids)).all()
+            return [self._to_dict(profile) for profile in profiles]
+    
     def get_profiles_by_requirement_and_recruiter(self, requirement_id: int, recruiter_name: str) -> list:
         with self._db_session() as db:
             profiles = db.query(Profile, ProfileStatus.stage).join(
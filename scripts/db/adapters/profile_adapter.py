@@ -1,23 +1,159 @@
-from typing import Optional, List, Dict, Any
-from scripts.db.models import Profile, ProfileStatus
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy.exc import IntegrityError
+from scripts.db.models import Profile, ProfileStatus, ProfileContact
+from scripts.db.loader import cached_get, invalidates, forget
+from scripts.profiles.search import rank_matches
+from scripts.utils.contacts import ContactTaken, contact_keys
 from .base_adapter import BaseAdapter
+from .profile_search_adapter import ProfileSearchAdapter
 
 class ProfileAdapter(BaseAdapter):
+    def __init__(self):
+        self.search_index = ProfileSearchAdapter()
+    
     def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
-        return self._create_record(Profile, **profile_data)
+        keys = contact_keys(profile_data.get('email'), profile_data.get('phone'))
+        with self._db_session() as db:
+            record = Profile(**profile_data)
+            db.add(record)
+            db.flush()
+            db.add_all([ProfileContact(contact_key=key, profile_id=record.id) for key in keys])
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise ContactTaken(self._contact_owner(keys))
+            profile = self._to_dict(record)
+        self.search_index.index_profile(profile)
+        return profile
     
-    def list_profiles(self) -> List[Dict[str, Any]]:
+    def create_profiles_bulk(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many profiles in one transaction"""
+        if not profiles:
+            return []
         with self._db_session() as db:
-            profiles = db.query(Profile).all()
+            records = [Profile(**profile_data) for profile_data in profiles]
+            db.add_all(records)
+            db.flush()
+            db.add_all([
+                ProfileContact(contact_key=key, profile_id=record.id)
+                for record in records for key in contact_keys(record.email, record.phone)
+            ])
+            db.commit()
+            created = [self._to_dict(record) for record in records]
+        self.search_index.index_profiles(created)
+        return created
+    
+    def list_profiles(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        with self._db_session() as db:
+            profiles = self._query_fields(db, Profile, fields).all()
             return [self._to_dict(profile, datetime_fields=['created_date', 'updated_date']) for profile in profiles]
     
-    def get_profile(self, profile_id: int) -> Optional[Dict[str, Any]]:
+    def list_profiles_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        with self._db_session() as db:
+            profiles, next_key = self._keyset_page(self._query_fields(db, Profile, fields), Profile.id, limit, start_key)
+            return [self._to_dict(profile, datetime_fields=['created_date', 'updated_date']) for profile in profiles], next_key
+    
+    @cached_get('profile')
+    def get_profile(self, profile_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         with self._db_session() as db:
-            profile = db.query(Profile).filter(Profile.id == profile_id).first()
+            profile = self._query_fields(db, Profile, fields).filter(Profile.id == profile_id).first()
             return self._to_dict(profile, datetime_fields=['created_date', 'updated_date']) if profile else None
     
+    def get_statuses_by_ids(self, profile_ids: List[int]) -> Dict[int, int]:
+        """Return {profile_id: status} for existing profiles"""
+        with self._db_session() as db:
+            rows = db.query(Profile.id, Profile.status).filter(Profile.id.in_(profile_ids)).all()
+            return {profile_id: status for profile_id, status in rows}
+    
+    @invalidates('profile')
     def update_profile(self, profile_id: int, update_data: Dict[str, Any]) -> bool:
-        return self._update_record(Profile, profile_id, update_data)
+        if 'email' in update_data or 'phone' in update_data:
+            updated = self._update_with_contacts(profile_id, update_data)
+        else:
+            updated = self._update_record(Profile, profile_id, update_data)
+        if updated:
+            forget('profile', profile_id)
+            self.search_index.index_profile(self.get_profile(profile_id))
+        return updated
+    
+    @invalidates('profile')
+    def transition_status(self, profile_id: int, status: int, accepted_offer: Optional[float] = None, joining_date=None) -> Optional[Dict[str, Any]]:
+        """Apply a status change, returns the new profile or None if it does not exist"""
+        update_data: Dict[str, Any] = {'status': status}
+        if accepted_offer is not None:
+            update_data['accepted_offer'] = accepted_offer
+        if joining_date is not None:
+            update_data['joining_date'] = joining_date
+        if not self._update_record(Profile, profile_id, update_data):
+            return None
+        forget('profile', profile_id)
+        return self.get_profile(profile_id)
+    
+    def find_existing_contacts(self, keys: List[str]) -> Dict[str, int]:
+        """Map the given contact keys that are already registered to their profile id"""
+        with self._db_session() as db:
+            matches = db.query(ProfileContact).filter(ProfileContact.contact_key.in_(keys)).all()
+            return {match.contact_key: match.profile_id for match in matches}
+    
+    def find_duplicate_profile(self, email: Optional[str], phone: Optional[str], exclude_id: Optional[int] = None) -> Optional[int]:
+        """Return the id of a profile already registered with this email or phone"""
+        keys = contact_keys(email, phone)
+        if not keys:
+            return None
+        with self._db_session() as db:
+            query = db.query(ProfileContact).filter(ProfileContact.contact_key.in_(keys))
+            if exclude_id is not None:
+                query = query.filter(ProfileContact.profile_id != exclude_id)
+            match = query.first()
+            return match.profile_id if match else None
+    
+    def _contact_owner(self, keys: List[str], exclude_id: Optional[int] = None) -> Optional[int]:
+        owners = self.find_existing_contacts(keys)
+        return next((owners[key] for key in keys if key in owners and owners[key] != exclude_id), None)
+    
+    def _update_with_contacts(self, profile_id: int, update_data: Dict[str, Any]) -> bool:
+        """Update a profile and re-register its contact keys in one transaction"""
+        with self._db_session() as db:
+            if not db.query(Profile).filter(Profile.id == profile_id).update(update_data):
+                return False
+            record = db.query(Profile).filter(Profile.id == profile_id).first()
+            keys = contact_keys(record.email, record.phone)
+            db.query(ProfileContact).filter(ProfileContact.profile_id == profile_id).delete()
+            db.add_all([ProfileContact(contact_key=key, profile_id=profile_id) for key in keys])
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise ContactTaken(self._contact_owner(keys, exclude_id=profile_id))
+            return True
+    
+    def search_profiles(self, query_tokens: List[str], search_fields: List[str], ranges: Optional[Dict[str, Tuple[Any, Any]]] = None, limit: int = 20, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        matches = self.search_index.find_matches(query_tokens, search_fields, ranges)
+        ranked = rank_matches(matches, query_tokens)[:limit]
+        with self._db_session() as db:
+            rows = self._query_fields(db, Profile, fields).filter(Profile.id.in_([profile_id for profile_id, _ in ranked])).all()
+            profiles = {row.id: self._to_dict(row, datetime_fields=['created_date', 'updated_date']) for row in rows}
+        return [dict(profiles[profile_id], search_score=score) for profile_id, score in ranked if profile_id in profiles]
+    
+    def index_document_text(self, profile_id: int, text: str) -> bool:
+        """Index the text extracted from a profile's document, False if the profile is gone"""
+        profile = self.get_profile(profile_id)
+        if not profile:
+            return False
+        self.search_index.index_document(profile, text)
+        return True
+    
+    def rebuild_search_index(self) -> int:
+        self.search_index.clear_index()
+        indexed = 0
+        start_key = None
+        while True:
+            profiles, start_key = self.list_profiles_page(100, start_key)
+            self.search_index.index_profiles(profiles, include_documents=True)
+            indexed += len(profiles)
+            if not start_key:
+                return indexed
     
     def list_profile_statuses(self) -> List[Dict[str, Any]]:
         with self._db_session() as db:
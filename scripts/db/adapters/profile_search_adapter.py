@@ -0,0 +1,86 @@
+import zlib
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import or_
+from scripts.db.models import ProfileSearchToken, ProfileDocument
+from scripts.profiles.search import profile_postings, document_postings, range_values, RANGE_FIELDS, DOCUMENT_FIELD
+from .base_adapter import BaseAdapter
+
+class ProfileSearchAdapter(BaseAdapter):
+    def index_profile(self, profile: Dict[str, Any]):
+        self.index_profiles([profile])
+
+    def index_profiles(self, profiles: List[Dict[str, Any]], include_documents: bool = False):
+        """Replace the postings of profiles, with include_documents their document text postings too"""
+        profile_ids = [profile['id'] for profile in profiles]
+        with self._db_session() as db:
+            texts = self._document_texts(db, profile_ids) if include_documents else {}
+            postings = db.query(ProfileSearchToken).filter(ProfileSearchToken.profile_id.in_(profile_ids))
+            if not include_documents:
+                postings = postings.filter(ProfileSearchToken.field != DOCUMENT_FIELD)
+                # Kept document postings still need the current range values
+                for profile in profiles:
+                    db.query(ProfileSearchToken).filter(
+                        ProfileSearchToken.profile_id == profile['id'],
+                        ProfileSearchToken.field == DOCUMENT_FIELD
+                    ).update({attr: profile.get(attr) for attr in RANGE_FIELDS})
+            postings.delete()
+            db.add_all([
+                ProfileSearchToken(profile_id=profile['id'], field=field, token=token, **range_values(profile))
+                for profile in profiles
+                for field, token in profile_postings(profile) | document_postings(texts.get(profile['id']))
+            ])
+            db.commit()
+
+    def reindex_profile(self, old_profile: Dict[str, Any], new_profile: Dict[str, Any]):
+        self.index_profiles([new_profile], include_documents=True)
+
+    def index_document(self, profile: Dict[str, Any], text: str):
+        """Store the compressed text of a profile's document and replace its document postings"""
+        with self._db_session() as db:
+            db.merge(ProfileDocument(profile_id=profile['id'], text_zlib=zlib.compress(text.encode()), text_length=len(text)))
+            db.query(ProfileSearchToken).filter(
+                ProfileSearchToken.profile_id == profile['id'],
+                ProfileSearchToken.field == DOCUMENT_FIELD
+            ).delete()
+            ranges = {attr: profile.get(attr) for attr in RANGE_FIELDS}
+            db.add_all([
+                ProfileSearchToken(profile_id=profile['id'], field=field, token=token, **ranges)
+                for field, token in document_postings(text)
+            ])
+            db.commit()
+
+    def get_document_text(self, profile_id: int) -> Optional[str]:
+        with self._db_session() as db:
+            return self._document_texts(db, [profile_id]).get(profile_id)
+
+    @staticmethod
+    def _document_texts(db, profile_ids: List[int]) -> Dict[int, str]:
+        documents = db.query(ProfileDocument).filter(ProfileDocument.profile_id.in_(profile_ids)).all()
+        return {document.profile_id: zlib.decompress(document.text_zlib).decode() for document in documents}
+
+    def clear_index(self):
+        with self._db_session() as db:
+            db.query(ProfileSearchToken).delete()
+            db.commit()
+
+    def find_matches(self, query_tokens: List[str], fields: List[str], ranges: Optional[Dict[str, Tuple[Any, Any]]] = None) -> List[Tuple[int, str, str, str]]:
+        """Return (profile_id, query_token, field, token) for postings matching any query token prefix"""
+        with self._db_session() as db:
+            conditions = [
+                ProfileSearchToken.token.like(f"{query_token}%") if len(query_token) > 1 else ProfileSearchToken.token == query_token
+                for query_token in query_tokens
+            ]
+            query = db.query(ProfileSearchToken).filter(ProfileSearchToken.field.in_(fields), or_(*conditions))
+            for attr, (low, high) in (ranges or {}).items():
+                column = getattr(ProfileSearchToken, attr)
+                if low is not None:
+                    query = query.filter(column >= low)
+                if high is not None:
+                    query = query.filter(column <= high)
+
+            postings = query.all()
+            return [
+                (posting.profile_id, query_token, posting.field, posting.token)
+                for posting in postings for query_token in query_tokens
+                if posting.token == query_token or (len(query_token) > 1 and posting.token.startswith(query_token))
+            ]
\ No newline at end of file
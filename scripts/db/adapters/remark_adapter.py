@@ -0,0 +1,60 @@
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from scripts.db.models import Remark, Profile, Requirement
+from .base_adapter import BaseAdapter
+
+class RemarkAdapter(BaseAdapter):
+    # Key column of each entity that carries remarks
+    PARENTS = {
+        'profile': Profile.id,
+        'requirement': Requirement.requirement_id
+    }
+    
+    def put_remark(self, entity_type: str, entity_id: int, remark: str, username: str) -> Dict[str, Any]:
+        """Store a remark for an entity the caller has already found"""
+        with self._db_session() as db:
+            return self._insert_remark(db, entity_type, entity_id, remark, username)
+    
+    def add_remark(self, entity_type: str, entity_id: int, remark: str, username: str) -> Optional[Dict[str, Any]]:
+        """Store a remark, returns None when the parent entity does not exist"""
+        key_column = self.PARENTS[entity_type]
+        with self._db_session() as db:
+            if not db.query(key_column).filter(key_column == entity_id).first():
+                return None
+            return self._insert_remark(db, entity_type, entity_id, remark, username)
+    
+    def _insert_remark(self, db, entity_type: str, entity_id: int, remark: str, username: str) -> Dict[str, Any]:
+        now = datetime.now(ZoneInfo('Asia/Kolkata'))
+        record = Remark(
+            entity=f"{entity_type}#{entity_id}",
+            remark_key=f"{now.isoformat()}#{username}",
+            username=username,
+            remark=remark,
+            created_date=now
+        )
+        db.add(record)
+        db.commit()
+        return self._to_dict(record, datetime_fields=['created_date'])
+    
+    def list_remarks(self, entity_type: str, entity_id: int, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Remarks oldest first, all of them unless a page limit is given"""
+        with self._db_session() as db:
+            query = db.query(Remark).filter(Remark.entity == f"{entity_type}#{entity_id}")
+            if limit is None:
+                remarks, next_key = query.order_by(Remark.id).all(), None
+            else:
+                remarks, next_key = self._keyset_page(query, Remark.id, limit, start_key)
+            return [self._to_dict(remark, datetime_fields=['created_date']) for remark in remarks], next_key
+    
+    def get_remarks_by_entities(self, entity_type: str, entity_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Remarks of each entity oldest first, for rendering a page of list results"""
+        entity_ids = list(dict.fromkeys(int(entity_id) for entity_id in entity_ids))
+        remarks = {entity_id: [] for entity_id in entity_ids}
+        if not entity_ids:
+            return remarks
+        with self._db_session() as db:
+            records = db.query(Remark).filter(Remark.entity.in_([f"{entity_type}#{entity_id}" for entity_id in entity_ids])).order_by(Remark.id).all()
+            for record in records:
+                remarks[int(record.entity.split('#', 1)[1])].append(self._to_dict(record, datetime_fields=['created_date']))
+        return remarks
\ No newline at end of file
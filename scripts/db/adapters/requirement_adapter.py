@@ -1,22 +1,32 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from sqlalchemy import and_, or_
 from scripts.db.models import Requirement, RequirementStatus
+from scripts.db.loader import cached_get, invalidates
 from .base_adapter import BaseAdapter
 
 class RequirementAdapter(BaseAdapter):
     def create_requirement(self, requirement_data: Dict[str, Any]) -> Dict[str, Any]:
         return self._create_record(Requirement, **{k: v for k, v in requirement_data.items() if v is not None})
     
-    def list_requirements(self) -> List[Dict[str, Any]]:
+    def list_requirements(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         with self._db_session() as db:
             db.expire_all()  # Ensure fresh data from database
-            requirements = db.query(Requirement).all()
+            requirements = self._query_fields(db, Requirement, fields).all()
             return [self._to_dict(req, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) for req in requirements]
     
-    def get_requirement(self, requirement_id: int) -> Optional[Dict[str, Any]]:
+    def list_requirements_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
         with self._db_session() as db:
-            requirement = db.query(Requirement).filter(Requirement.requirement_id == requirement_id).first()
+            requirements, next_key = self._keyset_page(self._query_fields(db, Requirement, fields), Requirement.requirement_id, limit, start_key)
+            return [self._to_dict(req, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) for req in requirements], next_key
+    
+    @cached_get('requirement')
+    def get_requirement(self, requirement_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        with self._db_session() as db:
+            requirement = self._query_fields(db, Requirement, fields).filter(Requirement.requirement_id == requirement_id).first()
             return self._to_dict(requirement, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) if requirement else None
     
+    @invalidates('requirement')
     def update_requirement(self, requirement_id: int, update_data: Dict[str, Any]) -> bool:
         field_mapping = {
             'company_id': 'company_id',
@@ -42,14 +52,35 @@ class RequirementAdapter(BaseAdapter):
             statuses = db.query(RequirementStatus).all()
             return [self._to_dict(status) for status in statuses]
     
-    def get_open_requirements_by_company(self, company_id: int) -> List[Dict[str, Any]]:
+    def _open_requirements_query(self, db, company_id: int, newest_first: bool):
+        order = (Requirement.created_date.desc(), Requirement.requirement_id.desc()) if newest_first else (Requirement.created_date, Requirement.requirement_id)
+        return db.query(Requirement).filter(
+            Requirement.company_id == company_id,
+            Requirement.status_id.in_([1, 2, 3])  # Open statuses (not 4=Closed, 5=Fulfilled)
+        ).order_by(*order)
+    
+    def get_open_requirements_by_company(self, company_id: int, newest_first: bool = True) -> List[Dict[str, Any]]:
         with self._db_session() as db:
-            requirements = db.query(Requirement).filter(
-                Requirement.company_id == company_id,
-                Requirement.status_id.in_([1, 2, 3])  # Open statuses (not 4=Closed, 5=Fulfilled)
-            ).all()
+            requirements = self._open_requirements_query(db, company_id, newest_first).all()
             return [self._to_dict(req, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) for req in requirements]
     
+    def get_open_requirements_by_company_page(self, company_id: int, limit: int, start_key: Optional[Dict[str, Any]] = None, newest_first: bool = True) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        with self._db_session() as db:
+            query = self._open_requirements_query(db, company_id, newest_first)
+            if start_key:
+                created_date = datetime.fromisoformat(start_key['created_date'])
+                requirement_id = start_key['requirement_id']
+                if newest_first:
+                    position = or_(Requirement.created_date < created_date, and_(Requirement.created_date == created_date, Requirement.requirement_id < requirement_id))
+                else:
+                    position = or_(Requirement.created_date > created_date, and_(Requirement.created_date == created_date, Requirement.requirement_id > requirement_id))
+                query = query.filter(position)
+            rows = query.limit(limit + 1).all()
+            requirements = [self._to_dict(req, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) for req in rows[:limit]]
+            if len(rows) <= limit:
+                return requirements, None
+            return requirements, {'created_date': requirements[-1]['created_date'], 'requirement_id': requirements[-1]['requirement_id']}
+    
     def get_open_requirements_by_company_and_recruiter(self, company_id: int, recruiter_name: str) -> List[Dict[str, Any]]:
         from scripts.db.models import ProcessProfile
         with self._db_session() as db:
@@ -59,5 +90,5 @@ class RequirementAdapter(BaseAdapter):
                 Requirement.company_id == company_id,
                 Requirement.status_id.in_([1, 2, 3]),
                 ProcessProfile.recruiter_name == recruiter_name
-            ).all()
+            ).order_by(Requirement.created_date.desc(), Requirement.requirement_id.desc()).all()
             return [self._to_dict(req, ['expected_billing_date'], ['created_date', 'closed_date', 'updated_date']) for req in requirements]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from scripts.db.models import SPOC
 from .base_adapter import BaseAdapter
 
@@ -11,6 +11,16 @@ class SPOCAdapter(BaseAdapter):
             spocs = db.query(SPOC).all()
             return [self._to_dict(spoc) for spoc in spocs]
     
+    def get_spocs_by_ids(self, spoc_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        with self._db_session() as db:
+            spocs = db.query(SPOC).filter(SPOC.id.in_(spoc_ids)).all()
+            return {spoc.id: self._to_dict(spoc) for spoc in spocs}
+    
+    def list_spocs_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        with self._db_session() as db:
+            spocs, next_key = self._keyset_page(db.query(SPOC), SPOC.id, limit, start_key)
+            return [self._to_dict(spoc) for spoc in spocs], next_key
+    
     def update_spoc(self, spoc_id: int, update_data: Dict[str, Any]) -> bool:
         return self._update_record(SPOC, spoc_id, update_data)
     
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Backfill the leave calendar with leaves approved before it existed, one item per financial year each leave falls in
+
+Items are keyed by leave, so the script can be re-run safely.
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+import boto3
+from scripts.db.config import AWS_REGION, LEAVES_TABLE
+from scripts.db.database_factory import get_database
+from scripts.leaves.calendar import as_date, financial_years_overlapping
+
+def backfill_leave_calendar(dynamodb, db):
+    table = dynamodb.Table(LEAVES_TABLE)
+    scan_params = {
+        'FilterExpression': '#status = :status',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': {':status': 'approved'}
+    }
+    added = 0
+    skipped = 0
+    failed = 0
+
+    response = table.scan(**scan_params)
+    while True:
+        for leave in response.get('Items', []):
+            financial_years = financial_years_overlapping(db, as_date(leave['start_date']), as_date(leave['end_date']))
+            if not financial_years:
+                print(f"✗ Leave {leave['id']} is outside every financial year, skipped")
+                skipped += 1
+                continue
+            try:
+                for financial_year in financial_years:
+                    db.leave.add_to_calendar(financial_year['id'], leave)
+                added += 1
+            except Exception as e:
+                print(f"✗ Failed to add leave {leave['id']} to the calendar: {str(e)}")
+                failed += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+
+    print(f"✓ Added {added} approved leaves to the leave calendar ({skipped} skipped, {failed} failed)")
+
+def main():
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    backfill_leave_calendar(dynamodb, get_database())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Backfill the profile contacts uniqueness index from existing profiles
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+import boto3
+from botocore.exceptions import ClientError
+from scripts.db.config import AWS_REGION, PROFILES_TABLE, PROFILE_CONTACTS_TABLE
+from scripts.utils.contacts import contact_keys
+
+def backfill_contacts(dynamodb):
+    profiles_table = dynamodb.Table(PROFILES_TABLE)
+    contacts_table = dynamodb.Table(PROFILE_CONTACTS_TABLE)
+    scan_params = {'ProjectionExpression': 'id, email, phone'}
+    added = 0
+    duplicates = 0
+
+    response = profiles_table.scan(**scan_params)
+    while True:
+        for profile in response.get('Items', []):
+            for key in contact_keys(profile.get('email'), profile.get('phone')):
+                try:
+                    contacts_table.put_item(
+                        Item={'contact_key': key, 'profile_id': profile['id']},
+                        ConditionExpression='attribute_not_exists(contact_key) OR profile_id = :id',
+                        ExpressionAttributeValues={':id': profile['id']}
+                    )
+                    added += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                    # Existing duplicates keep the first profile indexed, report the rest
+                    existing = contacts_table.get_item(Key={'contact_key': key}).get('Item', {})
+                    print(f"✗ Profile {profile['id']} duplicates profile {existing.get('profile_id')} ({key.split('#')[0]})")
+                    duplicates += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = profiles_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+
+    print(f"✓ Indexed {added} contact keys ({duplicates} duplicates found)")
+
+def main():
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    backfill_contacts(dynamodb)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
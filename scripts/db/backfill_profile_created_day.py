@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Backfill the created_day bucket on existing profiles so they appear in the created_day index
+"""
+import os
+import sys
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+import boto3
+from scripts.db.config import AWS_REGION, PROFILES_TABLE
+
+def created_day_for(created_date: str) -> str:
+    """Derive the IST day bucket from a stored created_date"""
+    created = datetime.fromisoformat(created_date)
+    if created.tzinfo:
+        created = created.astimezone(ZoneInfo('Asia/Kolkata'))
+    return created.date().isoformat()
+
+def backfill_created_day(dynamodb):
+    table = dynamodb.Table(PROFILES_TABLE)
+    scan_params = {
+        'ProjectionExpression': 'id, created_date, created_day',
+        'FilterExpression': 'attribute_exists(created_date) AND attribute_not_exists(created_day)'
+    }
+    updated = 0
+    failed = 0
+
+    response = table.scan(**scan_params)
+    while True:
+        for item in response.get('Items', []):
+            try:
+                table.update_item(
+                    Key={'id': item['id']},
+                    UpdateExpression='SET created_day = :day',
+                    ExpressionAttributeValues={':day': created_day_for(item['created_date'])}
+                )
+                updated += 1
+            except Exception as e:
+                print(f"✗ Failed to backfill profile {item['id']}: {str(e)}")
+                failed += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+
+    print(f"✓ Backfilled created_day on {updated} profiles ({failed} failed)")
+
+def main():
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    backfill_created_day(dynamodb)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Backfill status_created on existing requirements so they appear in the company_id-status_created index
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+import boto3
+from scripts.db.config import AWS_REGION, REQUIREMENTS_TABLE
+from scripts.db.dynamodb_adapters.requirement_dynamodb_adapter import RequirementDynamoDBAdapter
+
+def backfill_status_created(dynamodb):
+    table = dynamodb.Table(REQUIREMENTS_TABLE)
+    scan_params = {
+        'ProjectionExpression': 'requirement_id, status_id, created_date, status_created',
+        'FilterExpression': 'attribute_exists(status_id)'
+    }
+    updated = 0
+    failed = 0
+
+    response = table.scan(**scan_params)
+    while True:
+        for item in response.get('Items', []):
+            status_created = RequirementDynamoDBAdapter.status_created(item['status_id'], item.get('created_date'))
+            if item.get('status_created') == status_created:
+                continue
+            try:
+                table.update_item(
+                    Key={'requirement_id': item['requirement_id']},
+                    UpdateExpression='SET status_created = :status_created',
+                    ExpressionAttributeValues={':status_created': status_created}
+                )
+                updated += 1
+            except Exception as e:
+                print(f"✗ Failed to backfill requirement {item['requirement_id']}: {str(e)}")
+                failed += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+
+    print(f"✓ Backfilled status_created on {updated} requirements ({failed} failed)")
+
+def main():
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    backfill_status_created(dynamodb)
+
+if __name__ == "__main__":
+    main()
@@ -61,7 +61,7 @@ def main():
         (PROFILES_TABLE, 'id'),
         (PROCESS_PROFILES_TABLE, 'id'),
         (LEAVES_TABLE, 'id'),
-        (LEAVE_BALANCES_TABLE, 'id'),
+        (LEAVE_BALANCES_TABLE, 'balance_key'),
         (HOLIDAYS_TABLE, 'id'),
         (USER_HOLIDAY_SELECTIONS_TABLE, 'id'),
     ]
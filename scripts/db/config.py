@@ -22,7 +22,23 @@ COUNTERS_TABLE = os.getenv('COUNTERS_TABLE', f'f1tof12-counters{TABLE_SUFFIX}')
 PROFILES_TABLE = os.getenv('PROFILES_TABLE', f'f1tof12-profiles{TABLE_SUFFIX}')
 PROCESS_PROFILES_TABLE = os.getenv('PROCESS_PROFILES_TABLE', f'f1tof12-process-profiles{TABLE_SUFFIX}')
 LEAVES_TABLE = os.getenv('LEAVES_TABLE', f'f1tof12-leaves{TABLE_SUFFIX}')
-LEAVE_BALANCES_TABLE = os.getenv('LEAVE_BALANCES_TABLE', f'f1tof12-leave-balances{TABLE_SUFFIX}')
+# Keyed by balance_key (username#year), replaces the id keyed table below
+LEAVE_BALANCES_TABLE = os.getenv('LEAVE_BALANCES_TABLE', f'f1tof12-user-leave-balances{TABLE_SUFFIX}')
+LEGACY_LEAVE_BALANCES_TABLE = os.getenv('LEGACY_LEAVE_BALANCES_TABLE', f'f1tof12-leave-balances{TABLE_SUFFIX}')
+LEAVE_CALENDAR_TABLE = os.getenv('LEAVE_CALENDAR_TABLE', f'f1tof12-leave-calendar{TABLE_SUFFIX}')
 FINANCIAL_YEARS_TABLE = os.getenv('FINANCIAL_YEARS_TABLE', f'f1tof12-financial-years{TABLE_SUFFIX}')
 HOLIDAYS_TABLE = os.getenv('HOLIDAYS_TABLE', f'f1tof12-holidays{TABLE_SUFFIX}')
-USER_HOLIDAY_SELECTIONS_TABLE = os.getenv('USER_HOLIDAY_SELECTIONS_TABLE', f'f1tof12-user-holiday-selections{TABLE_SUFFIX}')
\ No newline at end of file
+USER_HOLIDAY_SELECTIONS_TABLE = os.getenv('USER_HOLIDAY_SELECTIONS_TABLE', f'f1tof12-user-holiday-selections{TABLE_SUFFIX}')
+PROFILE_SEARCH_TABLE = os.getenv('PROFILE_SEARCH_TABLE', f'f1tof12-profile-search{TABLE_SUFFIX}')
+PROFILE_CONTACTS_TABLE = os.getenv('PROFILE_CONTACTS_TABLE', f'f1tof12-profile-contacts{TABLE_SUFFIX}')
+REMARKS_TABLE = os.getenv('REMARKS_TABLE', f'f1tof12-remarks{TABLE_SUFFIX}')
+PROFILE_DOCUMENTS_TABLE = os.getenv('PROFILE_DOCUMENTS_TABLE', f'f1tof12-profile-documents{TABLE_SUFFIX}')
+DOCUMENT_HASHES_TABLE = os.getenv('DOCUMENT_HASHES_TABLE', f'f1tof12-document-hashes{TABLE_SUFFIX}')
+
+# Global secondary indexes
+PROFILES_CREATED_DAY_INDEX = 'created_day-created_date-index'
+PROCESS_PROFILES_RECRUITER_INDEX = 'recruiter_name-requirement_id-index'
+PROCESS_PROFILES_REQUIREMENT_INDEX = 'requirement_id-index'
+PROCESS_PROFILES_PROFILE_INDEX = 'profile_id-index'
+REQUIREMENTS_COMPANY_STATUS_INDEX = 'company_id-status_created-index'
+LEAVES_USERNAME_START_INDEX = 'username-start_date-index'
\ No newline at end of file
@@ -1,6 +1,7 @@
 import boto3
 import sys
 import os
+import time
 from botocore.exceptions import ClientError
 
 # Add project root to path
@@ -11,10 +12,55 @@ from scripts.db.config import (  # noqa: E402
     AWS_REGION, COMPANIES_TABLE, SPOCS_TABLE, INVOICES_TABLE, 
     REQUIREMENTS_TABLE, REQUIREMENT_STATUSES_TABLE, PROFILE_STATUSES_TABLE, 
     COUNTERS_TABLE, PROFILES_TABLE, PROCESS_PROFILES_TABLE, 
-    LEAVES_TABLE, LEAVE_BALANCES_TABLE, FINANCIAL_YEARS_TABLE, 
-    HOLIDAYS_TABLE, USER_HOLIDAY_SELECTIONS_TABLE
+    LEAVES_TABLE, LEAVE_BALANCES_TABLE, LEAVE_CALENDAR_TABLE, FINANCIAL_YEARS_TABLE, 
+    HOLIDAYS_TABLE, USER_HOLIDAY_SELECTIONS_TABLE, PROFILE_SEARCH_TABLE,
+    PROFILE_CONTACTS_TABLE, REMARKS_TABLE, PROFILE_DOCUMENTS_TABLE, DOCUMENT_HASHES_TABLE,
+    PROFILES_CREATED_DAY_INDEX, PROCESS_PROFILES_RECRUITER_INDEX, PROCESS_PROFILES_REQUIREMENT_INDEX, PROCESS_PROFILES_PROFILE_INDEX,
+    REQUIREMENTS_COMPANY_STATUS_INDEX, LEAVES_USERNAME_START_INDEX
 )
 
+def _index_definition(index_config):
+    key_schema = [{'AttributeName': index_config['key'], 'KeyType': 'HASH'}]
+    if index_config.get('sort_key'):
+        key_schema.append({'AttributeName': index_config['sort_key'], 'KeyType': 'RANGE'})
+    return {
+        'IndexName': index_config['name'],
+        'KeySchema': key_schema,
+        'Projection': {'ProjectionType': index_config.get('projection', 'ALL')}
+    }
+
+def _attribute_definitions(config):
+    attributes = {config['key']: config['type']}
+    if config.get('sort_key'):
+        attributes[config['sort_key']] = config['sort_type']
+    return [{'AttributeName': name, 'AttributeType': attr_type} for name, attr_type in attributes.items()]
+
+def ensure_indexes(client, table_config):
+    """Add any configured GSI that is missing on an existing table"""
+    description = client.describe_table(TableName=table_config['name'])['Table']
+    existing = {index['IndexName'] for index in description.get('GlobalSecondaryIndexes', [])}
+    
+    for index_config in table_config.get('indexes', []):
+        if index_config['name'] in existing:
+            continue
+        client.update_table(
+            TableName=table_config['name'],
+            AttributeDefinitions=_attribute_definitions(index_config),
+            GlobalSecondaryIndexUpdates=[{'Create': _index_definition(index_config)}]
+        )
+        print(f"Creating index {index_config['name']} on {table_config['name']}")
+        _wait_for_index(client, table_config['name'], index_config['name'])
+
+def _wait_for_index(client, table_name, index_name, delay=15):
+    """Block until a new GSI has finished backfilling, one index is created at a time"""
+    while True:
+        description = client.describe_table(TableName=table_name)['Table']
+        statuses = {index['IndexName']: index['IndexStatus'] for index in description.get('GlobalSecondaryIndexes', [])}
+        if statuses.get(index_name) == 'ACTIVE':
+            print(f"Index {index_name} is active")
+            return
+        time.sleep(delay)
+
 def create_dynamodb_tables():
     dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
     
@@ -37,12 +83,18 @@ def create_dynamodb_tables():
         {
             'name': REQUIREMENTS_TABLE,
             'key': 'requirement_id',
-            'type': 'N'
+            'type': 'N',
+            'indexes': [
+                {'name': REQUIREMENTS_COMPANY_STATUS_INDEX, 'key': 'company_id', 'type': 'N', 'sort_key': 'status_created', 'sort_type': 'S'}
+            ]
         },
         {
             'name': PROFILES_TABLE,
             'key': 'id',
-            'type': 'N'
+            'type': 'N',
+            'indexes': [
+                {'name': PROFILES_CREATED_DAY_INDEX, 'key': 'created_day', 'type': 'S', 'sort_key': 'created_date', 'sort_type': 'S'}
+            ]
         },
         {
             'name': REQUIREMENT_STATUSES_TABLE,
@@ -57,7 +109,12 @@ def create_dynamodb_tables():
         {
             'name': PROCESS_PROFILES_TABLE,
             'key': 'id',
-            'type': 'N'
+            'type': 'N',
+            'indexes': [
+                {'name': PROCESS_PROFILES_RECRUITER_INDEX, 'key': 'recruiter_name', 'type': 'S', 'sort_key': 'requirement_id', 'sort_type': 'N', 'projection': 'KEYS_ONLY'},
+                {'name': PROCESS_PROFILES_REQUIREMENT_INDEX, 'key': 'requirement_id', 'type': 'N'},
+                {'name': PROCESS_PROFILES_PROFILE_INDEX, 'key': 'profile_id', 'type': 'N'}
+            ]
         },
         {
             'name': COUNTERS_TABLE,
@@ -67,12 +124,22 @@ def create_dynamodb_tables():
         {
             'name': LEAVES_TABLE,
             'key': 'id',
-            'type': 'N'
+            'type': 'N',
+            'indexes': [
+                {'name': LEAVES_USERNAME_START_INDEX, 'key': 'username', 'type': 'S', 'sort_key': 'start_date', 'sort_type': 'S'}
+            ]
         },
         {
             'name': LEAVE_BALANCES_TABLE,
-            'key': 'id',
-            'type': 'N'
+            'key': 'balance_key',
+            'type': 'S'
+        },
+        {
+            'name': LEAVE_CALENDAR_TABLE,
+            'key': 'financial_year_id',
+            'type': 'N',
+            'sort_key': 'leave_key',
+            'sort_type': 'S'
         },
         {
             'name': FINANCIAL_YEARS_TABLE,
@@ -88,21 +155,62 @@ def create_dynamodb_tables():
             'name': USER_HOLIDAY_SELECTIONS_TABLE,
             'key': 'id',
             'type': 'N'
+        },
+        {
+            'name': PROFILE_SEARCH_TABLE,
+            'key': 'shard',
+            'type': 'S',
+            'sort_key': 'term',
+            'sort_type': 'S'
+        },
+        {
+            'name': PROFILE_CONTACTS_TABLE,
+            'key': 'contact_key',
+            'type': 'S'
+        },
+        {
+            'name': REMARKS_TABLE,
+            'key': 'entity',
+            'type': 'S',
+            'sort_key': 'remark_key',
+            'sort_type': 'S'
+        },
+        {
+            'name': PROFILE_DOCUMENTS_TABLE,
+            'key': 'profile_id',
+            'type': 'N'
+        },
+        {
+            'name': DOCUMENT_HASHES_TABLE,
+            'key': 'sha256',
+            'type': 'S'
         }
     ]
     
     for table_config in tables:
+        indexes = table_config.get('indexes', [])
+        attribute_definitions = _attribute_definitions(table_config)
+        for index_config in indexes:
+            attribute_definitions += [a for a in _attribute_definitions(index_config) if a not in attribute_definitions]
+        
+        create_params = {
+            'TableName': table_config['name'],
+            'KeySchema': [{'AttributeName': table_config['key'], 'KeyType': 'HASH'}],
+            'AttributeDefinitions': attribute_definitions,
+            'BillingMode': 'PAY_PER_REQUEST'
+        }
+        if table_config.get('sort_key'):
+            create_params['KeySchema'].append({'AttributeName': table_config['sort_key'], 'KeyType': 'RANGE'})
+        if indexes:
+            create_params['GlobalSecondaryIndexes'] = [_index_definition(index_config) for index_config in indexes]
+        
         try:
-            table = dynamodb.create_table(
-                TableName=table_config['name'],
-                KeySchema=[{'AttributeName': table_config['key'], 'KeyType': 'HASH'}],
-                AttributeDefinitions=[{'AttributeName': table_config['key'], 'AttributeType': table_config['type']}],
-                BillingMode='PAY_PER_REQUEST'
-            )
+            table = dynamodb.create_table(**create_params)
             print(f"Created table: {table.table_name}")
         except ClientError as e:
             if e.response.get('Error', {}).get('Code') == 'ResourceInUseException':
                 print(f"Table {table_config['name']} already exists")
+                ensure_indexes(dynamodb.meta.client, table_config)
             else:
                 raise
 
@@ -8,6 +8,8 @@ from scripts.db.dynamodb_adapters.process_profile_dynamodb_adapter import Proces
 from scripts.db.dynamodb_adapters.leave_dynamodb_adapter import LeaveDynamoDBAdapter
 from scripts.db.dynamodb_adapters.financial_year_dynamodb_adapter import FinancialYearDynamoDBAdapter
 from scripts.db.dynamodb_adapters.holiday_dynamodb_adapter import HolidayDynamoDBAdapter
+from scripts.db.dynamodb_adapters.remark_dynamodb_adapter import RemarkDynamoDBAdapter
+from scripts.db.dynamodb_adapters.document_hash_dynamodb_adapter import DocumentHashDynamoDBAdapter
 
 class DynamoDBAdapter:
     def __init__(self):
@@ -20,4 +22,6 @@ class DynamoDBAdapter:
         self.process_profile = ProcessProfileDynamoDBAdapter()
         self.leave = LeaveDynamoDBAdapter()
         self.financial_year = FinancialYearDynamoDBAdapter()
-        self.holiday = HolidayDynamoDBAdapter()
\ No newline at end of file
+        self.holiday = HolidayDynamoDBAdapter()
+        self.remark = RemarkDynamoDBAdapter()
+        self.document_hash = DocumentHashDynamoDBAdapter()
\ No newline at end of file
@@ -1,11 +1,26 @@
 import time
+from contextvars import copy_context
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
+from scripts.db.hedging import HEDGED_READS, hedged_call
 from scripts.db.lambda_dynamodb_pool import pool
 from scripts.db.config import COUNTERS_TABLE
 
+class DynamoDBTable:
+    """Adapter attribute that resolves its table from the pool on each use, so every call gets the tier for the time left"""
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, adapter, owner=None):
+        return self if adapter is None else pool.get_table(self.name)
+
 class BaseDynamoDBAdapter:
-    def __init__(self):
-        self.dynamodb = pool.get_resource()
+    @property
+    def dynamodb(self):
+        # Looked up per call rather than once per request, a late call must not get the first tier's timeouts
+        return pool.get_resource()
     
     def _get_next_id(self, table_type: str) -> int:
         counter_table = self.dynamodb.Table(COUNTERS_TABLE)
@@ -30,6 +45,49 @@ class BaseDynamoDBAdapter:
                         continue
                 raise
     
+    def _get_next_id_block(self, table_type: str, count: int) -> List[int]:
+        """Reserve count consecutive ids with a single counter update"""
+        counter_table = self.dynamodb.Table(COUNTERS_TABLE)
+        response = counter_table.update_item(
+            Key={'table_name': table_type},
+            UpdateExpression='ADD next_id :inc',
+            ExpressionAttributeValues={':inc': count},
+            ReturnValues='UPDATED_NEW'
+        )
+        last_id = int(response['Attributes']['next_id'])
+        return list(range(last_id - count + 1, last_id + 1))
+    
+    def _projection_params(self, fields=None):
+        """Build ProjectionExpression params for the requested attributes, empty for all attributes"""
+        if not fields:
+            return {}
+        names = {f'#f{i}': field for i, field in enumerate(fields)}
+        return {
+            'ProjectionExpression': ', '.join(names.keys()),
+            'ExpressionAttributeNames': names
+        }
+    
+    def _read(self, operation, **params):
+        """Run a low-level read such as get_item or batch_get_item, hedged when DYNAMODB_HEDGED_READS is on"""
+        client = pool.get_client()
+        if not HEDGED_READS:
+            return getattr(client, operation)(**params)
+        hedge_client = pool.get_hedge_client()
+        return hedged_call(lambda: getattr(client, operation)(**params), lambda: getattr(hedge_client, operation)(**params))
+    
+    def _get_item(self, table_name, key, fields=None):
+        """Fetch one item by key, None when it does not exist"""
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+        response = self._read(
+            'get_item',
+            TableName=table_name,
+            Key={name: serializer.serialize(value) for name, value in key.items()},
+            **self._projection_params(fields)
+        )
+        item = response.get('Item')
+        return {k: deserializer.deserialize(v) for k, v in item.items()} if item else None
+    
     def _batch_scan_by_ids(self, table, ids, id_field, batch_size=100):
         """Scan table in batches filtering by list of IDs"""
         from decimal import Decimal
@@ -55,4 +113,117 @@ class BaseDynamoDBAdapter:
                     item_id = int(item_id)
                 results[item_id] = item
                 
+        return results
+    
+    def _scan_page(self, table, limit, start_key=None, **kwargs):
+        """Scan until limit items are collected, returning them with the key to resume from"""
+        items = []
+        last_key = start_key
+        while len(items) < limit:
+            params = dict(kwargs, Limit=limit - len(items))
+            if last_key:
+                params['ExclusiveStartKey'] = last_key
+            response = table.scan(**params)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+        return items, last_key
+    
+    def _query_page(self, table, limit, start_key=None, **kwargs):
+        """Query until limit items are collected, returning them with the key to resume from"""
+        items = []
+        last_key = start_key
+        while len(items) < limit:
+            params = dict(kwargs, Limit=limit - len(items))
+            if last_key:
+                params['ExclusiveStartKey'] = last_key
+            response = table.query(**params)
+            items.extend(response.get('Items', []))
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+        return items, last_key
+    
+    def _query_all(self, table, **kwargs):
+        """Run a query and follow LastEvaluatedKey until all pages are read"""
+        response = table.query(**kwargs)
+        items = response.get('Items', [])
+        while 'LastEvaluatedKey' in response:
+            response = table.query(ExclusiveStartKey=response['LastEvaluatedKey'], **kwargs)
+            items.extend(response.get('Items', []))
+        return items
+    
+    def _query_partitions_parallel(self, table_name, index_name, key_name, key_values, max_workers=8):
+        """Query one index partition per key value concurrently and return all items"""
+        queries = [{
+            'IndexName': index_name,
+            'KeyConditionExpression': '#pk = :pk',
+            'ExpressionAttributeNames': {'#pk': key_name},
+            'ExpressionAttributeValues': {':pk': key_value}
+        } for key_value in key_values]
+        results = self._query_parallel(table_name, queries, max_workers)
+        return [item for partition in results for item in partition]
+    
+    def _query_parallel(self, table_name, queries, max_workers=8, max_items=None):
+        """Run independent queries concurrently, returning the items of each query in order
+
+        With max_items each query stops after that many items instead of reading every page.
+        """
+        if not queries:
+            return []
+        
+        # Low-level clients are thread safe, resources are not
+        client = pool.get_client()
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+        
+        def run_query(params):
+            params = dict(params, TableName=table_name)
+            if 'ExpressionAttributeValues' in params:
+                params['ExpressionAttributeValues'] = {k: serializer.serialize(v) for k, v in params['ExpressionAttributeValues'].items()}
+            if max_items:
+                params['PaginationConfig'] = {'MaxItems': max_items}
+            pages = client.get_paginator('query').paginate(**params)
+            return [
+                {k: deserializer.deserialize(v) for k, v in item.items()}
+                for page in pages for item in page.get('Items', [])
+            ]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            # Each query runs in a copy of this context so the request deadline applies to it
+            futures = [executor.submit(copy_context().run, run_query, params) for params in queries]
+            return [future.result() for future in futures]
+    
+    def _batch_get(self, table_name, key_name, ids, fields=None):
+        """Fetch items by key with BatchGetItem, returning a dict keyed by id (numeric ids as int)
+
+        Goes through the low-level client so it is safe to call from worker threads.
+        """
+        from decimal import Decimal
+        serializer = TypeSerializer()
+        deserializer = TypeDeserializer()
+        results = {}
+        ids = list(dict.fromkeys(ids))
+        
+        def key_value(item_id):
+            return serializer.serialize(item_id if isinstance(item_id, str) else Decimal(str(item_id)))
+        
+        for i in range(0, len(ids), 100):
+            request = {table_name: {'Keys': [{key_name: key_value(item_id)} for item_id in ids[i:i + 100]]}}
+            if fields:
+                request[table_name].update(self._projection_params(list(dict.fromkeys([key_name] + list(fields)))))
+            
+            attempt = 0
+            while request:
+                response = self._read('batch_get_item', RequestItems=request)
+                for raw_item in response.get('Responses', {}).get(table_name, []):
+                    item = {k: deserializer.deserialize(v) for k, v in raw_item.items()}
+                    item_id = item[key_name]
+                    results[int(item_id) if isinstance(item_id, Decimal) else item_id] = item
+                request = response.get('UnprocessedKeys')
+                if request:
+                    # Throttled keys are returned unprocessed, back off before retrying them
+                    time.sleep(min(0.05 * (2 ** attempt), 1))
+                    attempt += 1
         return results
\ No newline at end of file
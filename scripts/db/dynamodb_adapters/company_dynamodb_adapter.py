@@ -1,13 +1,11 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timezone
 from botocore.exceptions import ClientError
 from scripts.db.config import COMPANIES_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
 
 class CompanyDynamoDBAdapter(BaseDynamoDBAdapter):
-    def __init__(self):
-        super().__init__()
-        self.companies_table = self.dynamodb.Table(COMPANIES_TABLE)
+    companies_table = DynamoDBTable(COMPANIES_TABLE)
     
     def create_company(self, name: str, spoc: str, email_id: str, status: str = "active") -> Dict[str, Any]:
         now = datetime.now(timezone.utc).isoformat()
@@ -43,6 +41,18 @@ class CompanyDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError:
             return []
     
+    def get_companies_by_ids(self, company_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        try:
+            return self._batch_get(COMPANIES_TABLE, 'id', company_ids)
+        except ClientError:
+            return {}
+    
+    def list_companies_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        try:
+            return self._scan_page(self.companies_table, limit, start_key)
+        except ClientError:
+            return [], None
+    
     def list_active_companies(self) -> List[Dict[str, Any]]:
         try:
             response = self.companies_table.scan(
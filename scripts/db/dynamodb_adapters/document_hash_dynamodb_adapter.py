@@ -0,0 +1,33 @@
+from typing import Optional, Dict, Any
+from datetime import datetime
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+from botocore.exceptions import ClientError
+from scripts.db.config import DOCUMENT_HASHES_TABLE
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
+
+class DocumentHashDynamoDBAdapter(BaseDynamoDBAdapter):
+    """SHA-256 of uploaded document content mapped to where the content already lives"""
+    hashes_table = DynamoDBTable(DOCUMENT_HASHES_TABLE)
+    
+    def get_document(self, sha256: str) -> Optional[Dict[str, Any]]:
+        response = self.hashes_table.get_item(Key={'sha256': sha256})
+        return response.get('Item')
+    
+    def record_document(self, sha256: str, document_url: str, profile_id: int) -> bool:
+        """Remember the first upload of some content, False if it was already recorded"""
+        try:
+            self.hashes_table.put_item(
+                Item={
+                    'sha256': sha256,
+                    'document_url': document_url,
+                    'profile_id': Decimal(str(profile_id)),
+                    'created_date': datetime.now(ZoneInfo('Asia/Kolkata')).isoformat()
+                },
+                ConditionExpression='attribute_not_exists(sha256)'
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
\ No newline at end of file
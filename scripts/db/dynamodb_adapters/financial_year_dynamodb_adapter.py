@@ -2,6 +2,7 @@ from typing import List, Dict, Any, Optional
 from scripts.db.dynamodb_adapters.base_dynamodb_adapter import BaseDynamoDBAdapter
 from scripts.db.config import FINANCIAL_YEARS_TABLE
 from datetime import datetime
+from scripts.utils.deadline import DeadlineExceeded
 
 class FinancialYearDynamoDBAdapter(BaseDynamoDBAdapter):
     def __init__(self):
@@ -46,9 +47,7 @@ class FinancialYearDynamoDBAdapter(BaseDynamoDBAdapter):
         return items[0] if items else None
     
     def get_financial_year_by_id(self, year_id: int) -> Optional[Dict[str, Any]]:
-        table = self.dynamodb.Table(self.table_name)
-        response = table.get_item(Key={'id': year_id})
-        return response.get('Item')
+        return self._get_item(self.table_name, {'id': year_id})
     
     def set_active_financial_year(self, year_id: int) -> bool:
         # Deactivate all years
@@ -91,6 +90,8 @@ class FinancialYearDynamoDBAdapter(BaseDynamoDBAdapter):
                 ExpressionAttributeValues=expression_values
             )
             return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
     
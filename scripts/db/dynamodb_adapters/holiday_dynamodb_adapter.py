@@ -2,6 +2,7 @@ from typing import List, Dict, Any, Optional
 from scripts.db.dynamodb_adapters.base_dynamodb_adapter import BaseDynamoDBAdapter
 from scripts.db.config import HOLIDAYS_TABLE, USER_HOLIDAY_SELECTIONS_TABLE
 from datetime import datetime
+from scripts.utils.deadline import DeadlineExceeded
 
 class HolidayDynamoDBAdapter(BaseDynamoDBAdapter):
     def __init__(self):
@@ -65,6 +66,8 @@ class HolidayDynamoDBAdapter(BaseDynamoDBAdapter):
                 ExpressionAttributeValues=expression_values
             )
             return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
     
@@ -73,6 +76,8 @@ class HolidayDynamoDBAdapter(BaseDynamoDBAdapter):
             table = self.dynamodb.Table(self.table_name)
             table.delete_item(Key={'id': holiday_id})
             return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
     
@@ -1,12 +1,10 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from botocore.exceptions import ClientError
 from scripts.db.config import INVOICES_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
 
 class InvoiceDynamoDBAdapter(BaseDynamoDBAdapter):
-    def __init__(self):
-        super().__init__()
-        self.invoices_table = self.dynamodb.Table(INVOICES_TABLE)
+    invoices_table = DynamoDBTable(INVOICES_TABLE)
     
     def create_invoice(self, invoice_data: Dict[str, Any]) -> Dict[str, Any]:
         from decimal import Decimal
@@ -31,6 +29,12 @@ class InvoiceDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError:
             return []
     
+    def list_invoices_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        try:
+            return self._scan_page(self.invoices_table, limit, start_key)
+        except ClientError:
+            return [], None
+    
     def get_invoice(self, invoice_id: int) -> Optional[Dict[str, Any]]:
         try:
             from decimal import Decimal
@@ -1,7 +1,11 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 from scripts.db.dynamodb_adapters.base_dynamodb_adapter import BaseDynamoDBAdapter
-from scripts.db.config import LEAVES_TABLE, LEAVE_BALANCES_TABLE
-from datetime import datetime
+from scripts.db.config import LEAVES_TABLE, LEAVE_BALANCES_TABLE, LEGACY_LEAVE_BALANCES_TABLE, LEAVE_CALENDAR_TABLE, LEAVES_USERNAME_START_INDEX
+from datetime import date, datetime
+from scripts.db.loader import cached_get, invalidates
+from scripts.utils.deadline import DeadlineExceeded
 
 class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
     
@@ -9,6 +13,7 @@ class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
         super().__init__()
         self.leave_table_name = LEAVES_TABLE
         self.balance_table_name = LEAVE_BALANCES_TABLE
+        self.calendar_table_name = LEAVE_CALENDAR_TABLE
     
     def create_leave(self, leave_data: Dict[str, Any]) -> int:
         leave_id = self._get_next_id('leaves')
@@ -29,13 +34,18 @@ class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
         table.put_item(Item=item)
         return leave_id
     
-    def get_user_leaves(self, username: str) -> List[Dict]:
+    def get_user_leaves(self, username: str, starting_by: Optional[date] = None, status: Optional[str] = None) -> List[Dict]:
+        """Leaves of username by start date, only those starting on or before starting_by and in status when given"""
+        key_condition = Key('username').eq(username)
+        if starting_by is not None:
+            key_condition &= Key('start_date').lte(starting_by.isoformat())
+        
+        params = {'IndexName': LEAVES_USERNAME_START_INDEX, 'KeyConditionExpression': key_condition}
+        if status:
+            params['FilterExpression'] = Attr('status').eq(status)
+        
         table = self.dynamodb.Table(self.leave_table_name)
-        response = table.scan(
-            FilterExpression='username = :username',
-            ExpressionAttributeValues={':username': username}
-        )
-        return response.get('Items', [])
+        return self._query_all(table, **params)
     
     def get_pending_leaves(self) -> List[Dict]:
         table = self.dynamodb.Table(self.leave_table_name)
@@ -46,16 +56,29 @@ class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
         )
         return response.get('Items', [])
     
+    def get_pending_leaves_page(self, limit: int, start_key: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        table = self.dynamodb.Table(self.leave_table_name)
+        return self._scan_page(
+            table, limit, start_key,
+            FilterExpression='#status = :status',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':status': 'pending'}
+        )
+    
     def get_all_leaves(self) -> List[Dict]:
         table = self.dynamodb.Table(self.leave_table_name)
         response = table.scan()
         return response.get('Items', [])
     
-    def get_leave_by_id(self, leave_id: int) -> Optional[Dict]:
+    def get_all_leaves_page(self, limit: int, start_key: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
         table = self.dynamodb.Table(self.leave_table_name)
-        response = table.get_item(Key={'id': leave_id})
-        return response.get('Item')
+        return self._scan_page(table, limit, start_key)
     
+    @cached_get('leave')
+    def get_leave_by_id(self, leave_id: int) -> Optional[Dict]:
+        return self._get_item(self.leave_table_name, {'id': leave_id})
+    
+    @invalidates('leave')
     def update_leave(self, leave_id: int, update_data: Dict[str, Any]) -> bool:
         update_parts = []
         expression_values = {}
@@ -91,41 +114,137 @@ class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
             
             table.update_item(**update_params)
             return True
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"DynamoDB update error: {e}")
             return False
     
-    def create_leave_balance(self, username: str) -> int:
-        balance_id = self._get_next_id('leave_balances')
+    def add_to_calendar(self, financial_year_id: int, leave: Dict[str, Any]):
+        """Record an approved leave in the calendar partition of a financial year it falls in"""
+        start_date = leave['start_date'] if isinstance(leave['start_date'], str) else leave['start_date'].isoformat()
+        end_date = leave['end_date'] if isinstance(leave['end_date'], str) else leave['end_date'].isoformat()
+        table = self.dynamodb.Table(self.calendar_table_name)
+        table.put_item(Item={
+            'financial_year_id': int(financial_year_id),
+            'leave_key': f"{start_date}#{int(leave['id'])}",
+            'leave_id': int(leave['id']),
+            'username': leave['username'],
+            'leave_type': leave['leave_type'],
+            'start_date': start_date,
+            'end_date': end_date
+        })
+    
+    def get_calendar_leaves(self, financial_year: Dict[str, Any]) -> List[Dict]:
+        """Approved leaves recorded for a financial year, by start date"""
+        table = self.dynamodb.Table(self.calendar_table_name)
+        return self._query_all(table, KeyConditionExpression=Key('financial_year_id').eq(int(financial_year['id'])))
+    
+    @staticmethod
+    def balance_key(username: str, year: int) -> str:
+        return f"{username}#{year}"
+    
+    def _copy_legacy_balance(self, username: str) -> Optional[Dict]:
+        """Carry a user's balance over from the id keyed table if migrate_leave_balances.py has not yet
+
+        Returns None when the user has no legacy balance or the legacy table is gone.
+        """
+        legacy_table = self.dynamodb.Table(LEGACY_LEAVE_BALANCES_TABLE)
+        scan_params = {'FilterExpression': Attr('username').eq(username)}
+        try:
+            response = legacy_table.scan(**scan_params)
+            items = response.get('Items', [])
+            while 'LastEvaluatedKey' in response:
+                response = legacy_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+                items.extend(response.get('Items', []))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ResourceNotFoundException':
+                return None
+            raise
+        if not items:
+            return None
+        
+        # Same choice as the migration, the most recently updated row
+        legacy = max(items, key=lambda item: item.get('updated_date', ''))
+        year = datetime.now().year
+        item = {key: value for key, value in legacy.items() if key != 'id'}
+        item['balance_key'] = self.balance_key(username, year)
+        item['year'] = year
+        table = self.dynamodb.Table(self.balance_table_name)
+        try:
+            table.put_item(Item=item, ConditionExpression='attribute_not_exists(balance_key)')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            # Copied by a concurrent request or the migration
+            return self._get_item(self.balance_table_name, {'balance_key': item['balance_key']})
+        return item
+    
+    @invalidates('leave_balance')
+    def create_leave_balance(self, username: str) -> str:
+        # A balance not migrated yet must not be replaced by a zero row, the
+        # migration would then skip it as already present
+        legacy = self._copy_legacy_balance(username)
+        if legacy:
+            return legacy['balance_key']
+        
+        year = datetime.now().year
+        balance_key = self.balance_key(username, year)
         item = {
-            'id': balance_id,
+            'balance_key': balance_key,
             'username': username,
             'annual_leave': 0,
             'sick_leave': 0,
             'casual_leave': 0,
-            'year': datetime.now().year,
+            'year': year,
             'created_date': datetime.now().isoformat(),
             'updated_date': datetime.now().isoformat()
         }
         
         table = self.dynamodb.Table(self.balance_table_name)
-        table.put_item(Item=item)
-        return balance_id
+        try:
+            # Two requests creating the same balance must not reset one another's updates
+            table.put_item(Item=item, ConditionExpression='attribute_not_exists(balance_key)')
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+        return balance_key
     
+    @cached_get('leave_balance')
     def get_leave_balance(self, username: str) -> Optional[Dict]:
-        table = self.dynamodb.Table(self.balance_table_name)
-        response = table.scan(
-            FilterExpression='username = :username',
-            ExpressionAttributeValues={':username': username}
-        )
-        items = response.get('Items', [])
-        return items[0] if items else None
+        # Early in a year the balance may still be on last year's row, see update_leave_balance
+        year = datetime.now().year
+        return (self._get_item(self.balance_table_name, {'balance_key': self.balance_key(username, year)})
+                or self._get_item(self.balance_table_name, {'balance_key': self.balance_key(username, year - 1)})
+                or self._copy_legacy_balance(username))
     
+    @invalidates('leave_balance')
     def update_leave_balance(self, username: str, update_data: Dict[str, Any]) -> bool:
         balance = self.get_leave_balance(username)
         if not balance:
             return False
         
+        table = self.dynamodb.Table(self.balance_table_name)
+        balance_key = balance['balance_key']
+        year = datetime.now().year
+        if int(balance['year']) != year:
+            # First change of the year carries last year's balance forward to this year's row
+            balance_key = self.balance_key(username, year)
+            try:
+                table.put_item(Item={
+                    **balance,
+                    **update_data,
+                    'balance_key': balance_key,
+                    'year': year,
+                    'created_date': datetime.now().isoformat(),
+                    'updated_date': datetime.now().isoformat()
+                }, ConditionExpression='attribute_not_exists(balance_key)')
+                return True
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                    return False
+            # A concurrent first change created the row, apply this one on top of it
+        
         update_expression = "SET "
         expression_values = {}
         
@@ -137,12 +256,13 @@ class LeaveDynamoDBAdapter(BaseDynamoDBAdapter):
         expression_values[":updated_date"] = datetime.now().isoformat()
         
         try:
-            table = self.dynamodb.Table(self.balance_table_name)
             table.update_item(
-                Key={'id': balance['id']},
+                Key={'balance_key': balance_key},
                 UpdateExpression=update_expression,
                 ExpressionAttributeValues=expression_values
             )
             return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
\ No newline at end of file
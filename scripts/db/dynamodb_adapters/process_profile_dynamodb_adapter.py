@@ -1,17 +1,16 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from botocore.exceptions import ClientError
-from scripts.db.config import PROCESS_PROFILES_TABLE, PROFILES_TABLE, PROFILE_STATUSES_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from scripts.db.config import PROCESS_PROFILES_TABLE, PROFILES_TABLE, PROFILE_STATUSES_TABLE, PROCESS_PROFILES_REQUIREMENT_INDEX
+from scripts.db.loader import load_many
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
 
 logger = logging.getLogger(__name__)
 
 class ProcessProfileDynamoDBAdapter(BaseDynamoDBAdapter):
-    def __init__(self):
-        super().__init__()
-        self.process_profiles_table = self.dynamodb.Table(PROCESS_PROFILES_TABLE)
-        self.profiles_table = self.dynamodb.Table(PROFILES_TABLE)
-        self.profile_statuses_table = self.dynamodb.Table(PROFILE_STATUSES_TABLE)
+    process_profiles_table = DynamoDBTable(PROCESS_PROFILES_TABLE)
+    profiles_table = DynamoDBTable(PROFILES_TABLE)
+    profile_statuses_table = DynamoDBTable(PROFILE_STATUSES_TABLE)
     
     def create_process_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -55,6 +54,17 @@ class ProcessProfileDynamoDBAdapter(BaseDynamoDBAdapter):
         self.process_profiles_table.put_item(Item=profile_data)
         return profile_data
     
+    def create_process_profiles_bulk(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert new process profiles with one id block, for profiles that have none yet"""
+        if not records:
+            return []
+        ids = self._get_next_id_block('process_profiles', len(records))
+        with self.process_profiles_table.batch_writer() as batch:
+            for record, record_id in zip(records, ids):
+                record['id'] = record_id
+                batch.put_item(Item=record)
+        return records
+    
     def upsert_process_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         from decimal import Decimal
         
@@ -123,6 +133,13 @@ class ProcessProfileDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError:
             return []
     
+    def get_process_profiles_by_requirements(self, requirement_ids: List[int]) -> list:
+        """All process profiles of the given requirements, one index query per requirement"""
+        try:
+            return self._query_partitions_parallel(PROCESS_PROFILES_TABLE, PROCESS_PROFILES_REQUIREMENT_INDEX, 'requirement_id', list(dict.fromkeys(requirement_ids)))
+        except ClientError:
+            return []
+    
     def get_profiles_by_requirement_and_recruiter(self, requirement_id: int, recruiter_name: str) -> list:
         try:
             from decimal import Decimal
@@ -250,21 +267,19 @@ class ProcessProfileDynamoDBAdapter(BaseDynamoDBAdapter):
             status_response = self.profile_statuses_table.scan()
             status_map = {item['id']: item['stage'] for item in status_response.get('Items', [])}
             
+            # Get full profile data in one batch
+            profiles = load_many('profile', [pp['profile_id'] for pp in process_profiles if pp.get('profile_id')],
+                                 lambda ids: self._batch_get(PROFILES_TABLE, 'id', ids))
             enriched_profiles = []
             for process_profile in process_profiles:
-                if process_profile.get('profile_id'):
-                    # Get full profile data
-                    profile_response = self.profiles_table.get_item(
-                        Key={'id': process_profile['profile_id']}
-                    )
-                    if 'Item' in profile_response:
-                        profile = profile_response['Item']
-                        profile_status = profile.get('status', 1)
-                        stage = status_map.get(profile_status, 'Unknown')
-                        profile['stage'] = stage
-                        # Add recruiter_name from process_profile
-                        profile['recruiter_name'] = process_profile.get('recruiter_name')
-                        enriched_profiles.append(profile)
+                if process_profile.get('profile_id') and int(process_profile['profile_id']) in profiles:
+                    profile = dict(profiles[int(process_profile['profile_id'])])
+                    profile_status = profile.get('status', 1)
+                    stage = status_map.get(profile_status, 'Unknown')
+                    profile['stage'] = stage
+                    # Add recruiter_name from process_profile
+                    profile['recruiter_name'] = process_profile.get('recruiter_name')
+                    enriched_profiles.append(profile)
             return enriched_profiles
         except ClientError:
             return []
\ No newline at end of file
@@ -1,26 +1,38 @@
-from typing import Optional, List, Dict, Any
+import logging
+from typing import Optional, List, Dict, Any, Tuple
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
-from scripts.db.config import PROFILES_TABLE, PROFILE_STATUSES_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from scripts.db.config import PROFILES_TABLE, PROFILE_STATUSES_TABLE, PROFILE_CONTACTS_TABLE, PROFILES_CREATED_DAY_INDEX
+from scripts.db.lambda_dynamodb_pool import pool
+from scripts.db.loader import cached_get, invalidates
+from scripts.profiles.search import rank_matches
+from scripts.utils.contacts import ContactTaken, contact_keys
+from scripts.utils.deadline import DeadlineExceeded
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
+from .profile_search_dynamodb_adapter import ProfileSearchDynamoDBAdapter
 
 class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
+    profiles_table = DynamoDBTable(PROFILES_TABLE)
+    profile_statuses_table = DynamoDBTable(PROFILE_STATUSES_TABLE)
+    contacts_table = DynamoDBTable(PROFILE_CONTACTS_TABLE)
+    
     def __init__(self):
         super().__init__()
-        self.profiles_table = self.dynamodb.Table(PROFILES_TABLE)
-        self.profile_statuses_table = self.dynamodb.Table(PROFILE_STATUSES_TABLE)
+        self.search_index = ProfileSearchDynamoDBAdapter()
     
-    def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_profile(self, profile_data: Dict[str, Any], profile_id: int) -> Dict[str, Any]:
         from decimal import Decimal
         from datetime import date, datetime
         from zoneinfo import ZoneInfo
         
-        profile_id = self._get_next_id('profiles')
         profile_data['id'] = profile_id
         
         # Add timestamps
         now = datetime.now(ZoneInfo('Asia/Kolkata'))
         profile_data['created_date'] = now.isoformat()
         profile_data['updated_date'] = now.isoformat()
+        # Day bucket (IST) used as partition key of the created_day index
+        profile_data['created_day'] = now.date().isoformat()
         
         # Convert float and date values for DynamoDB compatibility
         for key, value in profile_data.items():
@@ -28,25 +40,100 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
                 profile_data[key] = Decimal(str(value))
             elif isinstance(value, (date, datetime)) and key not in ['created_date', 'updated_date']:
                 profile_data[key] = value.isoformat()
+        return profile_data
+    
+    def create_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        profile_id = self._get_next_id('profiles')
+        profile_data = self._prepare_profile(profile_data, profile_id)
+        
+        # The profile and its contact keys are written together, a contact key
+        # that already exists cancels the whole transaction
+        serializer = TypeSerializer()
+        transact_items = [{'Put': {
+            'TableName': PROFILES_TABLE,
+            'Item': {k: serializer.serialize(v) for k, v in profile_data.items()},
+            'ConditionExpression': 'attribute_not_exists(id)'
+        }}]
+        for key in contact_keys(profile_data.get('email'), profile_data.get('phone')):
+            transact_items.append({'Put': {
+                'TableName': PROFILE_CONTACTS_TABLE,
+                'Item': {'contact_key': {'S': key}, 'profile_id': {'N': str(profile_id)}},
+                'ConditionExpression': 'attribute_not_exists(contact_key)'
+            }})
+        try:
+            pool.get_client().transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            # Reasons line up with transact_items, the first one is the profile itself
+            reasons = e.response.get('CancellationReasons', [])
+            taken = [item['Put']['Item']['contact_key']['S'] for item, reason in zip(transact_items[1:], reasons[1:]) if reason.get('Code') == 'ConditionalCheckFailed']
+            if e.response['Error']['Code'] == 'TransactionCanceledException' and taken:
+                raise ContactTaken(self.find_existing_contacts(taken).get(taken[0]))
+            raise
         
-        self.profiles_table.put_item(Item=profile_data)
+        try:
+            self.search_index.index_profile(profile_data)
+        except ClientError as e:
+            # The profile is stored, a rebuild restores any postings missed here
+            logging.error(f"Failed to index profile {profile_id}: {e}")
         return profile_data
     
-    def list_profiles(self) -> List[Dict[str, Any]]:
+    def create_profiles_bulk(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many profiles with one id block and batched writes
+
+        Unlike create_profile the contact keys are not written conditionally,
+        callers check find_existing_contacts first.
+        """
+        from decimal import Decimal
+        if not profiles:
+            return []
+        
+        ids = self._get_next_id_block('profiles', len(profiles))
+        created = [self._prepare_profile(profile_data, profile_id) for profile_data, profile_id in zip(profiles, ids)]
+        
+        # batch_writer sends 25 item batches and resubmits unprocessed items
+        with self.profiles_table.batch_writer() as batch:
+            for profile in created:
+                batch.put_item(Item=profile)
+        with self.contacts_table.batch_writer() as batch:
+            for profile in created:
+                for key in contact_keys(profile.get('email'), profile.get('phone')):
+                    batch.put_item(Item={'contact_key': key, 'profile_id': Decimal(str(profile['id']))})
+        try:
+            self.search_index.index_profiles(created)
+        except ClientError as e:
+            logging.error(f"Failed to index imported profiles: {e}")
+        return created
+    
+    def list_profiles(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         try:
-            response = self.profiles_table.scan()
+            response = self.profiles_table.scan(**self._projection_params(fields))
             return response.get('Items', [])
         except ClientError:
             return []
     
-    def get_profile(self, profile_id: int) -> Optional[Dict[str, Any]]:
+    def list_profiles_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        try:
+            return self._scan_page(self.profiles_table, limit, start_key, **self._projection_params(fields))
+        except ClientError:
+            return [], None
+    
+    @cached_get('profile')
+    def get_profile(self, profile_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         try:
             from decimal import Decimal
-            response = self.profiles_table.get_item(Key={'id': Decimal(str(profile_id))})
-            return response.get('Item')
+            return self._get_item(PROFILES_TABLE, {'id': Decimal(str(profile_id))}, fields)
         except ClientError:
             return None
     
+    def get_statuses_by_ids(self, profile_ids: List[int]) -> Dict[int, int]:
+        """Return {profile_id: status} for existing profiles"""
+        try:
+            profiles = self._batch_get(PROFILES_TABLE, 'id', profile_ids, fields=['status'])
+            return {profile_id: int(profile.get('status', 1)) for profile_id, profile in profiles.items()}
+        except ClientError:
+            return {}
+    
+    @invalidates('profile')
     def update_profile(self, profile_id: int, update_data: Dict[str, Any]) -> bool:
         try:
             from decimal import Decimal
@@ -59,6 +146,7 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
             update_expression = "SET "
             expression_values = {}
             expression_names = {}
+            updated_values = {}
             
             # DynamoDB reserved keywords that need ExpressionAttributeNames
             reserved_keywords = {'location', 'status', 'role', 'name', 'date', 'time'}
@@ -79,23 +167,160 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
                     update_expression += f"{key} = :{key}, "
                 
                 expression_values[f":{key}"] = value
+                updated_values[key] = value
             
             update_expression = update_expression.rstrip(', ')
             
             update_params = {
                 'Key': {'id': Decimal(str(profile_id))},
                 'UpdateExpression': update_expression,
-                'ExpressionAttributeValues': expression_values
+                'ExpressionAttributeValues': expression_values,
+                # Without it an unknown id would create a profile holding only these fields
+                'ConditionExpression': 'attribute_exists(id)',
+                'ReturnValues': 'ALL_OLD'
             }
             
             if expression_names:
                 update_params['ExpressionAttributeNames'] = expression_names
             
-            self.profiles_table.update_item(**update_params)
+            # New contact keys are claimed before the profile changes, so a key
+            # owned by another profile stops the update
+            claimed = self._claim_contacts(profile_id, contact_keys(update_data.get('email'), update_data.get('phone')))
+            try:
+                response = self.profiles_table.update_item(**update_params)
+            except ClientError as e:
+                self._release_contacts(profile_id, claimed)
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    return False
+                raise
+            old_profile = response.get('Attributes', {'id': Decimal(str(profile_id))})
+            new_profile = dict(old_profile, **updated_values)
+            try:
+                self.search_index.reindex_profile(old_profile, new_profile)
+                self._sync_contacts(profile_id, old_profile, new_profile)
+            except ClientError as e:
+                logging.error(f"Failed to reindex profile {profile_id}: {e}")
             return True
         except ClientError:
             return False
     
+    @invalidates('profile')
+    def transition_status(self, profile_id: int, status: int, accepted_offer: Optional[float] = None, joining_date=None) -> Optional[Dict[str, Any]]:
+        """Apply a status change in one conditional UpdateItem, returns the new item or None if the profile does not exist"""
+        from decimal import Decimal
+        from datetime import datetime
+        from zoneinfo import ZoneInfo
+        
+        assignments = ['#status = :status', 'updated_date = :updated_date']
+        values = {':status': status, ':updated_date': datetime.now(ZoneInfo('Asia/Kolkata')).isoformat()}
+        if accepted_offer is not None:
+            assignments.append('accepted_offer = :accepted_offer')
+            values[':accepted_offer'] = Decimal(str(accepted_offer))
+        if joining_date is not None:
+            assignments.append('joining_date = :joining_date')
+            values[':joining_date'] = joining_date.isoformat()
+        
+        try:
+            response = self.profiles_table.update_item(
+                Key={'id': Decimal(str(profile_id))},
+                UpdateExpression='SET ' + ', '.join(assignments),
+                ConditionExpression='attribute_exists(id)',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues=values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+        return response['Attributes']
+    
+    def find_existing_contacts(self, keys: List[str]) -> Dict[str, int]:
+        """Map the given contact keys that are already registered to their profile id"""
+        matches = self._batch_get(PROFILE_CONTACTS_TABLE, 'contact_key', keys)
+        return {key: int(item['profile_id']) for key, item in matches.items()}
+    
+    def find_duplicate_profile(self, email: Optional[str], phone: Optional[str], exclude_id: Optional[int] = None) -> Optional[int]:
+        """Return the id of a profile already registered with this email or phone"""
+        keys = contact_keys(email, phone)
+        if not keys:
+            return None
+        matches = self.find_existing_contacts(keys)
+        for key in keys:
+            if key in matches and matches[key] != exclude_id:
+                return matches[key]
+        return None
+    
+    def _claim_contacts(self, profile_id: int, keys: List[str]) -> List[str]:
+        """Register contact keys to a profile, returning the ones that were not registered yet
+
+        A key registered to another profile raises ContactTaken once the keys claimed
+        so far are released again.
+        """
+        from decimal import Decimal
+        claimed = []
+        for key in keys:
+            try:
+                response = self.contacts_table.put_item(
+                    Item={'contact_key': key, 'profile_id': Decimal(str(profile_id))},
+                    ConditionExpression='attribute_not_exists(contact_key) OR profile_id = :profile_id',
+                    ExpressionAttributeValues={':profile_id': Decimal(str(profile_id))},
+                    ReturnValues='ALL_OLD'
+                )
+            except ClientError as e:
+                self._release_contacts(profile_id, claimed)
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    raise ContactTaken(self.find_existing_contacts([key]).get(key))
+                raise
+            if 'Attributes' not in response:
+                claimed.append(key)
+        return claimed
+    
+    def _release_contacts(self, profile_id: int, keys):
+        """Delete contact keys still registered to a profile, keys another profile owns stay"""
+        from decimal import Decimal
+        for key in keys:
+            try:
+                self.contacts_table.delete_item(
+                    Key={'contact_key': key},
+                    ConditionExpression='profile_id = :profile_id',
+                    ExpressionAttributeValues={':profile_id': Decimal(str(profile_id))}
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+    
+    def _sync_contacts(self, profile_id: int, old_profile: Dict[str, Any], new_profile: Dict[str, Any]):
+        # New keys were claimed before the update, only the ones no longer used are left
+        old_keys = set(contact_keys(old_profile.get('email'), old_profile.get('phone')))
+        new_keys = set(contact_keys(new_profile.get('email'), new_profile.get('phone')))
+        self._release_contacts(profile_id, old_keys - new_keys)
+    
+    def search_profiles(self, query_tokens: List[str], search_fields: List[str], ranges: Optional[Dict[str, Tuple[Any, Any]]] = None, limit: int = 20, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        matches = self.search_index.find_matches(query_tokens, search_fields, ranges)
+        ranked = rank_matches(matches, query_tokens)[:limit]
+        profiles = self._batch_get(PROFILES_TABLE, 'id', [profile_id for profile_id, _ in ranked], fields)
+        return [dict(profiles[profile_id], search_score=score) for profile_id, score in ranked if profile_id in profiles]
+    
+    def index_document_text(self, profile_id: int, text: str) -> bool:
+        """Index the text extracted from a profile's document, False if the profile is gone"""
+        profile = self.get_profile(profile_id)
+        if not profile:
+            return False
+        self.search_index.index_document(profile, text)
+        return True
+    
+    def rebuild_search_index(self) -> int:
+        self.search_index.clear_index()
+        indexed = 0
+        start_key = None
+        while True:
+            profiles, start_key = self.list_profiles_page(100, start_key)
+            self.search_index.index_profiles(profiles, include_documents=True)
+            indexed += len(profiles)
+            if not start_key:
+                return indexed
+    
     def list_profile_statuses(self) -> List[Dict[str, Any]]:
         try:
             response = self.profile_statuses_table.scan()
@@ -106,22 +331,14 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
     def get_profiles_by_date_range(self, start_date, end_date, recruiter_name=None) -> List[Dict[str, Any]]:
         try:
             import logging
-            from scripts.db.config import PROCESS_PROFILES_TABLE, REQUIREMENTS_TABLE, COMPANIES_TABLE
+            from scripts.db.config import PROCESS_PROFILES_TABLE, PROCESS_PROFILES_PROFILE_INDEX, REQUIREMENTS_TABLE, COMPANIES_TABLE
             from decimal import Decimal
             
-            # Filter by date range using DynamoDB FilterExpression
-            start_str = start_date.isoformat()
-            end_str = (end_date.replace(hour=23, minute=59, second=59) if hasattr(end_date, 'hour') else end_date).isoformat() + 'T23:59:59'
-            
-            response = self.profiles_table.scan(
-                FilterExpression='#created_date BETWEEN :start_date AND :end_date',
-                ExpressionAttributeNames={'#created_date': 'created_date'},
-                ExpressionAttributeValues={
-                    ':start_date': start_str,
-                    ':end_date': end_str
-                }
-            )
-            filtered_profiles = response.get('Items', [])
+            from datetime import timedelta
+            
+            # Query only the day buckets covering the requested range
+            days = [(start_date + timedelta(days=offset)).isoformat() for offset in range((end_date - start_date).days + 1)]
+            filtered_profiles = self._query_partitions_parallel(PROFILES_TABLE, PROFILES_CREATED_DAY_INDEX, 'created_day', days)
             logging.info(f"Filtered profiles count: {len(filtered_profiles)}")
             
             # Get profile IDs from filtered profiles
@@ -132,9 +349,10 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
                     pid = int(pid)
                 profile_ids.append(pid)
             
-            # Get process profiles only for filtered profile IDs
-            process_profiles_table = self.dynamodb.Table(PROCESS_PROFILES_TABLE)
-            process_profiles = self._batch_scan_by_ids(process_profiles_table, profile_ids, 'profile_id')
+            # Process profiles of these profiles only, one index query per profile
+            process_profiles = {}
+            for pp in self._query_partitions_parallel(PROCESS_PROFILES_TABLE, PROCESS_PROFILES_PROFILE_INDEX, 'profile_id', profile_ids):
+                process_profiles[int(pp['profile_id'])] = pp
             
             # Get unique requirement IDs from process profiles
             requirement_ids = set()
@@ -145,18 +363,13 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
                         req_id = int(req_id)
                     requirement_ids.add(req_id)
             
-            # Get requirements only for the ones we need
-            requirements_table = self.dynamodb.Table(REQUIREMENTS_TABLE)
-            companies_table = self.dynamodb.Table(COMPANIES_TABLE)
-            requirements = self._batch_scan_by_ids(requirements_table, list(requirement_ids), 'requirement_id')
-            
-            comp_response = companies_table.scan()
-            companies = {}
-            for comp in comp_response.get('Items', []):
-                comp_id = comp.get('id')
-                if isinstance(comp_id, Decimal):
-                    comp_id = int(comp_id)
-                companies[comp_id] = comp.get('name')
+            # Requirements and companies by key, only the ones these rows refer to
+            requirements = self._batch_get(REQUIREMENTS_TABLE, 'requirement_id', list(requirement_ids), fields=['company_id'])
+            company_ids = {int(requirement['company_id']) for requirement in requirements.values() if requirement.get('company_id')}
+            companies = {
+                company_id: company.get('name')
+                for company_id, company in self._batch_get(COMPANIES_TABLE, 'id', list(company_ids), fields=['name']).items()
+            }
             
             logging.info(f"Process profiles mapped: {len(process_profiles)}")
             
@@ -201,12 +414,16 @@ class ProfileDynamoDBAdapter(BaseDynamoDBAdapter):
                         'requirement_id': req_id,
                         'company_name': company_name
                     })
+                except DeadlineExceeded:
+                    raise
                 except Exception as e:
                     logging.error(f"Error processing profile: {e}")
                     continue
             
             logging.info(f"Final result count: {len(result)}")
             return result
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             import logging
             logging.error(f"Error in get_profiles_by_date_range: {e}")
@@ -0,0 +1,133 @@
+import zlib
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from typing import List, Dict, Any, Optional, Tuple
+from decimal import Decimal
+from scripts.db.config import PROFILE_SEARCH_TABLE, PROFILE_DOCUMENTS_TABLE
+from scripts.profiles.search import profile_postings, document_postings, range_values
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
+
+class ProfileSearchDynamoDBAdapter(BaseDynamoDBAdapter):
+    """Inverted index of profile tokens
+
+    Postings are partitioned by field and the first two characters of the token,
+    with the sort key "<token>#<profile_id>" so prefix lookups are a begins_with query.
+    Extracted document text is kept zlib compressed in the profile documents table.
+    """
+    search_table = DynamoDBTable(PROFILE_SEARCH_TABLE)
+    documents_table = DynamoDBTable(PROFILE_DOCUMENTS_TABLE)
+
+    @staticmethod
+    def _key(field: str, token: str, profile_id) -> Dict[str, str]:
+        return {'shard': f"{field}#{token[:2]}", 'term': f"{token}#{int(profile_id)}"}
+
+    def _posting_item(self, field: str, token: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        item = self._key(field, token, profile['id'])
+        item.update({'profile_id': Decimal(str(profile['id'])), 'field': field, 'token': token})
+        for attr, value in range_values(profile).items():
+            item[attr] = Decimal(str(value))
+        return item
+
+    def index_profile(self, profile: Dict[str, Any]):
+        self.index_profiles([profile])
+
+    def index_profiles(self, profiles: List[Dict[str, Any]], include_documents: bool = False):
+        """Write the postings of profiles, with include_documents their document text postings too"""
+        texts = self._document_texts([profile['id'] for profile in profiles]) if include_documents else {}
+        with self.search_table.batch_writer() as batch:
+            for profile in profiles:
+                for field, token in profile_postings(profile) | document_postings(texts.get(int(profile['id']))):
+                    batch.put_item(Item=self._posting_item(field, token, profile))
+
+    def reindex_profile(self, old_profile: Dict[str, Any], new_profile: Dict[str, Any]):
+        """Apply only the posting changes between two versions of a profile"""
+        old_postings = profile_postings(old_profile)
+        new_postings = profile_postings(new_profile)
+
+        # Range values live on every posting, so a change there rewrites them all
+        if range_values(old_profile) != range_values(new_profile):
+            removed, added = old_postings - new_postings, new_postings | document_postings(self.get_document_text(new_profile['id']))
+        else:
+            removed, added = old_postings - new_postings, new_postings - old_postings
+
+        with self.search_table.batch_writer() as batch:
+            for field, token in removed:
+                batch.delete_item(Key=self._key(field, token, old_profile['id']))
+            for field, token in added:
+                batch.put_item(Item=self._posting_item(field, token, new_profile))
+
+    def index_document(self, profile: Dict[str, Any], text: str):
+        """Store the compressed text of a profile's document and replace its document postings"""
+        old_postings = document_postings(self.get_document_text(profile['id']))
+        new_postings = document_postings(text)
+        self.documents_table.put_item(Item={
+            'profile_id': Decimal(str(profile['id'])),
+            'text_zlib': zlib.compress(text.encode()),
+            'text_length': len(text),
+            'extracted_date': datetime.now(ZoneInfo('Asia/Kolkata')).isoformat()
+        })
+        with self.search_table.batch_writer() as batch:
+            for field, token in old_postings - new_postings:
+                batch.delete_item(Key=self._key(field, token, profile['id']))
+            for field, token in new_postings - old_postings:
+                batch.put_item(Item=self._posting_item(field, token, profile))
+
+    def get_document_text(self, profile_id: int) -> Optional[str]:
+        return self._document_texts([profile_id]).get(int(profile_id))
+
+    def _document_texts(self, profile_ids: List[int]) -> Dict[int, str]:
+        documents = self._batch_get(PROFILE_DOCUMENTS_TABLE, 'profile_id', profile_ids)
+        return {
+            profile_id: zlib.decompress(document['text_zlib'].value).decode()
+            for profile_id, document in documents.items()
+        }
+
+    def clear_index(self):
+        scan_params = {
+            'ProjectionExpression': '#shard, #term',
+            'ExpressionAttributeNames': {'#shard': 'shard', '#term': 'term'}
+        }
+        response = self.search_table.scan(**scan_params)
+        while True:
+            with self.search_table.batch_writer() as batch:
+                for item in response.get('Items', []):
+                    batch.delete_item(Key={'shard': item['shard'], 'term': item['term']})
+            if 'LastEvaluatedKey' not in response:
+                break
+            response = self.search_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_params)
+
+    def find_matches(self, query_tokens: List[str], fields: List[str], ranges: Optional[Dict[str, Tuple[Any, Any]]] = None) -> List[Tuple[int, str, str, str]]:
+        """Return (profile_id, query_token, field, token) for postings matching any query token prefix"""
+        names = {'#shard': 'shard', '#term': 'term', '#field': 'field', '#token': 'token'}
+        filters = []
+        filter_values = {}
+        for attr, (low, high) in (ranges or {}).items():
+            if low is not None:
+                names[f'#{attr}'] = attr
+                filters.append(f'#{attr} >= :{attr}_min')
+                filter_values[f':{attr}_min'] = Decimal(str(low))
+            if high is not None:
+                names[f'#{attr}'] = attr
+                filters.append(f'#{attr} <= :{attr}_max')
+                filter_values[f':{attr}_max'] = Decimal(str(high))
+
+        lookups = [(query_token, field) for query_token in query_tokens for field in fields]
+        queries = []
+        for query_token, field in lookups:
+            # Single character tokens only match exactly, their shard holds no longer tokens
+            prefix = query_token if len(query_token) > 1 else f"{query_token}#"
+            params = {
+                'KeyConditionExpression': '#shard = :shard AND begins_with(#term, :prefix)',
+                'ProjectionExpression': 'profile_id, #field, #token',
+                'ExpressionAttributeNames': dict(names),
+                'ExpressionAttributeValues': dict(filter_values, **{':shard': f"{field}#{query_token[:2]}", ':prefix': prefix})
+            }
+            if filters:
+                params['FilterExpression'] = ' AND '.join(filters)
+            queries.append(params)
+
+        results = self._query_parallel(PROFILE_SEARCH_TABLE, queries)
+        return [
+            (int(item['profile_id']), query_token, item['field'], item['token'])
+            for (query_token, _), items in zip(lookups, results) for item in items
+        ]
\ No newline at end of file
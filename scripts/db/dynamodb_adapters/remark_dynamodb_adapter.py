@@ -0,0 +1,89 @@
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from scripts.db.config import REMARKS_TABLE, PROFILES_TABLE, REQUIREMENTS_TABLE
+from scripts.db.lambda_dynamodb_pool import pool
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
+
+class RemarkDynamoDBAdapter(BaseDynamoDBAdapter):
+    """Remarks stored one item per remark, partitioned by "<entity_type>#<id>" and sorted by time"""
+    remarks_table = DynamoDBTable(REMARKS_TABLE)
+    
+    # Parent table and key attribute of each entity that carries remarks
+    PARENTS = {
+        'profile': (PROFILES_TABLE, 'id'),
+        'requirement': (REQUIREMENTS_TABLE, 'requirement_id')
+    }
+    # Entities whose remarks are queried concurrently in one batch
+    REMARK_QUERY_BATCH = 100
+    
+    def _remark_item(self, entity_type: str, entity_id: int, remark: str, username: str) -> Dict[str, Any]:
+        now = datetime.now(ZoneInfo('Asia/Kolkata'))
+        return {
+            'entity': f"{entity_type}#{entity_id}",
+            'remark_key': f"{now.isoformat()}#{username}",
+            'username': username,
+            'remark': remark,
+            'created_date': now.isoformat()
+        }
+    
+    def put_remark(self, entity_type: str, entity_id: int, remark: str, username: str) -> Dict[str, Any]:
+        """Store a remark for an entity the caller has already found"""
+        item = self._remark_item(entity_type, entity_id, remark, username)
+        self.remarks_table.put_item(Item=item)
+        return item
+    
+    def add_remark(self, entity_type: str, entity_id: int, remark: str, username: str) -> Optional[Dict[str, Any]]:
+        """Store a remark, returns None when the parent entity does not exist"""
+        item = self._remark_item(entity_type, entity_id, remark, username)
+        table_name, key_name = self.PARENTS[entity_type]
+        serializer = TypeSerializer()
+        
+        # The parent check and the put go out as one request and never touch the parent item
+        try:
+            pool.get_client().transact_write_items(TransactItems=[
+                {'ConditionCheck': {
+                    'TableName': table_name,
+                    'Key': {key_name: {'N': str(entity_id)}},
+                    'ConditionExpression': f'attribute_exists({key_name})'
+                }},
+                {'Put': {
+                    'TableName': REMARKS_TABLE,
+                    'Item': {k: serializer.serialize(v) for k, v in item.items()},
+                    'ConditionExpression': 'attribute_not_exists(remark_key)'
+                }}
+            ])
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons', [])
+            if e.response['Error']['Code'] == 'TransactionCanceledException' and reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                return None
+            raise
+        return item
+    
+    def list_remarks(self, entity_type: str, entity_id: int, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Remarks oldest first, all of them unless a page limit is given"""
+        key_condition = Key('entity').eq(f"{entity_type}#{entity_id}")
+        if limit is None:
+            return self._query_all(self.remarks_table, KeyConditionExpression=key_condition), None
+        return self._query_page(self.remarks_table, limit, start_key, KeyConditionExpression=key_condition)
+    
+    def get_remarks_by_entities(self, entity_type: str, entity_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Remarks of each entity oldest first, for rendering a page of list results"""
+        entity_ids = list(dict.fromkeys(int(entity_id) for entity_id in entity_ids))
+        if not entity_ids:
+            return {}
+        remarks = {}
+        # One query per entity partition, batched so a whole unpaged list never
+        # queues thousands of queries at once
+        for i in range(0, len(entity_ids), self.REMARK_QUERY_BATCH):
+            batch = entity_ids[i:i + self.REMARK_QUERY_BATCH]
+            queries = [{
+                'KeyConditionExpression': '#entity = :entity',
+                'ExpressionAttributeNames': {'#entity': 'entity'},
+                'ExpressionAttributeValues': {':entity': f"{entity_type}#{entity_id}"}
+            } for entity_id in batch]
+            remarks.update(zip(batch, self._query_parallel(REMARKS_TABLE, queries)))
+        return remarks
\ No newline at end of file
@@ -1,16 +1,56 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from scripts.db.config import REQUIREMENTS_TABLE, REQUIREMENT_STATUSES_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from scripts.db.config import (
+    REQUIREMENTS_TABLE, REQUIREMENT_STATUSES_TABLE, PROCESS_PROFILES_TABLE,
+    PROCESS_PROFILES_RECRUITER_INDEX, REQUIREMENTS_COMPANY_STATUS_INDEX
+)
+from scripts.db.loader import cached_get, invalidates
+from scripts.utils.deadline import DeadlineExceeded
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
 import logging
 
 logger = logging.getLogger(__name__)
 
 class RequirementDynamoDBAdapter(BaseDynamoDBAdapter):
-    def __init__(self):
-        super().__init__()
-        self.requirements_table = self.dynamodb.Table(REQUIREMENTS_TABLE)
-        self.requirement_statuses_table = self.dynamodb.Table(REQUIREMENT_STATUSES_TABLE)
+    requirements_table = DynamoDBTable(REQUIREMENTS_TABLE)
+    requirement_statuses_table = DynamoDBTable(REQUIREMENT_STATUSES_TABLE)
+    
+    # Open statuses (not 4=Closed, 5=Fulfilled)
+    OPEN_STATUSES = (1, 2, 3)
+    
+    @staticmethod
+    def status_created(status_id, created_date) -> str:
+        """Sort key of the company index: status first so a status range is one key condition, then creation time"""
+        return f"{int(status_id):02d}#{created_date or ''}"
+    
+    def _open_status_queries(self, company_id: int, newest_first: bool = True, after: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """One company index query per open status, each ordered by creation time and starting at after"""
+        from decimal import Decimal
+        queries = []
+        for status_id in self.OPEN_STATUSES:
+            prefix = self.status_created(status_id, '')
+            if after:
+                # Inclusive bound, items created at the same instant are filtered by the caller
+                bound = self.status_created(status_id, after['created_date'])
+                low, high = (prefix, bound) if newest_first else (bound, prefix + '\uffff')
+                condition = '#company_id = :company_id AND #status_created BETWEEN :low AND :high'
+                values = {':low': low, ':high': high}
+            else:
+                condition = '#company_id = :company_id AND begins_with(#status_created, :prefix)'
+                values = {':prefix': prefix}
+            queries.append({
+                'IndexName': REQUIREMENTS_COMPANY_STATUS_INDEX,
+                'KeyConditionExpression': condition,
+                'ExpressionAttributeNames': {'#company_id': 'company_id', '#status_created': 'status_created'},
+                'ExpressionAttributeValues': dict(values, **{':company_id': Decimal(str(company_id))}),
+                'ScanIndexForward': not newest_first
+            })
+        return queries
+    
+    @staticmethod
+    def _creation_order(requirement: Dict[str, Any]) -> Tuple[str, int]:
+        return requirement.get('created_date') or '', int(requirement['requirement_id'])
     
     def create_requirement(self, requirement_data: Dict[str, Any]) -> Dict[str, Any]:
         from decimal import Decimal
@@ -24,26 +64,36 @@ class RequirementDynamoDBAdapter(BaseDynamoDBAdapter):
                 requirement_data[key] = Decimal(str(value))
             elif isinstance(value, (date, datetime)):
                 requirement_data[key] = value.isoformat()
+        if requirement_data.get('status_id') is not None:
+            requirement_data['status_created'] = self.status_created(requirement_data['status_id'], requirement_data.get('created_date'))
         
         self.requirements_table.put_item(Item=requirement_data)
         return requirement_data
     
-    def list_requirements(self) -> List[Dict[str, Any]]:
+    def list_requirements(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         try:
-            response = self.requirements_table.scan(ConsistentRead=True)
+            response = self.requirements_table.scan(ConsistentRead=True, **self._projection_params(fields))
             return response.get('Items', [])
         except ClientError as e:
             logger.error(f"[DB] DynamoDB scan failed: {str(e)}")
             return []
     
-    def get_requirement(self, requirement_id: int) -> Optional[Dict[str, Any]]:
+    def list_requirements_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        try:
+            return self._scan_page(self.requirements_table, limit, start_key, ConsistentRead=True, **self._projection_params(fields))
+        except ClientError as e:
+            logger.error(f"[DB] DynamoDB scan failed: {str(e)}")
+            return [], None
+    
+    @cached_get('requirement')
+    def get_requirement(self, requirement_id: int, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         try:
             from decimal import Decimal
-            response = self.requirements_table.get_item(Key={'requirement_id': Decimal(str(requirement_id))})
-            return response.get('Item')
+            return self._get_item(REQUIREMENTS_TABLE, {'requirement_id': Decimal(str(requirement_id))}, fields)
         except ClientError:
             return None
     
+    @invalidates('requirement')
     def update_requirement(self, requirement_id: int, update_data: Dict[str, Any]) -> bool:
         try:
             from decimal import Decimal
@@ -54,6 +104,15 @@ class RequirementDynamoDBAdapter(BaseDynamoDBAdapter):
             if not existing_item:
                 return False
             
+            # Keep the company index sort key in step with status and creation time
+            if 'status_id' in update_data or 'created_date' in update_data:
+                status_id = update_data.get('status_id', existing_item.get('status_id'))
+                created_date = update_data.get('created_date', existing_item.get('created_date'))
+                if isinstance(created_date, (date, datetime)):
+                    created_date = created_date.isoformat()
+                if status_id is not None:
+                    update_data = dict(update_data, status_created=self.status_created(status_id, created_date))
+            
             update_expression = "SET "
             expression_values = {}
             expression_names = {}
@@ -94,6 +153,8 @@ class RequirementDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError as e:
             print(f"ClientError updating requirement {requirement_id}: {e}")
             return False
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             print(f"Unexpected error updating requirement {requirement_id}: {e}")
             return False
@@ -105,55 +166,55 @@ class RequirementDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError:
             return []
     
-    def get_open_requirements_by_company(self, company_id: int) -> List[Dict[str, Any]]:
+    def get_open_requirements_by_company(self, company_id: int, newest_first: bool = True) -> List[Dict[str, Any]]:
         try:
-            from decimal import Decimal
-            response = self.requirements_table.scan(
-                FilterExpression='company_id = :company_id AND (status_id = :status1 OR status_id = :status2 OR status_id = :status3)',
-                ExpressionAttributeValues={
-                    ':company_id': Decimal(str(company_id)),
-                    ':status1': Decimal('1'),
-                    ':status2': Decimal('2'),
-                    ':status3': Decimal('3')
-                },
-                ConsistentRead=True
-            )
-            return response.get('Items', [])
+            results = self._query_parallel(REQUIREMENTS_TABLE, self._open_status_queries(company_id, newest_first))
+            return sorted((item for items in results for item in items), key=self._creation_order, reverse=newest_first)
         except ClientError:
             return []
     
-    def get_open_requirements_by_company_and_recruiter(self, company_id: int, recruiter_name: str) -> List[Dict[str, Any]]:
-        from scripts.db.config import PROCESS_PROFILES_TABLE
+    def get_open_requirements_by_company_page(self, company_id: int, limit: int, start_key: Optional[Dict[str, Any]] = None, newest_first: bool = True) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Open requirements of a company ordered by creation time, merged from one index query per open status"""
         try:
-            # Get requirements assigned to recruiter
-            process_profiles_table = self.dynamodb.Table(PROCESS_PROFILES_TABLE)
-            pp_response = process_profiles_table.scan(
-                FilterExpression='recruiter_name = :recruiter_name',
-                ExpressionAttributeValues={':recruiter_name': recruiter_name}
-            )
-            assigned_req_ids = [pp['requirement_id'] for pp in pp_response.get('Items', [])]
+            results = self._query_parallel(REQUIREMENTS_TABLE, self._open_status_queries(company_id, newest_first, start_key), max_items=limit + 1)
+            # A status that filled its quota may have more items past this page
+            saturated = any(len(items) > limit for items in results)
             
-            if not assigned_req_ids:
-                return []
-            
-            # Get open requirements for company that are assigned to recruiter
-            from decimal import Decimal
-            # Convert req_ids to Decimal
-            decimal_req_ids = [Decimal(str(req_id)) for req_id in assigned_req_ids]
+            requirements = [item for items in results for item in items]
+            if start_key:
+                position = (start_key['created_date'], int(start_key['requirement_id']))
+                requirements = [
+                    item for item in requirements
+                    if (self._creation_order(item) < position if newest_first else self._creation_order(item) > position)
+                ]
+            requirements.sort(key=self._creation_order, reverse=newest_first)
             
-            response = self.requirements_table.scan(
-                FilterExpression='company_id = :company_id AND (status_id = :status1 OR status_id = :status2 OR status_id = :status3)',
-                ExpressionAttributeValues={
-                    ':company_id': Decimal(str(company_id)),
-                    ':status1': Decimal('1'),
-                    ':status2': Decimal('2'),
-                    ':status3': Decimal('3')
-                },
-                ConsistentRead=True
+            page = requirements[:limit]
+            if not page or (len(requirements) <= limit and not saturated):
+                return page, None
+            created_date, requirement_id = self._creation_order(page[-1])
+            return page, {'created_date': created_date, 'requirement_id': requirement_id}
+        except ClientError as e:
+            logger.error(f"[DB] DynamoDB query failed: {str(e)}")
+            return [], None
+    
+    def get_open_requirements_by_company_and_recruiter(self, company_id: int, recruiter_name: str) -> List[Dict[str, Any]]:
+        try:
+            # Requirements the recruiter is assigned to, from the recruiter index of process_profiles
+            assignments = self._query_all(
+                self.dynamodb.Table(PROCESS_PROFILES_TABLE),
+                IndexName=PROCESS_PROFILES_RECRUITER_INDEX,
+                KeyConditionExpression=Key('recruiter_name').eq(recruiter_name),
+                ProjectionExpression='requirement_id'
             )
+            requirement_ids = {int(item['requirement_id']) for item in assignments}
+            if not requirement_ids:
+                return []
             
-            # Filter by assigned requirement IDs in Python since DynamoDB IN has limitations
-            filtered_items = [item for item in response.get('Items', []) if item.get('requirement_id') in decimal_req_ids]
-            return filtered_items
+            # Intersect with the company's open requirements from the company index
+            return [
+                requirement for requirement in self.get_open_requirements_by_company(company_id)
+                if int(requirement['requirement_id']) in requirement_ids
+            ]
         except ClientError:
             return []
\ No newline at end of file
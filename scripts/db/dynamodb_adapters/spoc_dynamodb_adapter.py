@@ -1,13 +1,11 @@
-from typing import List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timezone
 from botocore.exceptions import ClientError
 from scripts.db.config import SPOCS_TABLE
-from .base_dynamodb_adapter import BaseDynamoDBAdapter
+from .base_dynamodb_adapter import BaseDynamoDBAdapter, DynamoDBTable
 
 class SPOCDynamoDBAdapter(BaseDynamoDBAdapter):
-    def __init__(self):
-        super().__init__()
-        self.spocs_table = self.dynamodb.Table(SPOCS_TABLE)
+    spocs_table = DynamoDBTable(SPOCS_TABLE)
     
     def create_spoc(self, company_id: int, name: str, phone: str, email_id: str, location: str, status: str = "active") -> Dict[str, Any]:
         now = datetime.now(timezone.utc).isoformat()
@@ -33,6 +31,18 @@ class SPOCDynamoDBAdapter(BaseDynamoDBAdapter):
         except ClientError:
             return []
     
+    def get_spocs_by_ids(self, spoc_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        try:
+            return self._batch_get(SPOCS_TABLE, 'id', spoc_ids)
+        except ClientError:
+            return {}
+    
+    def list_spocs_page(self, limit: int, start_key: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        try:
+            return self._scan_page(self.spocs_table, limit, start_key)
+        except ClientError:
+            return [], None
+    
     def update_spoc(self, spoc_id: int, update_data: Dict[str, Any]) -> bool:
         try:
             from decimal import Decimal
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hedged reads cost extra read capacity, so they are opt-in
+HEDGED_READS = os.getenv('DYNAMODB_HEDGED_READS', 'false').lower() == 'true'
+
+# A duplicate read is sent once the first has taken longer than this percentile of recent reads
+HEDGE_PERCENTILE = 0.95
+HEDGE_WINDOW = 500
+MIN_HEDGE_SAMPLES = 50
+# Used until enough reads have been timed, and as a floor so fast tables are not hedged constantly
+DEFAULT_HEDGE_DELAY = 0.05
+MIN_HEDGE_DELAY = 0.01
+
+# Each read earns this fraction of a hedge, so at most ~10% of reads are duplicated
+HEDGE_BUDGET_RATIO = 0.1
+MAX_HEDGE_BURST = 10.0
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='hedged-read')
+
+class HedgePolicy:
+    """Latency window, hedge budget and counters shared by all hedged reads of the container"""
+    def __init__(self):
+        self._latencies = deque(maxlen=HEDGE_WINDOW)
+        self._lock = threading.Lock()
+        self._tokens = MAX_HEDGE_BURST
+        self._counts = {'reads': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_exhausted': 0, 'errors': 0}
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return DEFAULT_HEDGE_DELAY
+            ordered = sorted(self._latencies)
+        return max(ordered[int(len(ordered) * HEDGE_PERCENTILE) - 1], MIN_HEDGE_DELAY)
+
+    def start_read(self):
+        with self._lock:
+            self._counts['reads'] += 1
+            self._tokens = min(self._tokens + HEDGE_BUDGET_RATIO, MAX_HEDGE_BURST)
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self._counts['budget_exhausted'] += 1
+                return False
+            self._tokens -= 1
+            self._counts['hedged'] += 1
+            return True
+
+    def count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        counts['enabled'] = HEDGED_READS
+        counts['hedge_delay_ms'] = round(self.delay() * 1000, 1)
+        return counts
+
+policy = HedgePolicy()
+
+def _submit(call: Callable[[], Any]):
+    # Runs in a copy of the caller's context so the request deadline still applies
+    return _executor.submit(copy_context().run, call)
+
+def hedged_call(primary: Callable[[], Any], hedge: Callable[[], Any], delay: Optional[float] = None) -> Any:
+    """Return the result of primary(), or of hedge() if primary has not answered after delay
+
+    Whichever answers first wins, the slower call is left to finish in the background.
+    An error from one call is only raised when the other one fails too.
+    """
+    policy.start_read()
+    started = time.monotonic()
+    first = _submit(primary)
+    first.add_done_callback(lambda _: policy.record(time.monotonic() - started))
+
+    done, _ = wait([first], timeout=policy.delay() if delay is None else delay)
+    if done or not policy.try_hedge():
+        return first.result()
+
+    second = _submit(hedge)
+    pending = {first, second}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is second:
+                    policy.count('hedge_wins')
+                return future.result()
+            policy.count('errors')
+            error = future.exception()
+            logger.warning(f"Hedged read attempt failed: {error}")
+    raise error
\ No newline at end of file
@@ -1,36 +1,80 @@
 import boto3
 import os
+from botocore.config import Config
 from scripts.db.config import AWS_REGION
+from scripts.utils.deadline import check_deadline, remaining
+
+# Client settings by the request's remaining budget in seconds, the first tier the budget
+# reaches is used. Requests without a deadline get the first tier.
+DYNAMODB_TIERS = (
+    (10.0, Config(connect_timeout=2, read_timeout=5, retries={'mode': 'standard', 'max_attempts': 4})),
+    (3.0, Config(connect_timeout=1, read_timeout=2, retries={'mode': 'standard', 'max_attempts': 2})),
+    (0.0, Config(connect_timeout=0.5, read_timeout=1, retries={'mode': 'standard', 'max_attempts': 1}))
+)
+
+def _fail_fast(**kwargs):
+    # Runs before every attempt, retries included, so none starts past the deadline
+    check_deadline()
 
 class LambdaDynamoDBPool:
-    _resource = None
-    _client = None
-    
+    _resources = {}
+    _tables = {}
+    _clients = {}
+    _hedge_clients = {}
+
+    @staticmethod
+    def _tier() -> int:
+        left = remaining()
+        if left is None:
+            return 0
+        return next((index for index, (budget, _) in enumerate(DYNAMODB_TIERS) if left >= budget), len(DYNAMODB_TIERS) - 1)
+
+    @staticmethod
+    def _session():
+        env = os.getenv('ENVIRONMENT', 'local')
+        if env in ['dev', 'prod']:
+            # Running in AWS environment
+            return boto3.Session()
+        # Running locally
+        return boto3.Session(profile_name='developer')
+
+    @classmethod
+    def _tier_resource(cls, tier: int):
+        if tier not in cls._resources:
+            resource = cls._session().resource('dynamodb', region_name=AWS_REGION, config=DYNAMODB_TIERS[tier][1])
+            resource.meta.client.meta.events.register('before-send.dynamodb', _fail_fast)
+            cls._resources[tier] = resource
+        return cls._resources[tier]
+
     @classmethod
     def get_resource(cls):
-        if cls._resource is None:
-            env = os.getenv('ENVIRONMENT', 'local')
-            if env in ['dev', 'prod']:
-                # Running in AWS environment
-                cls._resource = boto3.resource('dynamodb', region_name=AWS_REGION)
-            else:
-                # Running locally
-                session = boto3.Session(profile_name='developer')
-                cls._resource = session.resource('dynamodb', region_name=AWS_REGION)
-        return cls._resource
-    
+        return cls._tier_resource(cls._tier())
+
+    @classmethod
+    def get_table(cls, name: str):
+        """The table on the tier for the time left now, kept per tier since Table() builds its class on every call"""
+        tier = cls._tier()
+        if (tier, name) not in cls._tables:
+            cls._tables[(tier, name)] = cls._tier_resource(tier).Table(name)
+        return cls._tables[(tier, name)]
+
+    @classmethod
+    def _tier_client(cls, clients):
+        tier = cls._tier()
+        if tier not in clients:
+            client = cls._session().client('dynamodb', region_name=AWS_REGION, config=DYNAMODB_TIERS[tier][1])
+            client.meta.events.register('before-send.dynamodb', _fail_fast)
+            clients[tier] = client
+        return clients[tier]
+
     @classmethod
     def get_client(cls):
-        if cls._client is None:
-            env = os.getenv('ENVIRONMENT', 'local')
-            if env in ['dev', 'prod']:
-                # Running in AWS environment
-                cls._client = boto3.client('dynamodb', region_name=AWS_REGION)
-            else:
-                # Running locally
-                session = boto3.Session(profile_name='developer')
-                cls._client = session.client('dynamodb', region_name=AWS_REGION)
-        return cls._client
+        return cls._tier_client(cls._clients)
+
+    @classmethod
+    def get_hedge_client(cls):
+        """A second client with its own connection pool, so a hedged read never queues behind the slow one"""
+        return cls._tier_client(cls._hedge_clients)
 
 # Global pool instance
 pool = LambdaDynamoDBPool()
\ No newline at end of file
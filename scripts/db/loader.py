@@ -0,0 +1,107 @@
+import copy
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+# Entities read during the current request, keyed by (entity, id). None outside a request.
+_request_memo: ContextVar[Optional[Dict[tuple, Any]]] = ContextVar('request_memo', default=None)
+
+@contextmanager
+def request_scope():
+    """Memoize entity reads for the duration of one request"""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+def _key(entity: str, key: Any) -> tuple:
+    # Ids arrive as int, Decimal or numeric strings depending on the caller
+    if isinstance(key, Decimal) or (isinstance(key, str) and key.isdigit()):
+        key = int(key)
+    return entity, key
+
+def _copy(value: Any) -> Any:
+    # Callers may modify what they get back, the memo keeps its own copy
+    return copy.deepcopy(value) if isinstance(value, dict) else value
+
+def _project(value: Any, fields: Optional[List[str]]) -> Any:
+    if not fields or not isinstance(value, dict):
+        return value
+    return {field: value[field] for field in fields if field in value}
+
+def cached_get(entity: str):
+    """Memoize a get(self, id, fields=None) adapter method within the request
+
+    A record read in full also serves later reads of some of its fields. Reads that
+    project fields and are not memoized yet go to the database unchanged.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, key, *args, **kwargs):
+            memo = _request_memo.get()
+            if memo is None:
+                return func(self, key, *args, **kwargs)
+
+            fields = kwargs.get('fields', args[0] if args else None)
+            memo_key = _key(entity, key)
+            if memo_key in memo:
+                return _project(_copy(memo[memo_key]), fields)
+
+            value = func(self, key, *args, **kwargs)
+            if not fields:
+                memo[memo_key] = _copy(value)
+            return value
+        return wrapper
+    return decorator
+
+def invalidates(entity: str):
+    """Drop the memoized record of a write(self, id, ...) adapter method's id once it returns
+
+    Reads inside the write still see the memo, a write that reads back its own result
+    calls forget() first.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, key, *args, **kwargs):
+            try:
+                return func(self, key, *args, **kwargs)
+            finally:
+                forget(entity, key)
+        return wrapper
+    return decorator
+
+def forget(entity: str, key: Any):
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.pop(_key(entity, key), None)
+
+def load_many(entity: str, keys: Iterable[Hashable], batch_loader: Callable[[List], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+    """Return {id: record} for keys, fetching the ones not read yet in one batch_loader call
+
+    Missing records are left out of the result.
+    """
+    keys = list(dict.fromkeys(keys))
+    memo = _request_memo.get()
+    if memo is None:
+        return batch_loader(keys)
+
+    found = {}
+    missing = []
+    for key in keys:
+        memo_key = _key(entity, key)
+        if memo_key in memo:
+            found[memo_key[1]] = _copy(memo[memo_key])
+        else:
+            missing.append(key)
+
+    if missing:
+        loaded = batch_loader(missing)
+        for key in missing:
+            memo_key = _key(entity, key)
+            value = loaded.get(memo_key[1])
+            memo[memo_key] = _copy(value)
+            found[memo_key[1]] = value
+    return {key: value for key, value in found.items() if value is not None}
\ No newline at end of file
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Copy leave balances from the id keyed table into the balance_key (username#year) keyed table
+
+Run create_dynamodb_tables.py first, it creates the new table and the username-start_date
+index on leaves. Each user's most recently updated balance is written under the current
+year. Balances that already exist in the new table are left as they are, so the script
+can be re-run safely.
+
+Until this has run the API copies a user's legacy balance forward the first time it
+looks it up. Delete the legacy table only after the script reports no failures, the
+fallback stops once the table is gone.
+"""
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+import boto3
+from botocore.exceptions import ClientError
+from scripts.db.config import AWS_REGION, LEAVE_BALANCES_TABLE, LEGACY_LEAVE_BALANCES_TABLE
+from scripts.db.dynamodb_adapters.leave_dynamodb_adapter import LeaveDynamoDBAdapter
+
+def latest_balances(dynamodb):
+    """The most recently updated legacy balance of each user"""
+    table = dynamodb.Table(LEGACY_LEAVE_BALANCES_TABLE)
+    balances = {}
+
+    response = table.scan()
+    while True:
+        for item in response.get('Items', []):
+            username = item.get('username')
+            if not username:
+                continue
+            current = balances.get(username)
+            if current is None or item.get('updated_date', '') > current.get('updated_date', ''):
+                balances[username] = item
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
+    return balances
+
+def migrate_leave_balances(dynamodb):
+    table = dynamodb.Table(LEAVE_BALANCES_TABLE)
+    year = datetime.now().year
+    migrated = 0
+    skipped = 0
+    failed = 0
+
+    for username, balance in latest_balances(dynamodb).items():
+        item = {key: value for key, value in balance.items() if key != 'id'}
+        item['balance_key'] = LeaveDynamoDBAdapter.balance_key(username, year)
+        item['year'] = year
+        try:
+            table.put_item(Item=item, ConditionExpression='attribute_not_exists(balance_key)')
+            migrated += 1
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                skipped += 1
+                continue
+            print(f"✗ Failed to migrate balance of {username}: {str(e)}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ Failed to migrate balance of {username}: {str(e)}")
+            failed += 1
+
+    print(f"✓ Migrated {migrated} leave balances to {LEAVE_BALANCES_TABLE} ({skipped} already present, {failed} failed)")
+
+def main():
+    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    migrate_leave_balances(dynamodb)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Float, Boolean, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -92,9 +92,48 @@ class Profile(Base):
     offer_in_hand = Column(Boolean, default=False)
     variable_pay = Column(Float)
     document_url = Column(String)
+    document_status = Column(String)
+    document_sha256 = Column(String)
     created_date = Column(DateTime, default=lambda: datetime.now(ZoneInfo('Asia/Kolkata')))
     updated_date = Column(DateTime, default=lambda: datetime.now(ZoneInfo('Asia/Kolkata')), onupdate=lambda: datetime.now(ZoneInfo('Asia/Kolkata')))
 
+class ProfileContact(Base):
+    __tablename__ = "profile_contacts"
+    contact_key = Column(String, primary_key=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), index=True)
+
+class ProfileDocument(Base):
+    __tablename__ = "profile_documents"
+    profile_id = Column(Integer, ForeignKey("profiles.id"), primary_key=True)
+    text_zlib = Column(LargeBinary)
+    text_length = Column(Integer)
+    extracted_date = Column(DateTime, default=lambda: datetime.now(ZoneInfo('Asia/Kolkata')))
+
+class DocumentHash(Base):
+    __tablename__ = "document_hashes"
+    sha256 = Column(String, primary_key=True)
+    document_url = Column(String)
+    profile_id = Column(Integer)
+    created_date = Column(DateTime, default=lambda: datetime.now(ZoneInfo('Asia/Kolkata')))
+
+class Remark(Base):
+    __tablename__ = "remarks"
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, index=True)
+    remark_key = Column(String)
+    username = Column(String)
+    remark = Column(String)
+    created_date = Column(DateTime, default=lambda: datetime.now(ZoneInfo('Asia/Kolkata')))
+
+class ProfileSearchToken(Base):
+    __tablename__ = "profile_search_tokens"
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), index=True)
+    field = Column(String)
+    token = Column(String, index=True)
+    experience_years = Column(Integer)
+    expected_ctc = Column(Float)
+
 class Invoice(Base):
     __tablename__ = "invoices"
     id = Column(Integer, primary_key=True, index=True)
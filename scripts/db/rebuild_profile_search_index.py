@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Rebuild the profile search index from the profiles table
+"""
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+# ruff: noqa: E402
+from scripts.db.database_factory import get_database
+
+def main():
+    db = get_database()
+    try:
+        indexed = db.profile.rebuild_search_index()
+        print(f"✓ Rebuilt search index for {indexed} profiles")
+    except Exception as e:
+        print(f"✗ Failed to rebuild search index: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -8,6 +8,8 @@ from scripts.db.adapters.process_profile_adapter import ProcessProfileAdapter
 from scripts.db.adapters.leave_adapter import LeaveAdapter
 from scripts.db.adapters.financial_year_adapter import FinancialYearAdapter
 from scripts.db.adapters.holiday_adapter import HolidayAdapter
+from scripts.db.adapters.remark_adapter import RemarkAdapter
+from scripts.db.adapters.document_hash_adapter import DocumentHashAdapter
 
 class SQLiteAdapter:
     def __init__(self):
@@ -20,4 +22,6 @@ class SQLiteAdapter:
         self.process_profile = ProcessProfileAdapter()
         self.leave = LeaveAdapter()
         self.financial_year = FinancialYearAdapter()
-        self.holiday = HolidayAdapter()
\ No newline at end of file
+        self.holiday = HolidayAdapter()
+        self.remark = RemarkAdapter()
+        self.document_hash = DocumentHashAdapter()
\ No newline at end of file
@@ -5,6 +5,7 @@ from datetime import date
 from auth import require_hr, get_user_info
 from scripts.db.database_factory import get_database
 from scripts.utils.response import success_response, handle_error
+from scripts.leaves.calendar import invalidate_financial_years
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,7 @@ def create_financial_year(request: FinancialYearRequest, user_info: dict = Depen
             end_date=request.end_date,
             is_active=request.is_active
         )
+        invalidate_financial_years()
         
         logger.info("[EXIT] Create financial year API successful")
         return success_response({"id": year_id}, "Financial year created successfully")
@@ -130,6 +132,7 @@ def update_financial_year(year_id: int, request: FinancialYearUpdate, user_info:
                 "message": "Failed to update financial year",
                 "code": "500"
             })
+        invalidate_financial_years()
         
         logger.info("[EXIT] Update financial year API successful")
         return success_response({"id": year_id}, "Financial year updated successfully")
@@ -5,6 +5,7 @@ from datetime import date as Date
 from auth import require_hr, get_user_info
 from scripts.db.database_factory import get_database
 from scripts.utils.response import success_response, handle_error
+from scripts.leaves.calendar import invalidate_year, invalidate_user_selection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -63,6 +64,7 @@ def create_holiday(request: HolidayRequest, user_info: dict = Depends(require_hr
             date=request.date,
             is_mandatory=request.is_mandatory
         )
+        invalidate_year(request.financial_year_id)
         
         logger.info("[EXIT] Create holiday API successful")
         return success_response({"id": holiday_id}, "Holiday created successfully")
@@ -176,6 +178,7 @@ def select_optional_holidays(financial_year_id: int, request: HolidaySelectionRe
                 "message": "Failed to save holiday selection",
                 "code": "500"
             })
+        invalidate_user_selection(user_info['username'], financial_year_id)
         
         logger.info("[EXIT] Select optional holidays API successful")
         return success_response({"selected_holidays": request.holiday_ids}, "Optional holidays selected successfully")
@@ -261,6 +264,7 @@ def update_holiday(holiday_id: int, request: HolidayUpdate, user_info: dict = De
                 "message": "Failed to update holiday",
                 "code": "500"
             })
+        invalidate_year(existing_holiday['financial_year_id'])
         
         logger.info("[EXIT] Update holiday API successful")
         return success_response({"id": holiday_id}, "Holiday updated successfully")
@@ -295,6 +299,7 @@ def delete_holiday(holiday_id: int, user_info: dict = Depends(require_hr)):
                 "message": "Failed to delete holiday",
                 "code": "500"
             })
+        invalidate_year(existing_holiday['financial_year_id'])
         
         logger.info("[EXIT] Delete holiday API successful")
         return success_response({"id": holiday_id}, "Holiday deleted successfully")
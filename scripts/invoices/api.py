@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from scripts.db.database_factory import get_database
 from pydantic import BaseModel, field_validator
 from datetime import date
 from typing import Optional
-from scripts.utils.response import success_response, handle_error
+from scripts.utils.response import success_response, paginated_response, conditional_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from auth import require_finance_or_manager
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
@@ -56,16 +57,26 @@ def create_invoice(invoice: InvoiceCreate, user_info: dict = Depends(require_fin
         handle_error(e, "create invoice")
 
 @router.get("/list")
-def get_invoices(user_info: dict = Depends(require_finance_or_manager)):
+def get_invoices(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_finance_or_manager)
+):
     try:
         db = get_database()
+        if limit or cursor:
+            start_key = decode_cursor(cursor, "invoices")
+            invoices_data, last_key = db.invoice.list_invoices_page(limit or DEFAULT_PAGE_SIZE, start_key)
+            return paginated_response(invoices_data, encode_cursor(last_key, "invoices"), "Invoices retrieved successfully")
         invoices_data = db.invoice.list_invoices()
         return success_response(invoices_data, "Invoices retrieved successfully")
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "get invoices")
 
 @router.get("/{invoice_id}/fetch")
-def get_invoice(invoice_id: int, user_info: dict = Depends(require_finance_or_manager)):
+def get_invoice(invoice_id: int, request: Request, user_info: dict = Depends(require_finance_or_manager)):
     try:
         db = get_database()
         invoice = db.invoice.get_invoice(invoice_id)
@@ -75,7 +86,7 @@ def get_invoice(invoice_id: int, user_info: dict = Depends(require_finance_or_ma
                 "message": "Invoice not found",
                 "code": "INV_404"
             })
-        return success_response(invoice, "Invoice retrieved successfully")
+        return conditional_response(request, invoice, "Invoice retrieved successfully")
     except HTTPException:
         raise
     except Exception as e:
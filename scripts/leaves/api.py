@@ -1,31 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, field_validator
 from typing import Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from auth import get_user_info, require_leave_management, require_hr, validate_cognito_user
 from scripts.db.database_factory import get_database
-from scripts.utils.response import success_response, handle_error
+from scripts.utils.response import success_response, paginated_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from scripts.constants import LEAVE_TYPES
+from scripts.leaves.calendar import working_days
+from scripts.leaves.availability import MAX_CALENDAR_DAYS, record_approved_leave, team_calendar
 import logging
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def calculate_leave_days(start_date: date, end_date: date, leave_type: str) -> int:
+def calculate_leave_days(db, username: str, start_date: date, end_date: date, leave_type: str) -> int:
     """Calculate leave days based on industry standards"""
     if leave_type == 'sick':
         # Sick leave includes weekends
         return (end_date - start_date).days + 1
     else:
-        # Annual/casual leave excludes weekends
-        days = 0
-        current_date = start_date
-        while current_date <= end_date:
-            if current_date.weekday() < 5:  # Monday=0, Sunday=6
-                days += 1
-            current_date += timedelta(days=1)
-        return days
+        # Annual/casual leave excludes weekends, holidays and the user's optional holidays
+        return working_days(db, start_date, end_date, username)
 
 class LeaveRequest(BaseModel):
     leave_type: str
@@ -93,8 +90,10 @@ def apply_leave(leave_request: LeaveRequest, user_info: dict = Depends(get_user_
                 "code": "LEAVE_400"
             })
         
+        db = get_database()
+
         # Calculate days based on leave type
-        days = calculate_leave_days(leave_request.start_date, leave_request.end_date, leave_request.leave_type)
+        days = calculate_leave_days(db, user_info['username'], leave_request.start_date, leave_request.end_date, leave_request.leave_type)
         
         if days <= 0:
             raise HTTPException(status_code=400, detail={
@@ -102,12 +101,9 @@ def apply_leave(leave_request: LeaveRequest, user_info: dict = Depends(get_user_
                 "message": "Leave duration must be at least 1 day",
                 "code": "LEAVE_400"
             })
-        
-        db = get_database()
 
         # Check for pending leaves - block new applications if any pending leaves exist
-        existing_leaves = db.leave.get_user_leaves(user_info['username'])
-        pending_leaves = [leave for leave in existing_leaves if leave.get('status') == 'pending']
+        pending_leaves = db.leave.get_user_leaves(user_info['username'], status='pending')
         
         if pending_leaves:
             raise HTTPException(status_code=400, detail={
@@ -116,18 +112,18 @@ def apply_leave(leave_request: LeaveRequest, user_info: dict = Depends(get_user_
                 "code": "LEAVE_400"
             })
         
-        # Check for overlapping leaves with approved leaves only
-        for existing_leave in existing_leaves:
-            if existing_leave.get('status') == 'approved':
-                existing_start = datetime.strptime(existing_leave['start_date'], '%Y-%m-%d').date() if isinstance(existing_leave['start_date'], str) else existing_leave['start_date']
-                existing_end = datetime.strptime(existing_leave['end_date'], '%Y-%m-%d').date() if isinstance(existing_leave['end_date'], str) else existing_leave['end_date']
-                
-                if (leave_request.start_date <= existing_end and leave_request.end_date >= existing_start):
-                    raise HTTPException(status_code=409, detail={
-                        "error": "OVERLAPPING_LEAVE",
-                        "message": "Leave dates overlap with existing approved leave",
-                        "code": "LEAVE_409"
-                    })
+        # Check for overlapping leaves with approved leaves only, those starting after
+        # the requested end cannot overlap and are not read
+        approved_leaves = db.leave.get_user_leaves(user_info['username'], starting_by=leave_request.end_date, status='approved')
+        for existing_leave in approved_leaves:
+            existing_end = datetime.strptime(existing_leave['end_date'], '%Y-%m-%d').date() if isinstance(existing_leave['end_date'], str) else existing_leave['end_date']
+            
+            if leave_request.start_date <= existing_end:
+                raise HTTPException(status_code=409, detail={
+                    "error": "OVERLAPPING_LEAVE",
+                    "message": "Leave dates overlap with existing approved leave",
+                    "code": "LEAVE_409"
+                })
         
         # Check leave balance
         balance_data = db.leave.get_leave_balance(user_info['username'])
@@ -235,13 +231,20 @@ def get_leave_dashboard(user_info: dict = Depends(get_user_info)):
 # API: Get pending leaves - Returns all pending leave requests for HR/Lead approval
 # Requires HR or Lead role permissions
 @router.get("/leaves/pending")
-def get_pending_leaves(user_info: dict = Depends(require_hr)):
+def get_pending_leaves(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_hr)
+):
     logger.info(f"[ENTRY] Pending leaves API called by: {user_info['username']}")
     
     try:
         db = get_database()
-        pending_leaves_data = db.leave.get_pending_leaves()
-        pending_leaves = pending_leaves_data
+        paginate = bool(limit or cursor)
+        if paginate:
+            pending_leaves, last_key = db.leave.get_pending_leaves_page(limit or DEFAULT_PAGE_SIZE, decode_cursor(cursor, "pending-leaves"))
+        else:
+            pending_leaves = db.leave.get_pending_leaves()
         
         leaves_data = [{
             "id": leave["id"],
@@ -255,21 +258,32 @@ def get_pending_leaves(user_info: dict = Depends(require_hr)):
             "created_date": leave["created_date"] if isinstance(leave["created_date"], str) else leave["created_date"].isoformat()
         } for leave in pending_leaves]
         
+        if paginate:
+            return paginated_response(leaves_data, encode_cursor(last_key, "pending-leaves"), "Pending leaves retrieved successfully")
         return success_response(leaves_data, "Pending leaves retrieved successfully")
         
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "get pending leaves")
 
 # API: Get all leaves - Returns complete leave history across all users
 # Requires Lead or HR role for system-wide leave visibility
 @router.get("/leaves/all")
-def get_all_leaves(user_info: dict = Depends(require_leave_management)):
+def get_all_leaves(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_leave_management)
+):
     logger.info(f"[ENTRY] All leaves API called by: {user_info['username']}")
     
     try:
         db = get_database()
-        all_leaves_data = db.leave.get_all_leaves()
-        all_leaves = all_leaves_data
+        paginate = bool(limit or cursor)
+        if paginate:
+            all_leaves, last_key = db.leave.get_all_leaves_page(limit or DEFAULT_PAGE_SIZE, decode_cursor(cursor, "all-leaves"))
+        else:
+            all_leaves = db.leave.get_all_leaves()
         
         leaves_data = [{
             "id": leave["id"],
@@ -285,11 +299,52 @@ def get_all_leaves(user_info: dict = Depends(require_leave_management)):
             "created_date": leave["created_date"] if isinstance(leave["created_date"], str) else leave["created_date"].isoformat()
         } for leave in all_leaves]
         
+        if paginate:
+            return paginated_response(leaves_data, encode_cursor(last_key, "all-leaves"), "All leaves retrieved successfully")
         return success_response(leaves_data, "All leaves retrieved successfully")
         
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "get all leaves")
 
+# API: Team calendar - Who is on approved leave between two dates, with a headcount per day
+# Requires Lead or HR role, reads the per financial year leave calendar instead of all leaves
+@router.get("/leaves/calendar")
+def get_leave_calendar(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    user_info: dict = Depends(require_leave_management)
+):
+    logger.info(f"[ENTRY] Leave calendar API called by: {user_info['username']} for {from_date} to {to_date}")
+    
+    try:
+        if from_date > to_date:
+            raise HTTPException(status_code=400, detail={
+                "error": "INVALID_DATE_RANGE",
+                "message": "From date cannot be after to date",
+                "code": "LEAVE_400"
+            })
+        
+        if (to_date - from_date).days + 1 > MAX_CALENDAR_DAYS:
+            raise HTTPException(status_code=400, detail={
+                "error": "DATE_RANGE_TOO_LONG",
+                "message": f"Calendar range cannot be longer than {MAX_CALENDAR_DAYS} days",
+                "code": "LEAVE_400"
+            })
+        
+        db = get_database()
+        calendar = team_calendar(db, from_date, to_date)
+        
+        logger.info(f"[EXIT] Leave calendar API successful, {len(calendar['users'])} users on leave")
+        return success_response(calendar, "Leave calendar retrieved successfully")
+        
+    except HTTPException as e:
+        logger.error(f"[ERROR] Leave calendar API failed: {e.detail}")
+        raise
+    except Exception as e:
+        handle_error(e, "get leave calendar")
+
 # API: Approve/Reject leave - Processes pending leave requests with approval/rejection
 # Updates leave status, deducts balance if approved, requires Lead/HR role
 @router.put("/leaves/{leave_id}/approve")
@@ -328,10 +383,7 @@ def approve_reject_leave(leave_id: int, approval: LeaveApproval, user_info: dict
         logger.info(f"Updating leave {leave_id} with data: {update_data}")
         
         db.leave.update_leave(leave_id, update_data)
-
-        # Read record from DB and show the result
-        leave = db.leave.get_leave_by_id(leave_id)
-        logger.info(f"Leave after update: {leave}")
+        leave = {**leave, **update_data}
         
         # If approved, deduct from leave balance
         if approval.status == 'approved':
@@ -342,6 +394,8 @@ def approve_reject_leave(leave_id: int, approval: LeaveApproval, user_info: dict
                 new_balance = current_balance - leave['days']
                 
                 db.leave.update_leave_balance(leave['username'], {balance_field: new_balance})
+            
+            record_approved_leave(db, leave)
         
         logger.info(f"[EXIT] Approve/Reject leave API successful for leave: {leave_id}")
         return success_response({"leave_id": leave_id}, f"Leave {approval.status} successfully")
@@ -365,7 +419,7 @@ def assign_leave(assign_request: AssignLeaveRequest, user_info: dict = Depends(r
         db = get_database()
         
         # Calculate days based on leave type
-        days = calculate_leave_days(assign_request.start_date, assign_request.end_date, assign_request.leave_type)
+        days = calculate_leave_days(db, assign_request.username, assign_request.start_date, assign_request.end_date, assign_request.leave_type)
         
         # Create leave request directly as approved
         leave_data = {
@@ -382,6 +436,7 @@ def assign_leave(assign_request: AssignLeaveRequest, user_info: dict = Depends(r
         }
         
         leave_id = db.leave.create_leave(leave_data)
+        record_approved_leave(db, {**leave_data, "id": leave_id})
         
         # Deduct from leave balance
         balance_data = db.leave.get_leave_balance(assign_request.username)
@@ -0,0 +1,119 @@
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from scripts.leaves.calendar import as_date, financial_years_overlapping
+from scripts.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Longest window /leaves/calendar answers in one call
+MAX_CALENDAR_DAYS = 92
+
+# Approvals in this container invalidate their year, the TTL bounds how long other
+# containers keep showing a year without the latest approvals
+interval_index_cache = TTLCache(ttl=60)
+
+class IntervalIndex:
+    """Approved leaves of a financial year for window queries
+
+    Leaves are sorted by start date and viewed as an implicit balanced tree over that
+    order, where each node also knows the latest end date below it. A query skips
+    subtrees ending before the window and, by the ordering, everything starting after
+    it, so it visits O(log n + k) nodes for k matches.
+    """
+    def __init__(self, leaves: List[Dict[str, Any]]):
+        self.leaves = sorted(
+            ({**leave, 'start_date': as_date(leave['start_date']), 'end_date': as_date(leave['end_date'])} for leave in leaves),
+            key=lambda leave: (leave['start_date'], leave['end_date'])
+        )
+        self.starts = [leave['start_date'] for leave in self.leaves]
+        self.latest_end = [None] * len(self.leaves)
+        self._augment(0, len(self.leaves))
+
+    def _augment(self, low: int, high: int):
+        if low >= high:
+            return None
+        middle = (low + high) // 2
+        latest = self.leaves[middle]['end_date']
+        for child in (self._augment(low, middle), self._augment(middle + 1, high)):
+            if child is not None and child > latest:
+                latest = child
+        self.latest_end[middle] = latest
+        return latest
+
+    def overlapping(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Leaves sharing at least one day with [start_date, end_date], by start date"""
+        found = []
+        self._collect(0, len(self.leaves), start_date, end_date, found)
+        return found
+
+    def _collect(self, low: int, high: int, start_date: date, end_date: date, found: List[Dict[str, Any]]):
+        if low >= high:
+            return
+        middle = (low + high) // 2
+        if self.latest_end[middle] < start_date:
+            return
+        self._collect(low, middle, start_date, end_date, found)
+        if self.starts[middle] > end_date:
+            return
+        if self.leaves[middle]['end_date'] >= start_date:
+            found.append(self.leaves[middle])
+        self._collect(middle + 1, high, start_date, end_date, found)
+
+def _year_index(db, financial_year: Dict[str, Any]) -> IntervalIndex:
+    return interval_index_cache.get(int(financial_year['id']), lambda: IntervalIndex(db.leave.get_calendar_leaves(financial_year)))
+
+def record_approved_leave(db, leave: Dict[str, Any]):
+    """Add an approved leave to the calendar of every financial year it falls in"""
+    start_date, end_date = as_date(leave['start_date']), as_date(leave['end_date'])
+    financial_years = financial_years_overlapping(db, start_date, end_date)
+    if not financial_years:
+        logger.warning(f"Leave {leave['id']} from {start_date} to {end_date} is outside every financial year, not added to the calendar")
+    for financial_year in financial_years:
+        db.leave.add_to_calendar(financial_year['id'], leave)
+        interval_index_cache.invalidate(int(financial_year['id']))
+
+def team_calendar(db, start_date: date, end_date: date) -> Dict[str, Any]:
+    """Headcount on leave per day and each user's leave spans between start_date and end_date"""
+    leaves = {}
+    for financial_year in financial_years_overlapping(db, start_date, end_date):
+        for leave in _year_index(db, financial_year).overlapping(start_date, end_date):
+            # A leave crossing into the next financial year is recorded in both
+            leaves[int(leave['leave_id'])] = leave
+
+    size = (end_date - start_date).days + 1
+    # Difference array over the window, one user counts once on a day even if
+    # two of their leaves overlap
+    changes = [0] * (size + 1)
+    users = {}
+    for leave in sorted(leaves.values(), key=lambda leave: (leave['username'], leave['start_date'])):
+        users.setdefault(leave['username'], []).append(leave)
+
+    for username, spans in users.items():
+        covered_until = -1
+        for leave in spans:
+            first = max((leave['start_date'] - start_date).days, covered_until + 1)
+            last = min((leave['end_date'] - start_date).days, size - 1)
+            if first <= last:
+                changes[first] += 1
+                changes[last + 1] -= 1
+                covered_until = last
+        users[username] = [{
+            "leave_id": int(leave['leave_id']),
+            "leave_type": leave['leave_type'],
+            "start_date": leave['start_date'].isoformat(),
+            "end_date": leave['end_date'].isoformat()
+        } for leave in spans]
+
+    days = []
+    on_leave = 0
+    for offset in range(size):
+        on_leave += changes[offset]
+        days.append({"date": (start_date + timedelta(days=offset)).isoformat(), "on_leave": on_leave})
+
+    return {
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "days": days,
+        "users": users
+    }
\ No newline at end of file
@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from scripts.utils.cache import TTLCache
+
+# Holidays are edited through the API, which invalidates these, the TTL only bounds
+# how stale another container's copy can get
+financial_year_cache = TTLCache(ttl=300)
+year_calendar_cache = TTLCache(ttl=300)
+user_selection_cache = TTLCache(ttl=300)
+
+def as_date(value) -> date:
+    """A date from a date, datetime or YYYY-MM-DD string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+def count_weekdays(start_date: date, end_date: date) -> int:
+    """Monday to Friday days between start_date and end_date inclusive"""
+    if end_date < start_date:
+        return 0
+    days = (end_date - start_date).days + 1
+    weeks, rest = divmod(days, 7)
+    first = start_date.weekday()
+    return weeks * 5 + sum(1 for offset in range(rest) if (first + offset) % 7 < 5)
+
+class YearCalendar:
+    """Working days of one financial year
+
+    working_before[i] is the number of working days before start + i days, so any
+    range inside the year is counted with two lookups. Weekends and mandatory
+    holidays are never working days; optional holidays only for the users who chose them.
+    """
+    def __init__(self, financial_year: Dict[str, Any], holidays: List[Dict[str, Any]]):
+        self.financial_year_id = int(financial_year['id'])
+        self.start = as_date(financial_year['start_date'])
+        self.end = as_date(financial_year['end_date'])
+        size = (self.end - self.start).days + 1
+
+        working = bytearray(1 if (self.start + timedelta(days=offset)).weekday() < 5 else 0 for offset in range(size))
+        # Optional holidays by id, as day offsets that would otherwise be working days
+        self.optional_days: Dict[int, int] = {}
+        for holiday in holidays:
+            offset = (as_date(holiday['date']) - self.start).days
+            if not 0 <= offset < size:
+                continue
+            if holiday.get('is_mandatory', True):
+                working[offset] = 0
+            else:
+                self.optional_days[int(holiday['id'])] = offset
+        self.optional_days = {holiday_id: offset for holiday_id, offset in self.optional_days.items() if working[offset]}
+
+        self.working_before = [0] * (size + 1)
+        for offset, is_working in enumerate(working):
+            self.working_before[offset + 1] = self.working_before[offset] + is_working
+
+    def working_days(self, start_date: date, end_date: date, selected_days: Tuple[int, ...] = ()) -> int:
+        """Working days in [start_date, end_date], clipped to the year
+
+        selected_days are the sorted offsets of the user's optional holidays.
+        """
+        first = max((start_date - self.start).days, 0)
+        last = min((end_date - self.start).days, len(self.working_before) - 2)
+        if last < first:
+            return 0
+        days = self.working_before[last + 1] - self.working_before[first]
+        return days - (bisect_right(selected_days, last) - bisect_left(selected_days, first))
+
+    def selected_days(self, holiday_ids: List[int]) -> Tuple[int, ...]:
+        return tuple(sorted(self.optional_days[int(holiday_id)] for holiday_id in holiday_ids if int(holiday_id) in self.optional_days))
+
+def financial_years_overlapping(db, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """Financial years sharing at least one day with [start_date, end_date]"""
+    return [
+        financial_year for financial_year in financial_year_cache.get('all', db.financial_year.get_all_financial_years)
+        if as_date(financial_year['start_date']) <= end_date and as_date(financial_year['end_date']) >= start_date
+    ]
+
+def _year_calendar(db, financial_year: Dict[str, Any]) -> YearCalendar:
+    financial_year_id = int(financial_year['id'])
+    return year_calendar_cache.get(financial_year_id, lambda: YearCalendar(
+        financial_year, db.holiday.get_holidays_by_year(financial_year_id)
+    ))
+
+def _user_selection(db, username: str, financial_year_id: int) -> List[int]:
+    return user_selection_cache.get((financial_year_id, username), lambda: [
+        int(holiday['id']) for holiday in db.holiday.get_user_selected_holidays(username, financial_year_id)
+    ])
+
+def working_days(db, start_date: date, end_date: date, username: Optional[str] = None) -> int:
+    """Working days between start_date and end_date inclusive
+
+    Days inside a financial year come from its cached YearCalendar, less username's
+    optional holidays. Days outside every financial year only exclude weekends.
+    """
+    if end_date < start_date:
+        return 0
+
+    days = 0
+    covered = 0
+    for financial_year in financial_years_overlapping(db, start_date, end_date):
+        first = max(start_date, as_date(financial_year['start_date']))
+        last = min(end_date, as_date(financial_year['end_date']))
+        calendar = _year_calendar(db, financial_year)
+        selected = calendar.selected_days(_user_selection(db, username, calendar.financial_year_id)) if username and calendar.optional_days else ()
+        days += calendar.working_days(first, last, selected)
+        covered += count_weekdays(first, last)
+
+    return days + count_weekdays(start_date, end_date) - covered
+
+def invalidate_year(financial_year_id: Optional[int] = None):
+    """Drop a year's calendar after its holidays change, or every year's when no id is given"""
+    year_calendar_cache.invalidate(int(financial_year_id) if financial_year_id is not None else None)
+
+def invalidate_financial_years():
+    """Drop the cached financial years and calendars after a year is added or its dates change"""
+    financial_year_cache.invalidate()
+    year_calendar_cache.invalidate()
+
+def invalidate_user_selection(username: str, financial_year_id: int):
+    user_selection_cache.invalidate((int(financial_year_id), username))
\ No newline at end of file
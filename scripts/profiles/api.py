@@ -1,11 +1,25 @@
+import asyncio
 import logging
+import time
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from pydantic import BaseModel, ValidationError
 from scripts.db.database_factory import get_database
 from auth import require_recruiter, get_user_info
-from scripts.utils.response import success_response, handle_error
-from scripts.utils.remarks import append_remarks
+from scripts.utils.response import success_response, paginated_response, conditional_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from scripts.utils.remarks import render_remarks, render_list_remarks
+from scripts.utils.cache import TTLCache
+from scripts.utils.fields import parse_fields
+from scripts.utils.contacts import ContactTaken, contact_keys
+from scripts.utils.signing import sign_token, verify_token
+from .search import SEARCH_FIELDS, tokenize
+from .importer import iter_import_rows, chunked, IMPORT_EXTENSIONS, MAX_IMPORT_ROWS
+from .documents import stage_document, discard_staged_document, enqueue_document, enqueue_stored_document, document_uploads_available, DOCUMENT_PENDING
+from .storage import (
+    get_document_storage, LocalDocumentStorage, document_extension, matches_magic_bytes,
+    DOCUMENT_EXTENSIONS, MAX_DOCUMENT_SIZE, MAGIC_BYTES_LENGTH
+)
 from typing import Optional, Dict, Any
 from datetime import date
 
@@ -22,6 +36,24 @@ class RemarksUpdate(BaseModel):
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+# Profile statuses are seeded reference data, cache them per container
+profile_status_cache = TTLCache(ttl=300)
+
+def get_profile_status_ids(db) -> set:
+    # A failed scan comes back empty, caching it would reject every status for the TTL
+    return profile_status_cache.get('ids', lambda: {int(status['id']) for status in db.profile.list_profile_statuses()}, cache_empty=False)
+
+# Longest /by-date-range window, each day is one index query
+MAX_DATE_RANGE_DAYS = 92
+
+# Attributes clients may select with ?fields=
+PROFILE_FIELDS = {
+    'id', 'name', 'email', 'phone', 'skills', 'experience_years', 'current_location',
+    'preferred_location', 'current_ctc', 'expected_ctc', 'notice_period', 'status', 'remarks',
+    'accepted_offer', 'joining_date', 'current_employer', 'highest_education', 'offer_in_hand',
+    'variable_pay', 'document_url', 'document_status', 'document_sha256', 'created_date', 'updated_date'
+}
+
 class ProfileCreate(BaseModel):
     name: str
     email: str
@@ -70,6 +102,16 @@ class DateRangeRequest(BaseModel):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
 
+class DocumentUploadRequest(BaseModel):
+    filename: str
+    size: int
+
+class DocumentConfirm(BaseModel):
+    upload_token: str
+
+# How long an issued upload URL can be used and confirmed
+DOCUMENT_UPLOAD_TTL = 3600
+
 async def validate_document(file: UploadFile):
     """Validate document size and type"""
     import os
@@ -80,58 +122,53 @@ async def validate_document(file: UploadFile):
         raise HTTPException(status_code=400, detail=f"Profile document size must be less than {size_limit}")
     
     # Check file extension
-    allowed_extensions = ['.pdf', '.doc', '.docx']
-    file_extension = file.filename.lower().split('.')[-1] if '.' in file.filename else ''
-    if f'.{file_extension}' not in allowed_extensions:
+    file_extension = document_extension(file.filename)
+    if file_extension not in DOCUMENT_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Only PDF, DOC, and DOCX profile formats are allowed")
 
     # Verify actual file content via magic bytes — extension alone can be spoofed
-    header = await file.read(8)
+    header = await file.read(MAGIC_BYTES_LENGTH)
     await file.seek(0)
-    magic_map = {
-        b'%PDF':         ['.pdf'],
-        b'\xd0\xcf\x11\xe0': ['.doc'],
-        b'PK\x03\x04':  ['.docx'],
-    }
-    matched = any(
-        header.startswith(sig) and f'.{file_extension}' in exts
-        for sig, exts in magic_map.items()
-    )
-    if not matched:
+    if not matches_magic_bytes(header, file_extension):
         raise HTTPException(status_code=400, detail="File content does not match the declared file type")
 
-async def upload_document_to_onedrive(file: UploadFile) -> str:
-    """Upload document to OneDrive and return URL"""
-    import os
-    import shutil
-    from onedrive_config import onedrive_client
-    
-    # Validate file first
-    await validate_document(file)
-    
-    # Use /tmp for Lambda compatibility
-    upload_dir = "/tmp/documents" if os.getenv('AWS_LAMBDA_FUNCTION_NAME') else "uploads/documents"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Save file locally first
-    safe_ext = os.path.splitext(os.path.basename(file.filename))[-1]
-    safe_filename = f"{uuid.uuid4()}{safe_ext}"
-    file_path = os.path.join(upload_dir, safe_filename)
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Upload to OneDrive
-        onedrive_url = await onedrive_client.upload_file(file_path, file.filename)
-        logger.info(f"File uploaded to OneDrive: {onedrive_url}")
-        return onedrive_url
-    except Exception as e:
-        logger.error(f"OneDrive upload failed: {e}")
-        raise HTTPException(status_code=500, detail="File upload failed")
-    finally:
-        # Always clean up local file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+def verify_upload_token(upload_token: str) -> Dict[str, Any]:
+    payload = verify_token(upload_token)
+    if not payload or payload.get('purpose') != 'document_upload' or payload.get('exp', 0) < time.time():
+        raise HTTPException(status_code=400, detail={
+            "error": "INVALID_UPLOAD_TOKEN",
+            "message": "Upload token is invalid or has expired",
+            "code": "PROFILE_400"
+        })
+    return payload
+
+def require_document_uploads():
+    if not document_uploads_available():
+        raise HTTPException(status_code=503, detail={
+            "error": "DOCUMENT_UPLOADS_UNAVAILABLE",
+            "message": "Document uploads are not configured on this deployment",
+            "code": "PROFILE_503"
+        })
+
+def duplicate_profile_error(profile_id: int) -> HTTPException:
+    return HTTPException(status_code=409, detail={
+        "error": "PROFILE_EXISTS",
+        "message": "A profile with this email or phone already exists",
+        "code": "PROFILE_409",
+        "profile_id": profile_id
+    })
+
+def process_profile_record(profile_id: int, requirement_id: int, user_info: dict) -> Dict[str, Any]:
+    return {
+        "requirement_id": requirement_id,
+        "recruiter_name": user_info.get('username', 'unknown'),
+        "profile_id": profile_id,
+        "remarks": "",
+        "actively_working": "Yes"
+    }
+
+def link_profile_to_requirement(db, profile_id: int, requirement_id: int, user_info: dict):
+    db.process_profile.upsert_process_profile(process_profile_record(profile_id, requirement_id, user_info))
 
 @router.post("/add")
 async def add_profile(
@@ -177,30 +214,136 @@ async def add_profile(
     try:
         db = get_database()
 
-        # Only upload document if one is provided
+        # Same candidate submitted again: reuse the existing profile instead of
+        # writing a duplicate and uploading the document a second time
+        existing_id = db.profile.find_duplicate_profile(email, phone)
+        if existing_id:
+            if not requirement_id:
+                raise duplicate_profile_error(existing_id)
+            link_profile_to_requirement(db, existing_id, requirement_id, user_info)
+            return success_response(db.profile.get_profile(existing_id), "Existing profile linked to requirement")
+
+        # Stage the document and upload it in the background, the profile is written right away
+        staged_key = None
         if document:
-            document_url = await upload_document_to_onedrive(document)
-            profile_data["document_url"] = document_url
+            require_document_uploads()
+            await validate_document(document)
+            staged_key, sha256 = await asyncio.to_thread(stage_document, document.file, document.filename)
+            profile_data["document_status"] = DOCUMENT_PENDING
+            profile_data["document_sha256"] = sha256
         
         # Remove requirement_id from profile data for database insertion
         profile_dict = {k: v for k, v in profile_data.items() if v is not None}
         
-        created_profile = db.profile.create_profile(profile_dict)
+        try:
+            created_profile = db.profile.create_profile(profile_dict)
+        except Exception:
+            if staged_key:
+                discard_staged_document(staged_key)
+            raise
+        if staged_key:
+            await enqueue_document(created_profile['id'], staged_key, document.filename, sha256)
 
         # If requirement_id is passed, then update process_profile record with profile_id details
         if requirement_id:
-            process_profile_data = {
-                "requirement_id": requirement_id,
-                "recruiter_name": user_info.get('username', 'unknown'),
-                "profile_id": created_profile['id'],
-                "remarks": "",
-                "actively_working": "Yes"
-            }
-            db.process_profile.upsert_process_profile(process_profile_data)
+            link_profile_to_requirement(db, created_profile['id'], requirement_id, user_info)
         return success_response(created_profile, "Profile added successfully")
+    except HTTPException:
+        raise
+    except ContactTaken as e:
+        # Registered by a concurrent request after the duplicate check above
+        raise duplicate_profile_error(e.profile_id)
     except Exception as e:
         handle_error(e, "add profile")
 
+IMPORT_CHUNK_SIZE = 100
+
+@router.post("/import")
+def import_profiles(
+    file: UploadFile = File(...),
+    requirement_id: Optional[int] = Form(None),
+    user_info: dict = Depends(require_recruiter)
+):
+    """Bulk create profiles from a CSV or XLSX file whose columns are the ProfileCreate fields"""
+    try:
+        if not (file.filename or '').lower().endswith(IMPORT_EXTENSIONS):
+            raise HTTPException(status_code=400, detail={
+                "error": "INVALID_FILE_TYPE",
+                "message": "Only CSV and XLSX files can be imported",
+                "code": "PROFILE_400"
+            })
+        
+        db = get_database()
+        if requirement_id and not db.requirement.get_requirement(requirement_id, fields=['requirement_id']):
+            raise HTTPException(status_code=404, detail={"error": "REQUIREMENT_NOT_FOUND", "message": "Requirement not found", "code": "REQ_404"})
+        
+        results = []
+        seen_keys: Dict[str, int] = {}
+        truncated = False
+        rows = iter_import_rows(file.file, file.filename)
+        
+        # Rows are validated, checked for duplicates and written one chunk at a time
+        for chunk in chunked(rows, IMPORT_CHUNK_SIZE):
+            if len(results) + len(chunk) > MAX_IMPORT_ROWS:
+                chunk = chunk[:MAX_IMPORT_ROWS - len(results)]
+                truncated = True
+            
+            valid = []
+            for row_number, row in chunk:
+                try:
+                    profile = ProfileCreate(**row)
+                except ValidationError as e:
+                    errors = [f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()]
+                    results.append({"row": row_number, "status": "invalid", "errors": errors})
+                    continue
+                valid.append((row_number, profile.model_dump(exclude={'requirement_id'}, exclude_none=True), contact_keys(profile.email, profile.phone)))
+            
+            existing = db.profile.find_existing_contacts([key for _, _, keys in valid for key in keys]) if valid else {}
+            to_create = []
+            for row_number, profile_data, keys in valid:
+                existing_id = next((existing[key] for key in keys if key in existing), None)
+                duplicate_row = next((seen_keys[key] for key in keys if key in seen_keys), None)
+                if existing_id and requirement_id:
+                    link_profile_to_requirement(db, existing_id, requirement_id, user_info)
+                    results.append({"row": row_number, "status": "linked", "profile_id": existing_id})
+                elif existing_id:
+                    results.append({"row": row_number, "status": "duplicate", "profile_id": existing_id, "errors": ["Profile already exists"]})
+                elif duplicate_row:
+                    results.append({"row": row_number, "status": "duplicate", "errors": [f"Same candidate as row {duplicate_row}"]})
+                else:
+                    seen_keys.update({key: row_number for key in keys})
+                    to_create.append((row_number, profile_data))
+            
+            created = db.profile.create_profiles_bulk([profile_data for _, profile_data in to_create])
+            for (row_number, _), profile in zip(to_create, created):
+                results.append({"row": row_number, "status": "created", "profile_id": int(profile['id'])})
+            if requirement_id and created:
+                db.process_profile.create_process_profiles_bulk([
+                    process_profile_record(int(profile['id']), requirement_id, user_info) for profile in created
+                ])
+            
+            if truncated:
+                break
+        
+        results.sort(key=lambda result: result["row"])
+        summary = {status: sum(1 for result in results if result["status"] == status) for status in ("created", "linked", "duplicate", "invalid")}
+        summary["total"] = len(results)
+        summary["truncated"] = truncated
+        logger.info(f"Profile import by {user_info.get('username', 'unknown')}: {summary}")
+        return success_response({"summary": summary, "rows": results}, "Profiles imported")
+    except HTTPException:
+        raise
+    except UnicodeDecodeError:
+        # Rows are read lazily, chunks before the undecodable line are already stored
+        created = sum(1 for result in results if result["status"] in ("created", "linked"))
+        raise HTTPException(status_code=400, detail={
+            "error": "INVALID_FILE",
+            "message": f"CSV file must be UTF-8 encoded, {created} rows before the invalid text were imported",
+            "code": "PROFILE_400"
+        })
+    except Exception as e:
+        handle_error(e, "import profiles")
+
 @router.post("/by-date-range")
 def get_profiles_by_date_range(date_range: DateRangeRequest, user_info: dict = Depends(get_user_info)):
     # Use provided dates or default to current date
@@ -216,6 +359,20 @@ def get_profiles_by_date_range(date_range: DateRangeRequest, user_info: dict = D
         start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
         end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
         
+        if start_date_obj > end_date_obj:
+            raise HTTPException(status_code=400, detail={
+                "error": "INVALID_DATE_RANGE",
+                "message": "Start date cannot be after end date",
+                "code": "PROFILE_400"
+            })
+        
+        if (end_date_obj - start_date_obj).days + 1 > MAX_DATE_RANGE_DAYS:
+            raise HTTPException(status_code=400, detail={
+                "error": "DATE_RANGE_TOO_LONG",
+                "message": f"Date range cannot be longer than {MAX_DATE_RANGE_DAYS} days",
+                "code": "PROFILE_400"
+            })
+        
         db = get_database()
         user_role = user_info.get('role')
         
@@ -234,11 +391,24 @@ def get_profiles_by_date_range(date_range: DateRangeRequest, user_info: dict = D
         handle_error(e, "get profiles by date range")
 
 @router.get("/list")
-def list_profiles(user_info: dict = Depends(require_recruiter)):
+def list_profiles(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    user_info: dict = Depends(require_recruiter)
+):
     try:
+        selected = parse_fields(fields, PROFILE_FIELDS, required=['id'])
         db = get_database()
-        profiles_data = db.profile.list_profiles()
+        if limit or cursor:
+            start_key = decode_cursor(cursor, "profiles")
+            profiles_data, last_key = db.profile.list_profiles_page(limit or DEFAULT_PAGE_SIZE, start_key, fields=selected)
+            profiles_data = render_list_remarks(db, profiles_data, 'profile', 'id', selected)
+            return paginated_response(profiles_data, encode_cursor(last_key, "profiles"), "Profiles retrieved successfully")
+        profiles_data = render_list_remarks(db, db.profile.list_profiles(fields=selected), 'profile', 'id', selected)
         return success_response(profiles_data, "Profiles retrieved successfully")
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "list profiles")
 
@@ -251,14 +421,57 @@ def get_profile_statuses(user_info: dict = Depends(require_recruiter)):
     except Exception as e:
         handle_error(e, "get profile statuses")
 
+@router.get("/search")
+def search_profiles(
+    q: str = Query(..., min_length=1),
+    field: Optional[str] = None,
+    min_experience: Optional[int] = Query(None, ge=0),
+    max_experience: Optional[int] = Query(None, ge=0),
+    min_expected_ctc: Optional[float] = Query(None, ge=0),
+    max_expected_ctc: Optional[float] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = None,
+    user_info: dict = Depends(require_recruiter)
+):
+    try:
+        if field and field not in SEARCH_FIELDS:
+            raise HTTPException(status_code=400, detail={
+                "error": "INVALID_SEARCH_FIELD",
+                "message": f"field must be one of: {', '.join(SEARCH_FIELDS)}",
+                "code": "PROFILE_400"
+            })
+        query_tokens = tokenize(q)
+        if not query_tokens:
+            return success_response([], "Profiles retrieved successfully")
+        
+        selected = parse_fields(fields, PROFILE_FIELDS, required=['id'])
+        ranges = {
+            'experience_years': (min_experience, max_experience),
+            'expected_ctc': (min_expected_ctc, max_expected_ctc)
+        }
+        ranges = {attr: bounds for attr, bounds in ranges.items() if bounds != (None, None)}
+        
+        db = get_database()
+        profiles_data = db.profile.search_profiles(query_tokens, [field] if field else list(SEARCH_FIELDS), ranges, limit, selected)
+        profiles_data = render_list_remarks(db, profiles_data, 'profile', 'id', selected)
+        return success_response(profiles_data, "Profiles retrieved successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        handle_error(e, "search profiles")
+
 @router.get("/{profile_id}")
-def get_profile(profile_id: int, user_info: dict = Depends(require_recruiter)):
+def get_profile(profile_id: int, request: Request, fields: Optional[str] = None, user_info: dict = Depends(require_recruiter)):
     try:
+        selected = parse_fields(fields, PROFILE_FIELDS, required=['id'])
         db = get_database()
-        profile_data = db.profile.get_profile(profile_id)
+        profile_data = db.profile.get_profile(profile_id, fields=selected)
         if not profile_data:
             raise HTTPException(status_code=404, detail="Profile not found")
-        return success_response(profile_data, "Profile retrieved successfully")
+        if not selected or 'remarks' in selected:
+            remarks, _ = db.remark.list_remarks('profile', profile_id)
+            profile_data['remarks'] = render_remarks(profile_data.get('remarks'), remarks, 'profile')
+        return conditional_response(request, profile_data, "Profile retrieved successfully")
     except HTTPException:
         logger.error("HTTPException in get profile")
         raise
@@ -277,23 +490,26 @@ def update_profile(profile_id: int, profile_update: ProfileUpdate, user_info: di
         
         db = get_database()
         
-        # Handle remarks appending if provided
-        if 'remarks' in update_data:
-            profile_data = db.profile.get_profile(profile_id)
-            if not profile_data:
-                raise HTTPException(status_code=404, detail="Profile not found")
-            
-            existing_remarks = profile_data.get('remarks', '') or ''
-            update_data['remarks'] = append_remarks(existing_remarks, update_data['remarks'], user_info.get('username', 'unknown'))
+        if 'email' in update_data or 'phone' in update_data:
+            existing_id = db.profile.find_duplicate_profile(update_data.get('email'), update_data.get('phone'), exclude_id=profile_id)
+            if existing_id:
+                raise duplicate_profile_error(existing_id)
         
-        success = db.profile.update_profile(profile_id, update_data)
-        if not success:
+        # Remarks are appended as their own item rather than rewritten on the profile
+        remark = update_data.pop('remarks', None)
+        if update_data:
+            success = db.profile.update_profile(profile_id, update_data)
+            if not success:
+                raise HTTPException(status_code=404, detail="Profile not found")
+        if remark and not db.remark.add_remark('profile', profile_id, remark, user_info.get('username', 'unknown')):
             raise HTTPException(status_code=404, detail="Profile not found")
         
         return success_response(message="Profile updated successfully")
     except HTTPException:
         logger.error("HTTPException in update profile")
         raise
+    except ContactTaken as e:
+        raise duplicate_profile_error(e.profile_id)
     except Exception as e:
         handle_error(e, "update profile")
 
@@ -302,15 +518,8 @@ def update_status(profile_id: int, status_update: StatusUpdate, user_info: dict
     try:
         db = get_database()
         
-        # Check if profile exists first
-        profile_data = db.profile.get_profile(profile_id)
-        if not profile_data:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        # Validate status value
-        profile_statuses = db.profile.list_profile_statuses()
-        valid_statuses = [status['id'] for status in profile_statuses]
-        if status_update.status not in valid_statuses:
+        # Validate status value against the cached status map
+        if status_update.status not in get_profile_status_ids(db):
             raise HTTPException(status_code=400, detail=f"Invalid status passed.")
         
         # Check if any optional fields are provided
@@ -323,26 +532,20 @@ def update_status(profile_id: int, status_update: StatusUpdate, user_info: dict
         if not has_optional_fields:
             raise HTTPException(status_code=400, detail="No valid fields to update")
         
-        update_data: Dict[str, Any] = {"status": status_update.status}
-        
-        # Handle accepted_offer if provided
-        if status_update.accepted_offer is not None:
-            update_data['accepted_offer'] = status_update.accepted_offer
-        
-        # Handle joining_date if provided
-        if status_update.joining_date is not None:
-            update_data['joining_date'] = status_update.joining_date
+        # The existence check and the update are a single conditional write
+        profile_data = db.profile.transition_status(
+            profile_id,
+            status_update.status,
+            accepted_offer=status_update.accepted_offer,
+            joining_date=status_update.joining_date
+        )
+        if not profile_data:
+            raise HTTPException(status_code=404, detail="Profile not found")
         
-        # Handle remarks if provided
         if status_update.remarks:
-            existing_remarks = profile_data.get('remarks', '') or ''
-            update_data['remarks'] = append_remarks(existing_remarks, status_update.remarks, user_info.get('username', 'unknown'))
+            db.remark.put_remark('profile', profile_id, status_update.remarks, user_info.get('username', 'unknown'))
         
-        success = db.profile.update_profile(profile_id, update_data)
-        if not success:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        return success_response(message="Status updated successfully")
+        return success_response(profile_data, "Status updated successfully")
     except HTTPException:
         logger.error("HTTPException in profile update status")
         raise
@@ -350,19 +553,28 @@ def update_status(profile_id: int, status_update: StatusUpdate, user_info: dict
         logger.error(f"Error in update status: {str(e)}")
         handle_error(e, "update status")
 
+@router.get("/{profile_id}/remarks")
+def list_remarks(
+    profile_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_recruiter)
+):
+    try:
+        scope = f"profile-remarks:{profile_id}"
+        db = get_database()
+        remarks, last_key = db.remark.list_remarks('profile', profile_id, limit, decode_cursor(cursor, scope))
+        return paginated_response(remarks, encode_cursor(last_key, scope), "Remarks retrieved successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        handle_error(e, "list remarks")
+
 @router.put("/{profile_id}/remarks")
 def update_remarks(profile_id: int, remarks_update: RemarksUpdate, user_info: dict = Depends(require_recruiter)):
     try:
         db = get_database()
-        profile_data = db.profile.get_profile(profile_id)
-        if not profile_data:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        existing_remarks = profile_data.get('remarks', '') or ''
-        updated_remarks = append_remarks(existing_remarks, remarks_update.remarks, user_info.get('username', 'unknown'))
-        
-        success = db.profile.update_profile(profile_id, {"remarks": updated_remarks})
-        if not success:
+        if not db.remark.add_remark('profile', profile_id, remarks_update.remarks, user_info.get('username', 'unknown')):
             raise HTTPException(status_code=404, detail="Profile not found")
         
         return success_response(message="Remarks updated successfully")
@@ -372,6 +584,92 @@ def update_remarks(profile_id: int, remarks_update: RemarksUpdate, user_info: di
     except Exception as e:
         handle_error(e, "update remarks")
 
+@router.post("/{profile_id}/document/upload-url")
+async def create_document_upload(profile_id: int, upload: DocumentUploadRequest, request: Request, user_info: dict = Depends(require_recruiter)):
+    """Issue a target the browser uploads the document to directly, confirm it afterwards"""
+    try:
+        extension = document_extension(upload.filename)
+        if extension not in DOCUMENT_EXTENSIONS:
+            raise HTTPException(status_code=400, detail="Only PDF, DOC, and DOCX profile formats are allowed")
+        if not 0 < upload.size <= MAX_DOCUMENT_SIZE:
+            raise HTTPException(status_code=400, detail=f"Profile document size must be less than {MAX_DOCUMENT_SIZE // (1024 * 1024)}MB")
+        require_document_uploads()
+
+        db = get_database()
+        if not db.profile.get_profile(profile_id, fields=['id']):
+            raise HTTPException(status_code=404, detail="Profile not found")
+
+        # Server chosen name so the confirmed item is the one issued here
+        name = f"{profile_id}-{uuid.uuid4()}{extension}"
+        upload_token = sign_token({
+            "purpose": "document_upload",
+            "profile_id": profile_id,
+            "name": name,
+            "size": upload.size,
+            "exp": int(time.time()) + DOCUMENT_UPLOAD_TTL
+        })
+        target = await get_document_storage().create_upload(name, upload.size)
+        if not target["upload_url"]:
+            target["upload_url"] = str(request.url_for("upload_local_document", upload_token=upload_token))
+        return success_response({**target, "upload_token": upload_token}, "Upload URL created successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        handle_error(e, "create document upload")
+
+@router.put("/documents/local/{upload_token}")
+async def upload_local_document(upload_token: str, request: Request):
+    """Local development stand-in for the storage upload URL, the signed token authorizes it"""
+    storage = get_document_storage()
+    if not isinstance(storage, LocalDocumentStorage):
+        raise HTTPException(status_code=404, detail="Not Found")
+    payload = verify_upload_token(upload_token)
+
+    if not await storage.save_stream(payload['name'], request.stream(), payload['size']):
+        raise HTTPException(status_code=400, detail="Uploaded document is larger than declared")
+    return success_response(message="Document uploaded successfully")
+
+@router.post("/{profile_id}/document/confirm")
+async def confirm_document_upload(profile_id: int, confirm: DocumentConfirm, user_info: dict = Depends(require_recruiter)):
+    """Check the uploaded document from a ranged read and attach it to the profile
+
+    Hashing for deduplication and text extraction for search run in the background,
+    document_status stays pending until they finish.
+    """
+    try:
+        payload = verify_upload_token(confirm.upload_token)
+        if payload['profile_id'] != profile_id:
+            raise HTTPException(status_code=400, detail="Upload token was issued for another profile")
+
+        storage = get_document_storage()
+        name = payload['name']
+        head = await storage.read_head(name, MAGIC_BYTES_LENGTH)
+        if not head:
+            raise HTTPException(status_code=400, detail={
+                "error": "DOCUMENT_NOT_UPLOADED",
+                "message": "Document has not been uploaded yet",
+                "code": "PROFILE_400"
+            })
+
+        size, header, document_url = head
+        if size != payload['size'] or size > MAX_DOCUMENT_SIZE:
+            await storage.delete(name)
+            raise HTTPException(status_code=400, detail="Uploaded document size does not match the declared size")
+        if not matches_magic_bytes(header, document_extension(name)):
+            await storage.delete(name)
+            raise HTTPException(status_code=400, detail="File content does not match the declared file type")
+
+        require_document_uploads()
+        db = get_database()
+        if not db.profile.update_profile(profile_id, {"document_url": document_url, "document_status": DOCUMENT_PENDING}):
+            raise HTTPException(status_code=404, detail="Profile not found")
+        await enqueue_stored_document(profile_id, name, document_url)
+        return success_response({"profile_id": profile_id, "document_url": document_url, "document_status": DOCUMENT_PENDING}, "Document attached successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        handle_error(e, "confirm document upload")
+
 @router.post("/add-to-requirement")
 def add_profile_to_requirement(process_profile: ProcessProfileCreate, user_info: dict = Depends(require_recruiter)):
     try:
@@ -0,0 +1,324 @@
+"""Background pipeline that uploads staged profile documents to OneDrive
+
+add_profile stages the file and queues a job, a worker uploads it, sets
+document_url and indexes the document's text for search. Locally the worker
+is an asyncio task on the app's event loop, on Lambda jobs go through SQS
+(DOCUMENT_QUEUE_URL) with files staged in S3 (DOCUMENT_STAGING_BUCKET) since
+/tmp is not shared between invocations.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_QUEUE_URL = os.getenv('DOCUMENT_QUEUE_URL')
+DOCUMENT_STAGING_BUCKET = os.getenv('DOCUMENT_STAGING_BUCKET')
+MAX_DOCUMENT_ATTEMPTS = 3
+
+def document_uploads_available() -> bool:
+    """Whether uploaded documents can be processed in the background here
+
+    A Lambda invocation ends with its response, taking an asyncio worker and its
+    /tmp staging with it, so there jobs need both SQS and S3 staging.
+    """
+    return not os.getenv('AWS_LAMBDA_FUNCTION_NAME') or bool(DOCUMENT_QUEUE_URL and DOCUMENT_STAGING_BUCKET)
+
+if not document_uploads_available():
+    logger.error("DOCUMENT_QUEUE_URL and DOCUMENT_STAGING_BUCKET must both be set on Lambda, document uploads are rejected")
+
+# document_status values
+DOCUMENT_PENDING = 'pending'
+DOCUMENT_DONE = 'done'
+DOCUMENT_FAILED = 'failed'
+
+# Read size when hashing and copying an upload into staging
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class HashingReader:
+    """File wrapper computing the SHA-256 of everything read through it"""
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        return data
+
+class LocalStaging:
+    def __init__(self):
+        self.staging_dir = "uploads/staging"
+
+    def save(self, fileobj: BinaryIO, key: str):
+        os.makedirs(self.staging_dir, exist_ok=True)
+        with open(os.path.join(self.staging_dir, key), "wb") as f:
+            shutil.copyfileobj(fileobj, f, HASH_CHUNK_SIZE)
+
+    def open(self, key: str) -> Tuple[BinaryIO, int]:
+        path = os.path.join(self.staging_dir, key)
+        return open(path, "rb"), os.path.getsize(path)
+
+    def delete(self, key: str):
+        path = os.path.join(self.staging_dir, key)
+        if os.path.exists(path):
+            os.remove(path)
+
+class S3Staging:
+    def __init__(self, bucket: str):
+        import boto3
+        from scripts.db.config import AWS_REGION
+        self.bucket = bucket
+        self.s3 = boto3.client('s3', region_name=AWS_REGION)
+
+    def save(self, fileobj: BinaryIO, key: str):
+        self.s3.upload_fileobj(fileobj, self.bucket, f"staging/{key}")
+
+    def open(self, key: str) -> Tuple[BinaryIO, int]:
+        # Spool to /tmp so the upload streams chunks rather than holding the file in memory,
+        # named so text extraction can open it by path
+        fileobj = tempfile.NamedTemporaryFile()
+        self.s3.download_fileobj(self.bucket, f"staging/{key}", fileobj)
+        size = fileobj.tell()
+        fileobj.seek(0)
+        return fileobj, size
+
+    def delete(self, key: str):
+        self.s3.delete_object(Bucket=self.bucket, Key=f"staging/{key}")
+
+def get_staging():
+    if not document_uploads_available():
+        raise RuntimeError("DOCUMENT_STAGING_BUCKET is not set")
+    return S3Staging(DOCUMENT_STAGING_BUCKET) if DOCUMENT_STAGING_BUCKET else LocalStaging()
+
+class LocalDocumentQueue:
+    """In-process queue drained by one asyncio worker on the running loop"""
+    def __init__(self):
+        self._queue = None
+        self._loop = None
+        self._worker = None
+
+    def _get_queue(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            # The worker outlives the request that starts it, so it must not inherit
+            # that request's deadline or memoized reads
+            self._worker = loop.create_task(self._work(), context=contextvars.Context())
+        return self._queue
+
+    async def send(self, job: Dict[str, Any], delay: int = 0):
+        queue = self._get_queue()
+        if delay:
+            self._loop.call_later(delay, queue.put_nowait, job)
+        else:
+            queue.put_nowait(job)
+
+    async def _work(self):
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await process_document_job(job)
+            except Exception as e:
+                logger.error(f"Document upload for profile {job['profile_id']} failed (attempt {job['attempt']}): {e}")
+                if job['attempt'] < MAX_DOCUMENT_ATTEMPTS:
+                    await self.send({**job, 'attempt': job['attempt'] + 1}, delay=2 ** job['attempt'])
+                else:
+                    mark_document_failed(job)
+            finally:
+                queue.task_done()
+
+class SQSDocumentQueue:
+    """Jobs are SQS messages, retries come from SQS redelivery (see handle_sqs_records)"""
+    def __init__(self, queue_url: str):
+        import boto3
+        from scripts.db.config import AWS_REGION
+        self.queue_url = queue_url
+        self.sqs = boto3.client('sqs', region_name=AWS_REGION)
+
+    async def send(self, job: Dict[str, Any], delay: int = 0):
+        await asyncio.to_thread(self.sqs.send_message, QueueUrl=self.queue_url, MessageBody=json.dumps(job), DelaySeconds=delay)
+
+_document_queue = None
+
+def get_document_queue():
+    global _document_queue
+    if _document_queue is None:
+        if not document_uploads_available():
+            raise RuntimeError("DOCUMENT_QUEUE_URL is not set")
+        _document_queue = SQSDocumentQueue(DOCUMENT_QUEUE_URL) if DOCUMENT_QUEUE_URL else LocalDocumentQueue()
+    return _document_queue
+
+def stage_document(fileobj: BinaryIO, filename: str) -> Tuple[str, str]:
+    """Copy an uploaded document to staging, returns its staging key and content SHA-256
+
+    The hash is computed on the same pass that copies the file.
+    """
+    key = f"{uuid.uuid4()}{os.path.splitext(os.path.basename(filename))[-1]}"
+    reader = HashingReader(fileobj)
+    get_staging().save(reader, key)
+    return key, reader.sha256.hexdigest()
+
+def discard_staged_document(key: str):
+    get_staging().delete(key)
+
+async def enqueue_document(profile_id: int, staged_key: str, filename: str, sha256: str):
+    await get_document_queue().send({
+        'profile_id': profile_id,
+        'staged_key': staged_key,
+        'filename': filename,
+        'sha256': sha256,
+        'attempt': 1
+    })
+
+async def enqueue_stored_document(profile_id: int, stored_name: str, document_url: str):
+    """Queue a document the browser uploaded straight to storage for hashing and indexing"""
+    await get_document_queue().send({
+        'profile_id': profile_id,
+        'stored_name': stored_name,
+        'document_url': document_url,
+        'filename': stored_name,
+        'attempt': 1
+    })
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+async def process_document_job(job: Dict[str, Any]):
+    """Upload a staged document and attach it to its profile, raises so the queue can retry"""
+    from onedrive_config import onedrive_client
+    from scripts.db.database_factory import get_database
+
+    if 'stored_name' in job:
+        await process_stored_document(job)
+        return
+
+    db = get_database()
+    staging = get_staging()
+    sha256 = job.get('sha256')
+    # Content uploaded before is linked instead of uploaded again
+    existing = db.document_hash.get_document(sha256) if sha256 else None
+    fileobj, size = await asyncio.to_thread(staging.open, job['staged_key'])
+    with fileobj:
+        if existing:
+            document_url = existing['document_url']
+            logger.info(f"Document for profile {job['profile_id']} matches an earlier upload, skipping OneDrive")
+        elif sha256:
+            # Named by content so a different file with the same name never replaces it
+            name = f"{sha256[:16]}-{os.path.basename(job['filename'])}"
+            document_url = await onedrive_client.upload_file(fileobj, name, size)
+            if not db.document_hash.record_document(sha256, document_url, job['profile_id']):
+                # A concurrent job uploaded the same content first, link its copy and drop
+                # ours unless both went to the same item
+                recorded_url = db.document_hash.get_document(sha256)['document_url']
+                if recorded_url != document_url:
+                    await onedrive_client.delete_item(name)
+                    logger.info(f"Document for profile {job['profile_id']} was uploaded concurrently, removed duplicate {name}")
+                    document_url = recorded_url
+        else:
+            document_url = await onedrive_client.upload_file(fileobj, job['filename'], size)
+
+        linked = db.profile.update_profile(job['profile_id'], {'document_url': document_url, 'document_status': DOCUMENT_DONE})
+        if linked:
+            logger.info(f"Document for profile {job['profile_id']} uploaded to OneDrive: {document_url}")
+            # The upload already succeeded, an unreadable document must not send the job back for a retry
+            try:
+                await index_document_text(db, job['profile_id'], fileobj.name, job['filename'])
+            except Exception as e:
+                logger.error(f"Text extraction failed for profile {job['profile_id']}: {e}")
+
+    staging.delete(job['staged_key'])
+    if not linked:
+        logger.warning(f"Profile {job['profile_id']} no longer exists, document {document_url} is not linked")
+
+async def process_stored_document(job: Dict[str, Any]):
+    """Hash, deduplicate and index a document that is already in storage
+
+    The browser uploads these directly, so the worker streams a copy back to /tmp.
+    """
+    from scripts.db.database_factory import get_database
+    from .storage import get_document_storage
+
+    db = get_database()
+    storage = get_document_storage()
+    profile_id = job['profile_id']
+    document_url = job['document_url']
+    duplicate = None
+    with tempfile.NamedTemporaryFile() as fileobj:
+        if not await storage.download(job['stored_name'], fileobj):
+            logger.warning(f"Uploaded document {job['stored_name']} of profile {profile_id} no longer exists")
+            mark_document_failed(job)
+            return
+        fileobj.flush()
+        sha256 = await asyncio.to_thread(file_sha256, fileobj.name)
+        if not db.document_hash.record_document(sha256, document_url, profile_id):
+            recorded_url = db.document_hash.get_document(sha256)['document_url']
+            if recorded_url != document_url:
+                duplicate, document_url = job['stored_name'], recorded_url
+
+        linked = db.profile.update_profile(profile_id, {'document_url': document_url, 'document_sha256': sha256, 'document_status': DOCUMENT_DONE})
+        if linked:
+            # Dropped only once the profile points at the earlier copy
+            if duplicate:
+                await storage.delete(duplicate)
+                logger.info(f"Document for profile {profile_id} matches an earlier upload, removed duplicate {duplicate}")
+            try:
+                await index_document_text(db, profile_id, fileobj.name, job['filename'])
+            except Exception as e:
+                logger.error(f"Text extraction failed for profile {profile_id}: {e}")
+
+    if not linked:
+        logger.warning(f"Profile {profile_id} no longer exists, document {document_url} is not linked")
+
+async def index_document_text(db, profile_id: int, path: str, filename: str):
+    from .extraction import extract_text_async
+    from .storage import document_extension
+
+    text = await extract_text_async(path, document_extension(filename))
+    if text:
+        db.profile.index_document_text(profile_id, text)
+        logger.info(f"Indexed {len(text)} characters of document text for profile {profile_id}")
+
+def mark_document_failed(job: Dict[str, Any]):
+    from scripts.db.database_factory import get_database
+    if not get_database().profile.update_profile(job['profile_id'], {'document_status': DOCUMENT_FAILED}):
+        logger.warning(f"Profile {job['profile_id']} no longer exists, document failure not recorded")
+    if job.get('staged_key'):
+        get_staging().delete(job['staged_key'])
+
+def handle_sqs_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Lambda entry point for SQS batches, failed messages are returned for redelivery
+
+    Needs ReportBatchItemFailures on the event source mapping.
+    """
+    async def process(record):
+        job = json.loads(record['body'])
+        attempt = int(record.get('attributes', {}).get('ApproximateReceiveCount', 1))
+        try:
+            await process_document_job(job)
+        except Exception as e:
+            logger.error(f"Document upload for profile {job['profile_id']} failed (attempt {attempt}): {e}")
+            if attempt < MAX_DOCUMENT_ATTEMPTS:
+                return record['messageId']
+            mark_document_failed(job)
+        return None
+
+    async def process_all():
+        return await asyncio.gather(*[process(record) for record in records])
+
+    # Reuse the container's loop so the shared HTTP client keeps its connections
+    failed = asyncio.get_event_loop().run_until_complete(process_all())
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed if message_id]}
\ No newline at end of file
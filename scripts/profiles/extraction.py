@@ -0,0 +1,73 @@
+"""Plain text extraction from uploaded profile documents"""
+import asyncio
+import html
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Longer text is truncated, it still has to fit a 400KB DynamoDB item once compressed
+MAX_DOCUMENT_TEXT = 200000
+
+# Larger files are not parsed, no accepted upload is bigger
+MAX_EXTRACTION_SIZE = 10 * 1024 * 1024
+# Most of word/document.xml that is read, markup is far longer than the text it holds
+MAX_DOCX_XML = 16 * 1024 * 1024
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def extract_pdf_text(path: str) -> str:
+    """Text layer of a PDF, scanned documents without one yield nothing"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf is not installed, skipping PDF text extraction")
+        return ''
+    pages = []
+    length = 0
+    # An open file lets pypdf read objects as pages need them instead of loading it whole
+    with open(path, 'rb') as f:
+        for page in PdfReader(f).pages:
+            text = page.extract_text() or ''
+            pages.append(text)
+            length += len(text)
+            if length >= MAX_DOCUMENT_TEXT:
+                break
+    return '\n'.join(pages)
+
+def extract_docx_text(path: str) -> str:
+    """Text of a DOCX body, read from word/document.xml"""
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as member:
+        xml = member.read(MAX_DOCX_XML).decode('utf-8', errors='ignore')
+    xml = re.sub(r'</w:p>|<w:br/>|<w:tab/>', '\n', xml)
+    return html.unescape(re.sub(r'<[^>]+>', '', xml))
+
+def extract_text(path: str, extension: str) -> str:
+    """Extract plain text from a document file, '' for formats without an extractor (.doc)"""
+    if os.path.getsize(path) > MAX_EXTRACTION_SIZE:
+        logger.warning(f"{path} is larger than {MAX_EXTRACTION_SIZE} bytes, skipping text extraction")
+        return ''
+    if extension == '.pdf':
+        text = extract_pdf_text(path)
+    elif extension == '.docx':
+        text = extract_docx_text(path)
+    else:
+        return ''
+    return re.sub(r'[ \t]+', ' ', text).strip()[:MAX_DOCUMENT_TEXT]
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    # Lambda has no /dev/shm for multiprocessing, extraction falls back to a thread there
+    if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=2)
+    return _executor
+
+async def extract_text_async(path: str, extension: str) -> str:
+    """Run extract_text in a worker process so parsing does not block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), extract_text, path, extension)
\ No newline at end of file
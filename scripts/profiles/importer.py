@@ -0,0 +1,55 @@
+import csv
+import io
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+MAX_IMPORT_ROWS = 5000
+
+def _header(value: Any) -> str:
+    """Map a column title such as "Experience Years" to the field name"""
+    return str(value or '').strip().lower().replace(' ', '_').replace('-', '_')
+
+def _cell(value: Any) -> Any:
+    """Normalize a cell to text (or None) so spreadsheet and CSV rows validate alike"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores phone numbers and whole numbers as floats
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+def _csv_rows(file: BinaryIO) -> Iterator[List[Any]]:
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[Tuple[Any, ...]]:
+    from openpyxl import load_workbook
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def iter_import_rows(file: BinaryIO, filename: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (row_number, row) from a CSV or XLSX upload without loading it all into memory
+
+    The first row holds the column titles, row numbers match what a spreadsheet shows.
+    """
+    rows = _xlsx_rows(file) if filename.lower().endswith('.xlsx') else _csv_rows(file)
+    headers = [_header(value) for value in next(rows, [])]
+    for row_number, values in enumerate(rows, start=2):
+        row = {header: _cell(value) for header, value in zip(headers, values) if header}
+        if any(value is not None for value in row.values()):
+            yield row_number, row
+
+def chunked(rows: Iterator, size: int) -> Iterator[List]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
\ No newline at end of file
@@ -0,0 +1,65 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Profile attributes covered by the search index and their ranking weight
+SEARCH_FIELDS = {
+    'skills': 3,
+    'current_location': 2,
+    'preferred_location': 2,
+    'current_employer': 1,
+    'highest_education': 1,
+    'resume': 1
+}
+
+# Text extracted from the profile's document is indexed under this field
+DOCUMENT_FIELD = 'resume'
+MAX_DOCUMENT_TOKENS = 2000
+
+# Numeric attributes copied onto each posting so range filters run inside the index
+RANGE_FIELDS = ('experience_years', 'expected_ctc')
+
+# Keeps tokens such as c++, c#, node.js and .net intact
+TOKEN_PATTERN = re.compile(r'[a-z0-9.+#]*[a-z0-9+#]')
+
+def tokenize(text: Any) -> List[str]:
+    """Split free text into lowercase search tokens"""
+    if not text:
+        return []
+    return list(dict.fromkeys(TOKEN_PATTERN.findall(str(text).lower())))
+
+def profile_postings(profile: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """Return the (field, token) pairs a profile is indexed under"""
+    return {(field, token) for field in SEARCH_FIELDS for token in tokenize(profile.get(field))}
+
+def document_tokens(text: str) -> List[str]:
+    """Distinct search tokens of extracted document text, numbers and single characters dropped"""
+    tokens = tokenize(unicodedata.normalize('NFKC', text or ''))
+    return [token for token in tokens if len(token) > 1 and not token.isdigit()][:MAX_DOCUMENT_TOKENS]
+
+def document_postings(text: str) -> Set[Tuple[str, str]]:
+    """Return the (field, token) pairs a profile's document text is indexed under"""
+    return {(DOCUMENT_FIELD, token) for token in document_tokens(text)}
+
+def range_values(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the numeric attributes stored on the profile's postings"""
+    return {field: profile[field] for field in RANGE_FIELDS if profile.get(field) is not None}
+
+def rank_matches(matches: Iterable[Tuple[int, str, str, str]], query_tokens: List[str]) -> List[Tuple[int, float]]:
+    """Rank (profile_id, query_token, field, token) matches, best first
+
+    Profiles matching more query terms rank first, then by the weighted score where
+    an exact token match counts double a prefix match. Newer profiles break ties.
+    """
+    best: Dict[int, Dict[str, float]] = {}
+    for profile_id, query_token, field, token in matches:
+        weight = SEARCH_FIELDS[field] * (2 if token == query_token else 1)
+        per_term = best.setdefault(profile_id, {})
+        per_term[query_token] = max(per_term.get(query_token, 0), weight)
+
+    ranked = sorted(
+        best.items(),
+        key=lambda entry: (len(entry[1]), sum(entry[1].values()), entry[0]),
+        reverse=True
+    )
+    return [(profile_id, sum(per_term.values())) for profile_id, per_term in ranked]
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""Storage targets for documents uploaded directly by the browser"""
+import os
+import shutil
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Tuple
+
+# Direct uploads bypass the Lambda request limit, so only the document limit applies
+MAX_DOCUMENT_SIZE = 10 * 1024 * 1024
+
+DOCUMENT_MAGIC_BYTES = {
+    b'%PDF': ['.pdf'],
+    b'\xd0\xcf\x11\xe0': ['.doc'],
+    b'PK\x03\x04': ['.docx'],
+}
+DOCUMENT_EXTENSIONS = ('.pdf', '.doc', '.docx')
+MAGIC_BYTES_LENGTH = 8
+
+def document_extension(filename: str) -> str:
+    """Return the lowercase extension of filename including the dot, or '' if it has none"""
+    return f".{filename.lower().rsplit('.', 1)[-1]}" if '.' in (filename or '') else ''
+
+def matches_magic_bytes(header: bytes, extension: str) -> bool:
+    """Check the leading bytes of a document match its declared extension"""
+    return any(
+        header.startswith(signature) and extension in extensions
+        for signature, extensions in DOCUMENT_MAGIC_BYTES.items()
+    )
+
+class GraphDocumentStorage:
+    """Documents go straight to OneDrive through a Graph upload session"""
+
+    async def create_upload(self, name: str, size: int) -> Dict[str, Any]:
+        from onedrive_config import onedrive_client, UPLOAD_CHUNK_SIZE
+        session = await onedrive_client.create_upload_session(name)
+        return {
+            "upload_url": session["uploadUrl"],
+            "method": "PUT",
+            "chunk_size": UPLOAD_CHUNK_SIZE,
+            "expires_at": session.get("expirationDateTime")
+        }
+
+    async def read_head(self, name: str, length: int) -> Optional[Tuple[int, bytes, str]]:
+        """Return (size, first length bytes, document URL) of an uploaded document, None if missing"""
+        from onedrive_config import onedrive_client
+        item = await onedrive_client.get_item(name)
+        if not item:
+            return None
+        header = await onedrive_client.read_range(item["@microsoft.graph.downloadUrl"], length)
+        return item["size"], header, item["webUrl"]
+
+    async def download(self, name: str, fileobj: BinaryIO) -> bool:
+        """Stream an uploaded document into fileobj, False if it does not exist"""
+        from onedrive_config import onedrive_client
+        item = await onedrive_client.get_item(name)
+        if not item:
+            return False
+        await onedrive_client.download_to(item["@microsoft.graph.downloadUrl"], fileobj)
+        return True
+
+    async def delete(self, name: str):
+        from onedrive_config import onedrive_client
+        await onedrive_client.delete_item(name)
+
+class LocalDocumentStorage:
+    """Stub for local development, the upload URL points back at the API"""
+
+    def __init__(self):
+        self.upload_dir = "/tmp/documents" if os.getenv('AWS_LAMBDA_FUNCTION_NAME') else "uploads/documents"
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.upload_dir, os.path.basename(name))
+
+    async def create_upload(self, name: str, size: int) -> Dict[str, Any]:
+        # The API fills in its own local upload endpoint
+        return {"upload_url": None, "method": "PUT", "chunk_size": None, "expires_at": None}
+
+    async def save_stream(self, name: str, chunks: AsyncIterator[bytes], max_size: int) -> bool:
+        """Write an uploaded body to disk, False (and nothing kept) if it exceeds max_size"""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        written = 0
+        with open(self.path(name), "wb") as f:
+            async for chunk in chunks:
+                written += len(chunk)
+                if written > max_size:
+                    break
+                f.write(chunk)
+        if written > max_size:
+            await self.delete(name)
+            return False
+        return True
+
+    async def read_head(self, name: str, length: int) -> Optional[Tuple[int, bytes, str]]:
+        path = self.path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            header = f.read(length)
+        return os.path.getsize(path), header, path
+
+    async def download(self, name: str, fileobj: BinaryIO) -> bool:
+        path = self.path(name)
+        if not os.path.exists(path):
+            return False
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, fileobj)
+        return True
+
+    async def delete(self, name: str):
+        path = self.path(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+def get_document_storage():
+    """Graph by default, DOCUMENT_STORAGE=local keeps uploads on disk for development"""
+    if os.getenv('DOCUMENT_STORAGE', 'graph').lower() == 'local':
+        return LocalDocumentStorage()
+    return GraphDocumentStorage()
\ No newline at end of file
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from scripts.db.database_factory import get_database
 from auth import require_lead, require_lead_or_recruiter
-from scripts.utils.response import success_response, handle_error
+from scripts.utils.response import success_response, paginated_response, conditional_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from scripts.utils.fields import parse_fields
+from scripts.utils.remarks import format_remark, render_remarks, render_list_remarks, REMARK_DATE_FORMATS
 from .validation import validate_requirement_fields
+from .expand import parse_expand, expand_requirements, EXPANSION_KEYS
 from typing import Optional, Dict, Any
 from datetime import date, datetime
 from zoneinfo import ZoneInfo
@@ -15,6 +19,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/requirements", tags=["requirements"])
 
+# Attributes clients may select with ?fields=
+REQUIREMENT_FIELDS = {
+    'requirement_id', 'created_date', 'company_id', 'spoc_id', 'key_skill', 'jd', 'status_id',
+    'recruiter_name', 'closed_date', 'budget', 'expected_billing_date', 'location', 'remarks',
+    'req_cust_ref_id', 'role', 'updated_date'
+}
+
 class RequirementCreate(BaseModel):
     key_skill: str = Field(alias="key_skill")
     jd: str = Field(alias="jd")
@@ -58,19 +69,24 @@ class RequirementRemarksUpdate(BaseModel):
 class ActivelyWorkingUpdate(BaseModel):
     actively_working: str
 
-def get_requirement_or_404(requirement_id: int):
+def get_requirement_or_404(requirement_id: int, fields: Optional[list] = None):
     db = get_database()
-    current_req = db.requirement.get_requirement(requirement_id)
+    current_req = db.requirement.get_requirement(requirement_id, fields=fields)
     if not current_req:
         logger.error(f"Requirement not found: {requirement_id}")
         raise HTTPException(status_code=404, detail={"error": "REQUIREMENT_NOT_FOUND", "message": "Requirement not found", "code": "REQ_404"})
     return current_req
 
 def append_remark(old_remarks: str, new_remark: str, username: str) -> str:
-    current_date = datetime.now(ZoneInfo('Asia/Kolkata')).strftime('%d-%b-%y')
-    formatted_remark = f"{current_date} [{username}]: {new_remark}"
+    formatted_remark = format_remark(datetime.now(ZoneInfo('Asia/Kolkata')), username, new_remark, REMARK_DATE_FORMATS['requirement'])
     return f"{old_remarks}\n{formatted_remark}" if old_remarks else formatted_remark
 
+def add_requirement_remark_or_404(requirement_id: int, remark: str, username: str) -> None:
+    db = get_database()
+    if not db.remark.add_remark('requirement', requirement_id, remark, username):
+        logger.error(f"Requirement not found: {requirement_id}")
+        raise HTTPException(status_code=404, detail={"error": "REQUIREMENT_NOT_FOUND", "message": "Requirement not found", "code": "REQ_404"})
+
 def update_requirement_or_404(requirement_id: int, update_data: dict) -> None:
     db = get_database()
     success = db.requirement.update_requirement(requirement_id, update_data)
@@ -118,14 +134,37 @@ def add_requirement(requirement: RequirementCreate, user_info: dict = Depends(re
         handle_error(e, "add requirement")
 
 @router.get("/list")
-def list_requirements(user_info: dict = Depends(require_lead_or_recruiter)):
+def list_requirements(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    user_info: dict = Depends(require_lead_or_recruiter)
+):
+    """List requirements, expand=company,spoc,recruiters,stage_counts embeds related data in each record"""
     try:
         logger.info(f"[ENTRY] List requirements API called by: {user_info.get('username', 'unknown')}")
+        expansions = parse_expand(expand)
+        # Expansions are resolved from these attributes, so keep them in a ?fields= selection
+        required = ['requirement_id'] + [EXPANSION_KEYS[name] for name in expansions if name in EXPANSION_KEYS]
+        selected = parse_fields(fields, REQUIREMENT_FIELDS, required=required)
+        # Recruiters and leads only count their own candidates, as in /{id}/profilecounts
+        username = user_info.get('username') if user_info.get('role') in ['recruiter', 'lead'] else None
         db = get_database()
-        requirements_data = db.requirement.list_requirements()
+        if limit or cursor:
+            start_key = decode_cursor(cursor, "requirements")
+            requirements_data, last_key = db.requirement.list_requirements_page(limit or DEFAULT_PAGE_SIZE, start_key, fields=selected)
+            requirements_data = render_list_remarks(db, requirements_data, 'requirement', 'requirement_id', selected)
+            requirements_data = expand_requirements(db, requirements_data, expansions, username)
+            logger.info(f"[EXIT] List requirements API successful - returned page of {len(requirements_data)} records")
+            return paginated_response(requirements_data, encode_cursor(last_key, "requirements"), "Requirements retrieved successfully")
+        requirements_data = render_list_remarks(db, db.requirement.list_requirements(fields=selected), 'requirement', 'requirement_id', selected)
+        requirements_data = expand_requirements(db, requirements_data, expansions, username)
         
         logger.info(f"[EXIT] List requirements API successful - returned {len(requirements_data)} records")
         return success_response(requirements_data, "Requirements retrieved successfully")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[ERROR] List requirements failed: {str(e)}")
         handle_error(e, "list requirements")
@@ -140,10 +179,21 @@ def get_requirement_statuses(user_info: dict = Depends(require_lead_or_recruiter
         handle_error(e, "get requirement statuses")
 
 @router.get("/company/{company_id}/open")
-def get_open_requirements_by_company(company_id: int, user_info: dict = Depends(require_lead_or_recruiter)):
+def get_open_requirements_by_company(
+    company_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    user_info: dict = Depends(require_lead_or_recruiter)
+):
+    """Open requirements ordered by creation date, newest first unless order=asc
+
+    limit/cursor page through the company wide view, a recruiter's own list is always returned whole.
+    """
     try:
         db = get_database()
         user_role = user_info.get('role')
+        newest_first = order == "desc"
         
         if user_role in ['recruiter', 'lead']:
             username = user_info.get('username')
@@ -151,10 +201,21 @@ def get_open_requirements_by_company(company_id: int, user_info: dict = Depends(
                 logger.error("Username not found in token for get open requirements by company")
                 raise HTTPException(status_code=401, detail="Username not found in token")
             requirements_data = db.requirement.get_open_requirements_by_company_and_recruiter(company_id, username)
+            if not newest_first:
+                requirements_data.reverse()
+        elif limit or cursor:
+            scope = f"open-requirements:{company_id}:{order}"
+            start_key = decode_cursor(cursor, scope)
+            requirements_data, last_key = db.requirement.get_open_requirements_by_company_page(company_id, limit or DEFAULT_PAGE_SIZE, start_key, newest_first)
+            requirements_data = render_list_remarks(db, requirements_data, 'requirement', 'requirement_id')
+            return paginated_response(requirements_data, encode_cursor(last_key, scope), "Open requirements retrieved successfully")
         else:
-            requirements_data = db.requirement.get_open_requirements_by_company(company_id)
+            requirements_data = db.requirement.get_open_requirements_by_company(company_id, newest_first)
         
+        requirements_data = render_list_remarks(db, requirements_data, 'requirement', 'requirement_id')
         return success_response(requirements_data, "Open requirements retrieved successfully")
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "get open requirements by company")
 
@@ -205,10 +266,14 @@ def get_profiles_by_stage(requirement_id: int, stage: str, user_info: dict = Dep
         handle_error(e, "get profiles by stage")
 
 @router.get("/{requirement_id}")
-def get_requirement(requirement_id: int, user_info: dict = Depends(require_lead_or_recruiter)):
+def get_requirement(requirement_id: int, request: Request, fields: Optional[str] = None, user_info: dict = Depends(require_lead_or_recruiter)):
     try:
-        requirement = get_requirement_or_404(requirement_id)
-        return success_response(requirement, "Requirement retrieved successfully")
+        selected = parse_fields(fields, REQUIREMENT_FIELDS, required=['requirement_id'])
+        requirement = get_requirement_or_404(requirement_id, fields=selected)
+        if not selected or 'remarks' in selected:
+            remarks, _ = get_database().remark.list_remarks('requirement', requirement_id)
+            requirement['remarks'] = render_remarks(requirement.get('remarks'), remarks, 'requirement')
+        return conditional_response(request, requirement, "Requirement retrieved successfully")
     except HTTPException:
         logger.error("HTTPException in get requirement")
         raise
@@ -289,14 +354,27 @@ def get_requirement_recruiters(requirement_id: int, user_info: dict = Depends(re
     except Exception as e:
         handle_error(e, "get requirement recruiters")
 
+@router.get("/{requirement_id}/remarks")
+def list_remarks(
+    requirement_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_lead_or_recruiter)
+):
+    try:
+        scope = f"requirement-remarks:{requirement_id}"
+        db = get_database()
+        remarks, last_key = db.remark.list_remarks('requirement', requirement_id, limit, decode_cursor(cursor, scope))
+        return paginated_response(remarks, encode_cursor(last_key, scope), "Remarks retrieved successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        handle_error(e, "list remarks")
+
 @router.put("/{requirement_id}/remarks")
 def update_remarks(requirement_id: int, remarks_update: RequirementRemarksUpdate, user_info: dict = Depends(require_lead)):
     try:
-        current_req = get_requirement_or_404(requirement_id)
-        old_remarks = current_req.get('remarks', '')
-        username = user_info.get('username', 'unknown')
-        new_remarks = append_remark(old_remarks, remarks_update.remarks, username)
-        update_requirement_or_404(requirement_id, {"remarks": new_remarks})
+        add_requirement_remark_or_404(requirement_id, remarks_update.remarks, user_info.get('username', 'unknown'))
         return success_response(message="Remarks updated successfully")
     except HTTPException:
         logger.error("HTTPException in update remarks")
@@ -307,19 +385,14 @@ def update_remarks(requirement_id: int, remarks_update: RequirementRemarksUpdate
 @router.put("/{requirement_id}/status")
 def update_status_with_remarks(requirement_id: int, status_update: RequirementStatusUpdate, user_info: dict = Depends(require_lead)):
     try:
-        current_req = get_requirement_or_404(requirement_id)
-        
         update_data: Dict[str, Any] = {"status_id": status_update.status_id}
         
         if status_update.status_id in [4, 5]:
             update_data["closed_date"] = datetime.now(ZoneInfo('Asia/Kolkata'))
         
-        if status_update.remarks:
-            old_remarks = current_req.get('remarks', '')
-            username = user_info.get('username', 'unknown')
-            update_data["remarks"] = append_remark(old_remarks, status_update.remarks, username)
-        
         update_requirement_or_404(requirement_id, update_data)
+        if status_update.remarks:
+            add_requirement_remark_or_404(requirement_id, status_update.remarks, user_info.get('username', 'unknown'))
         return success_response(message="Status and remarks updated successfully")
     except HTTPException:
         logger.error("HTTPException in update status with remarks")
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from scripts.utils.cache import TTLCache
+
+# Related data /requirements/list can embed with ?expand=
+EXPANSIONS = ('company', 'spoc', 'recruiters', 'stage_counts')
+
+# Requirement attributes each expansion is resolved from
+EXPANSION_KEYS = {'company': 'company_id', 'spoc': 'spoc_id'}
+
+# Companies and SPOCs change rarely, a short TTL keeps list pages from re-reading them
+company_cache = TTLCache(ttl=60)
+spoc_cache = TTLCache(ttl=60)
+profile_stage_cache = TTLCache(ttl=300)
+
+def parse_expand(expand: Optional[str]) -> List[str]:
+    """Parse a comma separated ?expand= value against EXPANSIONS"""
+    if not expand:
+        return []
+
+    requested = list(dict.fromkeys(name.strip() for name in expand.split(',') if name.strip()))
+    invalid = [name for name in requested if name not in EXPANSIONS]
+    if invalid:
+        raise HTTPException(status_code=400, detail={
+            "error": "INVALID_EXPAND",
+            "message": f"Unknown expand values: {', '.join(invalid)}. Allowed: {', '.join(EXPANSIONS)}",
+            "code": "REQ_400"
+        })
+    return requested
+
+def _ids(requirements: List[Dict[str, Any]], attr: str) -> List[int]:
+    return list(dict.fromkeys(int(requirement[attr]) for requirement in requirements if requirement.get(attr)))
+
+def _resolve_process_profiles(db, requirement_ids: List[int], expansions: List[str], username: Optional[str]) -> Dict[str, Dict[int, Any]]:
+    """Recruiters and stage counts per requirement from one read of their process profiles"""
+    process_profiles = db.process_profile.get_process_profiles_by_requirements(requirement_ids)
+    resolved = {}
+
+    if 'recruiters' in expansions:
+        recruiters = {requirement_id: set() for requirement_id in requirement_ids}
+        for process_profile in process_profiles:
+            if process_profile.get('actively_working') == 'Yes' and process_profile.get('recruiter_name'):
+                recruiters[int(process_profile['requirement_id'])].add(process_profile['recruiter_name'])
+        resolved['recruiters'] = {requirement_id: sorted(names) for requirement_id, names in recruiters.items()}
+
+    if 'stage_counts' in expansions:
+        # Same rules as /{id}/profilecounts: active candidates only, recruiters see their own
+        candidates = [
+            process_profile for process_profile in process_profiles
+            if process_profile.get('profile_id')
+            and process_profile.get('actively_working', 'Yes') == 'Yes'
+            and (username is None or process_profile.get('recruiter_name') == username)
+        ]
+        statuses = db.profile.get_statuses_by_ids(list({int(candidate['profile_id']) for candidate in candidates}))
+        stages = profile_stage_cache.get('stages', lambda: {
+            int(status['id']): status['stage'] for status in db.profile.list_profile_statuses()
+        }, cache_empty=False)
+        stage_counts = {requirement_id: {} for requirement_id in requirement_ids}
+        for candidate in candidates:
+            status = statuses.get(int(candidate['profile_id']))
+            if status is None:
+                continue
+            counts = stage_counts[int(candidate['requirement_id'])]
+            stage = stages.get(int(status), 'Unknown')
+            counts[stage] = counts.get(stage, 0) + 1
+        resolved['stage_counts'] = stage_counts
+
+    return resolved
+
+def expand_requirements(db, requirements: List[Dict[str, Any]], expansions: List[str], username: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Embed the requested related data in each requirement
+
+    Companies and SPOCs are batch loaded through their caches, process profiles of all
+    requirements are read once for recruiters and stage counts, and the lookups run concurrently.
+    username limits stage counts to that recruiter's candidates.
+    """
+    if not requirements or not expansions:
+        return requirements
+
+    tasks = {}
+    if 'company' in expansions:
+        tasks['company'] = lambda: company_cache.get_many(_ids(requirements, 'company_id'), db.company.get_companies_by_ids)
+    if 'spoc' in expansions:
+        tasks['spoc'] = lambda: spoc_cache.get_many(_ids(requirements, 'spoc_id'), db.spoc.get_spocs_by_ids)
+    if 'recruiters' in expansions or 'stage_counts' in expansions:
+        requirement_ids = _ids(requirements, 'requirement_id')
+        tasks['process_profiles'] = lambda: _resolve_process_profiles(db, requirement_ids, expansions, username)
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(copy_context().run, task) for name, task in tasks.items()}
+        resolved = {name: future.result() for name, future in futures.items()}
+    resolved.update(resolved.pop('process_profiles', {}))
+
+    for requirement in requirements:
+        for name in expansions:
+            if name in EXPANSION_KEYS:
+                key = requirement.get(EXPANSION_KEYS[name])
+                requirement[name] = resolved[name].get(int(key)) if key else None
+            else:
+                requirement[name] = resolved[name].get(int(requirement['requirement_id']), [] if name == 'recruiters' else {})
+    return requirements
\ No newline at end of file
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, field_validator
+from typing import Optional
 from scripts.db.database_factory import get_database
 from auth import require_manager, require_lead
-from scripts.utils.response import success_response, handle_error
+from scripts.utils.response import success_response, paginated_response, handle_error
+from scripts.utils.pagination import encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from scripts.requirements.expand import spoc_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,11 +50,21 @@ def add_spoc(spoc: SPOCCreate, user_info: dict = Depends(require_manager)):
         handle_error(e, "add SPOC")
 
 @router.get("/spoc/list")
-def list_spocs(user_info: dict = Depends(require_manager)):
+def list_spocs(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_info: dict = Depends(require_manager)
+):
     try:
         db = get_database()
+        if limit or cursor:
+            start_key = decode_cursor(cursor, "spocs")
+            spocs_data, last_key = db.spoc.list_spocs_page(limit or DEFAULT_PAGE_SIZE, start_key)
+            return paginated_response(spocs_data, encode_cursor(last_key, "spocs"), "SPOCs retrieved successfully")
         spocs_data = db.spoc.list_spocs()
         return success_response(spocs_data, "SPOCs retrieved successfully")
+    except HTTPException:
+        raise
     except Exception as e:
         handle_error(e, "list SPOCs")
 
@@ -86,6 +99,7 @@ def update_spoc(spoc_id: int, spoc_update: SPOCUpdate, user_info: dict = Depends
                 "code": "SPOC_404"
             })
         
+        spoc_cache.invalidate(spoc_id)
         return success_response(message="SPOC updated successfully")
     except HTTPException:
         raise
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+class TTLCache:
+    """In-process cache whose entries expire after ttl seconds
+
+    Each Lambda container keeps its own copy, so this suits small reference data
+    that changes rarely and tolerates being stale for up to ttl seconds.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, loader: Callable[[], Any], cache_empty: bool = True) -> Any:
+        """Return the cached value for key, calling loader when it is missing or expired
+
+        With cache_empty=False an empty result is returned but not kept, for loaders
+        that report a failed read as an empty collection.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+        value = loader()
+        if not cache_empty and not value:
+            return value
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+        return value
+    
+    def get_many(self, keys: Iterable[Hashable], loader: Callable[[list], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """Return cached values for keys, loading all missing ones with a single loader(missing_keys) call
+
+        Keys the loader does not return come back as None and are not kept, since loaders
+        that report a failed read as an empty dict would otherwise blank them for ttl seconds.
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and entry[0] > now:
+                    found[key] = entry[1]
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = loader(missing)
+            expires = time.monotonic() + self.ttl
+            with self._lock:
+                for key in missing:
+                    found[key] = loaded.get(key)
+                    if key in loaded:
+                        self._entries[key] = (expires, found[key])
+        return found
+    
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
\ No newline at end of file
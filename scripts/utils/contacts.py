@@ -0,0 +1,44 @@
+import hashlib
+import re
+from typing import List, Optional
+
+DEFAULT_COUNTRY_CODE = '91'
+
+class ContactTaken(Exception):
+    """The email or phone being written is already registered to another profile"""
+    def __init__(self, profile_id: Optional[int]):
+        super().__init__(f"Contact already registered to profile {profile_id}")
+        self.profile_id = profile_id
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercase and trim an email address, None when it is blank"""
+    if not email or not email.strip():
+        return None
+    return email.strip().lower()
+
+def normalize_phone(phone: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """Convert a phone number to E.164, numbers without a country code are treated as Indian"""
+    if not phone:
+        return None
+    phone = str(phone).strip()
+    digits = re.sub(r'\D', '', phone)
+    
+    if not phone.startswith('+'):
+        if digits.startswith('00'):
+            digits = digits[2:]
+        elif len(digits) == 10:
+            digits = country_code + digits
+        elif len(digits) == 11 and digits.startswith('0'):
+            digits = country_code + digits[1:]
+    
+    if not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
+
+def contact_keys(email: Optional[str], phone: Optional[str]) -> List[str]:
+    """Uniqueness keys for a candidate, hashed so the index holds no raw contact details"""
+    keys = []
+    for kind, value in (('email', normalize_email(email)), ('phone', normalize_phone(phone))):
+        if value:
+            keys.append(f"{kind}#{hashlib.sha256(value.encode()).hexdigest()}")
+    return keys
\ No newline at end of file
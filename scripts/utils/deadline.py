@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Seconds kept back from the Lambda budget to build and return the response
+RESPONSE_MARGIN = 0.5
+
+# A call is not started with less time than this left, it could only time out
+MIN_CALL_BUDGET = 0.2
+
+# time.monotonic() by which the current invocation must have its answer, None when unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+class DeadlineExceeded(Exception):
+    """Not enough of the invocation's time is left for the next downstream call"""
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Bound the calls made inside the block to finish within seconds (None for no bound)"""
+    token = _deadline.set(time.monotonic() + seconds - RESPONSE_MARGIN if seconds is not None else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def clear_deadline():
+    """Drop the deadline for the rest of the current context, for work that outlives the request"""
+    _deadline.set(None)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline, None when there is none"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def check_deadline(needed: float = MIN_CALL_BUDGET):
+    """Raise DeadlineExceeded when less than needed seconds are left"""
+    left = remaining()
+    if left is not None and left < needed:
+        raise DeadlineExceeded(f"{max(left, 0):.2f}s left, {needed:.2f}s needed")
+
+def bounded(timeout: float) -> float:
+    """timeout capped to the time left, failing fast when that is too little for a call"""
+    check_deadline()
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
\ No newline at end of file
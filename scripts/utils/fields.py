@@ -0,0 +1,20 @@
+from typing import Iterable, List, Optional
+from fastapi import HTTPException
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], required: Iterable[str] = ()) -> Optional[List[str]]:
+    """Parse a comma separated ?fields= value against an allow-list, None means all fields"""
+    if not fields:
+        return None
+    
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    invalid = [field for field in requested if field not in allowed]
+    if invalid:
+        raise HTTPException(status_code=400, detail={
+            "error": "INVALID_FIELDS",
+            "message": f"Unknown fields: {', '.join(invalid)}",
+            "code": "FIELDS_400"
+        })
+    
+    # Key fields are always returned so clients can address the records
+    selected = list(dict.fromkeys(list(required) + requested))
+    return selected
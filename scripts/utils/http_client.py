@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Optional
+import httpx
+from scripts.utils.deadline import check_deadline, remaining
+
+logger = logging.getLogger(__name__)
+
+# Graph and Azure AD are the only hosts, a handful of kept-alive connections covers them
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("h2 is not installed, shared HTTP client falls back to HTTP/1.1")
+        return False
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process wide AsyncClient so connections to Graph and Azure AD are reused
+
+    Pooled connections belong to the event loop that opened them, a new loop
+    (or a client closed on shutdown) gets a fresh client.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(http2=_http2_available(), limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        _client_loop = loop
+    return _client
+
+async def close_http_client():
+    global _client
+    if _client is not None and not _client.is_closed and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+
+def request_timeout(timeout: httpx.Timeout = HTTP_TIMEOUT) -> httpx.Timeout:
+    """timeout with every phase capped to the time the request has left
+
+    Raises DeadlineExceeded instead when too little is left to make the call at all.
+    """
+    check_deadline()
+    left = remaining()
+    if left is None:
+        return timeout
+    
+    def cap(value):
+        return left if value is None else min(value, left)
+    return httpx.Timeout(connect=cap(timeout.connect), read=cap(timeout.read), write=cap(timeout.write), pool=cap(timeout.pool))
\ No newline at end of file
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+from .signing import sign_token, verify_token
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(position: Optional[Dict[str, Any]], scope: str) -> Optional[str]:
+    """Wrap a DynamoDB LastEvaluatedKey or SQLite keyset position into an opaque cursor"""
+    if not position:
+        return None
+    return sign_token({'s': scope, 'k': position})
+
+def decode_cursor(cursor: Optional[str], scope: str) -> Optional[Dict[str, Any]]:
+    """Return the position encoded in cursor, rejecting tampered or foreign cursors"""
+    if not cursor:
+        return None
+    payload = verify_token(cursor)
+    if not payload or payload.get('s') != scope or not isinstance(payload.get('k'), dict):
+        raise HTTPException(status_code=400, detail={
+            "error": "INVALID_CURSOR",
+            "message": "Invalid pagination cursor",
+            "code": "PAGE_400"
+        })
+    return payload['k']
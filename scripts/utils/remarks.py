@@ -1,11 +1,41 @@
 from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
 from zoneinfo import ZoneInfo
 
+# Timestamp format each entity has always used in its remarks text
+REMARK_DATE_FORMATS = {
+    'profile': '%Y-%m-%d %H:%M',
+    'requirement': '%d-%b-%y'
+}
+
+def format_remark(timestamp: datetime, username: str, remark: str, date_format: str = REMARK_DATE_FORMATS['profile']) -> str:
+    return f"{timestamp.strftime(date_format)} [{username}]: {remark}"
+
 def append_remarks(existing_remarks: str, new_remark: str, username: str) -> str:
     """Append new remark to existing remarks with timestamp and user"""
-    timestamp = datetime.now(ZoneInfo('Asia/Kolkata')).strftime('%Y-%m-%d %H:%M')
-    new_entry = f"{timestamp} [{username}]: {new_remark}"
+    new_entry = format_remark(datetime.now(ZoneInfo('Asia/Kolkata')), username, new_remark)
     
     if existing_remarks and existing_remarks.strip():
         return f"{existing_remarks}\n{new_entry}"
-    return new_entry
\ No newline at end of file
+    return new_entry
+
+def render_remarks(legacy_remarks: Optional[str], remarks: Iterable[Dict[str, Any]], entity_type: str) -> str:
+    """Render the legacy remarks string followed by the remarks stored as separate items"""
+    date_format = REMARK_DATE_FORMATS[entity_type]
+    lines = [legacy_remarks] if legacy_remarks and legacy_remarks.strip() else []
+    for remark in remarks:
+        created = datetime.fromisoformat(remark['created_date'])
+        lines.append(format_remark(created, remark['username'], remark['remark'], date_format))
+    return "\n".join(lines)
+
+def render_list_remarks(db, records: List[Dict[str, Any]], entity_type: str, key_attr: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Apply render_remarks to every record of a list page with one read of their remarks
+
+    Skipped when a ?fields= selection leaves remarks out.
+    """
+    if not records or (fields and 'remarks' not in fields):
+        return records
+    remarks = db.remark.get_remarks_by_entities(entity_type, [record[key_attr] for record in records])
+    for record in records:
+        record['remarks'] = render_remarks(record.get('remarks'), remarks.get(int(record[key_attr]), []), entity_type)
+    return records
\ No newline at end of file
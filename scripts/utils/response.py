@@ -1,10 +1,26 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from botocore.exceptions import ClientError
+import hashlib
 import logging
 from . import logging_config
+from .deadline import DeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
+# Returned when the request runs out of Lambda time, retrying is safe and usually succeeds
+DEADLINE_EXCEEDED_DETAIL = {
+    "error": "DEADLINE_EXCEEDED",
+    "message": "The request could not be completed in time, please retry",
+    "code": "INTERNAL_503"
+}
+RETRY_AFTER_HEADERS = {"Retry-After": "1"}
+
+# Transaction cancellations that succeed when retried, any other reason is a bug or a
+# condition the caller should have turned into its own error
+RETRYABLE_CANCELLATION_REASONS = {'TransactionConflict', 'ThrottlingError', 'ProvisionedThroughputExceeded', 'RequestLimitExceeded'}
+
 def success_response(data=None, message="Success"):
     """Standard success response format"""
     response = {"success": True, "message": message}
@@ -12,8 +28,33 @@ def success_response(data=None, message="Success"):
         response["data"] = data
     return response
 
+def paginated_response(data, next_cursor=None, message="Success"):
+    """Success response for one page of a list, next_cursor is None on the last page"""
+    response = success_response(data, message)
+    response["next_cursor"] = next_cursor
+    return response
+
+def conditional_response(request: Request, data=None, message="Success"):
+    """Success response carrying a content ETag, 304 Not Modified when If-None-Match matches it"""
+    response = JSONResponse(jsonable_encoder(success_response(data, message)))
+    etag = f'"{hashlib.sha256(response.body).hexdigest()[:32]}"'
+    # Clients may cache the body but must revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return response
+
 def handle_error(e: Exception, operation: str = "operation"):
     """Handle exceptions and return appropriate HTTPException"""
+    if isinstance(e, DeadlineExceeded):
+        logger.warning(f"{operation} ran out of time: {str(e)}")
+        raise HTTPException(status_code=503, detail=DEADLINE_EXCEEDED_DETAIL, headers=RETRY_AFTER_HEADERS)
+    
     if isinstance(e, ClientError):
         error_info = e.response.get('Error', {})
         error_code = error_info.get('Code', 'UnknownError')
@@ -30,6 +71,16 @@ def handle_error(e: Exception, operation: str = "operation"):
             'PasswordResetRequiredException': (400, "PASSWORD_RESET_REQUIRED", "Password reset required")
         }
         
+        if error_code == 'TransactionCanceledException':
+            reasons = {reason.get('Code') for reason in e.response.get('CancellationReasons', [])}
+            if reasons & RETRYABLE_CANCELLATION_REASONS:
+                logger.warning(f"{operation} transaction cancelled: {reasons}")
+                raise HTTPException(status_code=503, detail={
+                    "error": "TRANSACTION_CONFLICT",
+                    "message": "The record was being changed by another request, please retry",
+                    "code": "INTERNAL_503"
+                }, headers=RETRY_AFTER_HEADERS)
+        
         if error_code in error_mappings:
             status_code, error_type, message = error_mappings[error_code]
             raise HTTPException(status_code=status_code, detail={
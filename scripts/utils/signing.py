@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Placeholder shipped in .env.example, never a real key
+PLACEHOLDER_SECRET = 'change-me'
+
+def _get_secret() -> bytes:
+    secret = os.getenv('TOKEN_SIGNING_SECRET')
+    if secret and secret != PLACEHOLDER_SECRET:
+        return secret.encode()
+    environment = os.getenv('ENVIRONMENT', 'dev')
+    if environment != 'local':
+        # A key derived from public settings would let anyone forge cursors and upload tokens
+        raise RuntimeError(f"TOKEN_SIGNING_SECRET must be set to a secret value when ENVIRONMENT={environment}")
+    logger.warning("TOKEN_SIGNING_SECRET not set, using a development signing key")
+    return f"f1tof12-local-{os.getenv('CUSTOMER', 'f1tof12')}".encode()
+
+def check_signing_secret():
+    """Log at start-up when no signing key is configured
+
+    Only requests that sign or verify a token fail, the rest of the API keeps serving.
+    """
+    try:
+        _get_secret()
+    except RuntimeError as e:
+        logger.error(f"{e}, cursors and document upload tokens will fail until it is set")
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def sign_token(payload: Dict[str, Any]) -> str:
+    """Encode payload as an opaque url-safe token with an HMAC signature"""
+    body = _b64encode(json.dumps(payload, separators=(',', ':'), sort_keys=True, default=_json_default).encode())
+    signature = hmac.new(_get_secret(), body.encode(), hashlib.sha256).digest()[:16]
+    return f"{body}.{_b64encode(signature)}"
+
+def verify_token(token: str) -> Optional[Dict[str, Any]]:
+    """Return the payload of a token signed by sign_token, or None if it was tampered with"""
+    try:
+        body, signature = token.split('.', 1)
+        expected = hmac.new(_get_secret(), body.encode(), hashlib.sha256).digest()[:16]
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            return None
+        return json.loads(_b64decode(body), parse_float=Decimal)
+    except (ValueError, TypeError):
+        return None